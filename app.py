@@ -1,10 +1,12 @@
 import dash
 import re
-from dash import dcc, html, Input, Output, State, ctx, no_update, ALL
+from dash import dcc, html, Input, Output, State, Patch, ctx, no_update, ALL, MATCH, ClientsideFunction
 from dash import dash_table
 from dash.exceptions import PreventUpdate
 import pandas as pd
 import json
+import hashlib
+import uuid
 try:
     from dash_resizable_panels import PanelGroup, Panel, PanelResizeHandle
 except Exception:
@@ -28,17 +30,40 @@ except Exception:
 import os
 
 
-from data_layer.tab_1 import get_tab1_results
-from data_layer.tab_2 import get_tab2_results
-from data_layer.tab_3 import get_tab3_results
+from data_layer.loader import load_monthly_datasets
+from data_layer.refresh import MonthlyRefresher, month_rows
+from data_layer.schema import coerce_numeric
 from config.settings import (
+    DASH_OFFLINE,
+    DATA_DELTA_MONTHS,
+    DATA_MONTHS,
+    DATA_REFRESH_INTERVAL,
     GOOGLE_API_KEY,
     MODEL_NAME,
+    T2_SCATTER_DENSITY_BINS,
+    T2_SCATTER_MAX_POINTS,
+    T2_SCATTER_OVERFLOW,
+    T2_SCATTER_WEBGL_THRESHOLD,
+    EXPORT_CACHE_DIR,
+    EXPORT_CACHE_TTL,
+    PRECOMPUTED_REPORTS_DIR,
+    PRECOMPUTED_REPORTS_ENABLED,
+    METRICS_ENABLED,
 )
 from services.llm import generate_markdown_from_prompt
 from services.insights import summarize_chart_via_chunks, synthesize_across_charts
 from services.prompts import build_prompt_individual
-from utils.data import uniq, pack_df
+from services.selection_store import selection_store, session_store
+from services.session_store import SessionStore
+from services.correlation import correlation_stats
+from services.payload_engine import PayloadEngine
+from services.export import FORMATS as EXPORT_FORMATS, prune_exports, stream_frames, write_export
+from services.report_store import load_report, report_key
+from services.usage_ledger import record_usage, usage_context
+from utils import metrics
+from utils.data import datasets_fingerprint, months_fingerprint, uniq, to_records
+from utils.dataframe import casefold_mask
+from utils.table_query import query_frame
 from utils.colors import (
     color_map_from_list,
     tier_color_map,
@@ -58,13 +83,20 @@ from app_tabs.tab1.figures import (
 from app_tabs.tab3.figures import (
     build_tab3_figures,
     get_filtered_frames_simple as t3_get_filtered_frames,
-    KPI_DISPLAY,
+    kpi_gap_table,
+)
+from app_tabs.tab2.figures import (
+    get_filtered_frames as t2_get_filtered_frames,
+    in_window,
+    thin_points,
+    zoom_window,
 )
-from app_tabs.tab2.figures import get_filtered_frames as t2_get_filtered_frames
 from config.logging import configure_logging
+from services.prompt_log import configure_prompt_log, log_prompt
 
 # Configure logging early so all modules use the same sink
 configure_logging()
+configure_prompt_log()
 
 """
 Configuration and LLM are now centralized in config.settings and services.llm.
@@ -159,28 +191,6 @@ DEFAULT_DROPDOWN_STYLE = {"cursor": "pointer"}
 DEFAULT_CHECKLIST_STYLE = {"cursor": "pointer"}
 
 
-def _dropdown_cursor_style(disabled: bool) -> dict:
-    style = DEFAULT_DROPDOWN_STYLE.copy()
-    style["cursor"] = "not-allowed" if disabled else "pointer"
-    return style
-
-
-def _checklist_cursor_style(disabled: bool) -> dict:
-    style = DEFAULT_CHECKLIST_STYLE.copy()
-    style["cursor"] = "not-allowed" if disabled else "pointer"
-    style["opacity"] = 0.55 if disabled else 1
-    return style
-
-
-def _button_cursor_style(base_style: dict, disabled: bool) -> dict:
-    style = base_style.copy()
-    style["cursor"] = "not-allowed" if disabled else "pointer"
-    if disabled:
-        style.setdefault("opacity", 0.6)
-    else:
-        style.pop("opacity", None)
-    return style
-
 def _ensure_tab1_defaults(data_dict: dict | None) -> dict:
     """Ensure Tab 1 dict has q1..q5 DataFrames with required columns.
 
@@ -263,10 +273,32 @@ def _ensure_tab1_defaults(data_dict: dict | None) -> dict:
     }
 
 
-def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets: dict | None = None):
+def load_startup_datasets():
+    """(tab1, tab2, tab3, monthly) for create_dashboard.
+
+    Loads DATA_MONTHS from the database with the first month as the default
+    view; DASH_OFFLINE=1 skips the database and starts with empty datasets.
+    """
+    if DASH_OFFLINE:
+        return _ensure_tab1_defaults({}), {}, {}, {}
+    monthly = load_monthly_datasets(DATA_MONTHS)
+    first = monthly[DATA_MONTHS[0]]
+    return first["tab1"], first["tab2"], first["tab3"], monthly
+
+
+def create_dashboard(
+    data_dict,
+    data_dict_2,
+    data_dict_3=None,
+    monthly_datasets: dict | None = None,
+    refresh_interval: float = 0,
+):
     """
     Dash app with cross-filtering, stable colors, multi-chart select,
     and Gemini-based summarizer in a resizable, toggleable sidebar.
+
+    With `refresh_interval` > 0 each process re-probes the month tables every
+    that many seconds and swaps changed months into `monthly_datasets`.
     """
     # local aliases for datasets (prevents NameError in inner functions)
     tab1 = _ensure_tab1_defaults(data_dict or {})
@@ -277,6 +309,9 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         suppress_callback_exceptions=True,
         external_stylesheets=external_stylesheets,
     )
+    if METRICS_ENABLED:
+        # Every @app.callback below is timed; see services.metrics
+        metrics.instrument_dash(app)
 
     # Set a consistent blue-forward plotly template across all figures
     pio.templates.default = "plotly_white"
@@ -347,6 +382,77 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
     # KPI columns in sheet2/3 (achievement %)
     # Removed unused KPI_COLUMNS constant in cleanup.
 
+    # Reload count per month; part of the data-derived cache keys so a
+    # refreshed month misses entries computed from its previous snapshot
+    month_versions: dict = {}
+
+    def months_state(filters: dict | None) -> list:
+        """[months, reload versions] of `filters`, for month-keyed caches and short-circuits."""
+        months = list((filters or {}).get("months") or ["april"])
+        return [months, [month_versions.get(m, 0) for m in months]]
+
+    # Outlet-type radar profiles are memoized per (months, merged Tab 3 filters)
+    def t3_profile_key(global_filters: dict | None, merged: dict) -> str:
+        return json.dumps([*months_state(global_filters), merged], sort_keys=True, default=str)
+
+    def t2_corr_key(filters: dict | None, *view) -> str:
+        """Correlation cache key for the Tab 2 frame of `filters` (+ any local view refinement)."""
+        return json.dumps([*months_state(filters), filters or {}, *view], sort_keys=True, default=str)
+
+    _data_version: dict = {}
+
+    def data_version() -> str:
+        """Content fingerprint of monthly_datasets (computed once)."""
+        if "value" not in _data_version:
+            _data_version["value"] = datasets_fingerprint(monthly_datasets)
+        return _data_version["value"]
+
+    _month_fingerprints: dict = {}
+
+    def report_data_version(filters: dict | None) -> str:
+        """Fingerprint of the months in `filters` (precomputed reports cover only those)."""
+        return months_fingerprint(monthly_datasets, months_state(filters)[0], _month_fingerprints)
+
+    def on_months_swapped(months: list) -> None:
+        for m in months:
+            month_versions[m] = month_versions.get(m, 0) + 1
+        # Precomputed-report and export keys use the fingerprints; recompute them
+        _data_version.clear()
+        for m in months:
+            _month_fingerprints.pop(m, None)
+
+    refresher = None
+    if monthly_datasets and refresh_interval > 0:
+        refresher = MonthlyRefresher(
+            monthly_datasets,
+            refresh_interval,
+            on_swap=on_months_swapped,
+            delta_months=[m for m in DATA_DELTA_MONTHS if m in monthly_datasets],
+        )
+        refresher.prime()
+
+    def render_stored_report(report: dict):
+        prov = report.get("provenance") or {}
+        sections = report.get("sections") or []
+        single = len(sections) == 1
+        children = []
+        for sec in sections:
+            children.append(
+                html.Div(
+                    [
+                        html.H4(
+                            "Generated Insights" if single else (sec.get("title") or ""),
+                            style={"color": "#007bff"},
+                        ),
+                        dcc.Markdown(sec.get("markdown") or "_No content returned._", link_target="_blank"),
+                    ],
+                    style={} if single else {"marginBottom": "24px"},
+                )
+            )
+        note = f"Precomputed report · {prov.get('model', '')} · generated {prov.get('generated_at', '')}"
+        children.append(html.P(note, style={"color": "#6b7280", "fontSize": "12px"}))
+        return html.Div(children)
+
     # ----- Month combination helper -----
     def combine_months(filters: dict | None, tab_key: str) -> dict:
         from utils.dataframe import combine_month_frames
@@ -397,6 +503,8 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         # 't3-graph-5': '—',
     }
 
+    payload_engine = PayloadEngine(combine_months, GRAPH_LABELS, t3_profile_key, t2_corr_key)
+
     def build_dropdown_options(values):
         """Map iterable of values to Dash dropdown option dicts."""
         return [
@@ -487,6 +595,18 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
                                         },
                                     ),
                                     dcc.Store(id="filter-store", data=default_filters),
+                                    # Constants for the clientside UI callbacks
+                                    dcc.Store(
+                                        id="ui-config",
+                                        data={
+                                            "default_filters": default_filters,
+                                            "button_styles": {
+                                                "reset": RESET_BUTTON_STYLE,
+                                                "clear_selection": CLEAR_SELECTION_STYLE,
+                                                "generate": GENERATE_BUTTON_STYLE,
+                                            },
+                                        },
+                                    ),
                                     dcc.Store(id="active-selection", data=None),
                                     # Start CLOSED; also track if we've ever opened before
                                     dcc.Store(
@@ -495,7 +615,11 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
                                     ),
                                     dcc.Store(id="selected-graphs", data=[]),
                                     dcc.Store(id="selected-data", data={}),
+                                    # Per-page-load key for server-side selection snapshots
+                                    dcc.Store(id="session-id", data=None),
                                     dcc.Store(id="insights-active", data=False),
+                                    # Months the unfiltered q2 chart was last drawn for
+                                    dcc.Store(id="graph-q2-months", data=None),
                                     # Tab 3 dedicated filter store
                                     dcc.Store(
                                         id="tab3-filter-store",
@@ -798,6 +922,24 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
                                             ),
                                         ]
                                     ),
+                                    html.Details(
+                                        [
+                                            html.Summary(
+                                                "Diagnostics",
+                                                id="metrics-summary",
+                                                n_clicks=0,
+                                                style={"fontWeight": 700, "fontSize": "13px", "cursor": "pointer"},
+                                            ),
+                                            html.Div(
+                                                id="metrics-panel",
+                                                style={"fontSize": "12px", "color": "#374151"},
+                                            ),
+                                            # Polls only while the panel is open
+                                            dcc.Interval(id="metrics-interval", interval=5000, disabled=True),
+                                        ],
+                                        id="metrics-details",
+                                        style={"display": "block" if METRICS_ENABLED else "none"},
+                                    ),
                                 ],
                                 style={
                                     "padding": "16px 20px 40px",
@@ -829,8 +971,9 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         style={"minHeight": "100vh", "height": "100%", "fontFamily": '"Roboto", sans-serif'},
     )
 
-    # ----- Toggle sidebar visibility -----
-    @app.callback(
+    # ----- Pure UI state: clientside callbacks (assets/ui_callbacks.js) -----
+    app.clientside_callback(
+        ClientsideFunction(namespace="ui", function_name="toggleSidebar"),
         Output("sidebar-panel", "style"),
         Output("sidebar-resize-handle", "style"),
         Output("sidebar-visibility-store", "data"),
@@ -838,61 +981,14 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         State("sidebar-visibility-store", "data"),
         prevent_initial_call=True,
     )
-    def toggle_sidebar_visibility(n_clicks, visibility_data):
-        if not n_clicks:
-            raise PreventUpdate
-
-        is_visible = bool(visibility_data.get("visible", False))
-        opened_once = bool(visibility_data.get("opened_once", False))
-        new_visibility = not is_visible
-
-        if new_visibility:
-            # OPENING
-            if not opened_once:
-                # First open at 25% of the screen width
-                panel_style = {
-                    "height": "100%",
-                    "backgroundColor": "#f8f9fa",
-                    "width": "25%",
-                }
-                new_store = {"visible": True, "opened_once": True}
-            else:
-                panel_style = {"height": "100%", "backgroundColor": "#f8f9fa"}
-                new_store = {"visible": True, "opened_once": True}
-            handle_style = {
-                "width": "5px",
-                "cursor": "col-resize",
-                "backgroundColor": "#ccc",
-            }
-            return panel_style, handle_style, new_store
-        else:
-            # CLOSING
-            panel_style = {
-                "minWidth": 0,
-                "width": 0,
-                "display": "none",
-                "height": "100%",
-                "backgroundColor": "#f8f9fa",
-            }
-            handle_style = {"display": "none"}
-            new_store = {"visible": False, "opened_once": opened_once}
-            return panel_style, handle_style, new_store
 
     # ----- Generate report (multi-chart) -----
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace="ui", function_name="guardInsightMode"),
         Output("insight-mode-radio", "options"),
         Output("insight-mode-radio", "value"),
         Input("selected-graphs", "data"),
     )
-    def guard_insight_mode(selected_graphs):
-        sel = list(selected_graphs or [])
-        base_opts = [
-            {"label": "Individual Insights", "value": "individual"},
-            {"label": "Combined Insights", "value": "combined"},
-        ]
-        if len(sel) <= 1:
-            return ([base_opts[0]], "individual")
-        return (base_opts, "combined")
 
     @app.callback(
         Output("generate-output", "children"),
@@ -911,6 +1007,7 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         State("t2-y-param", "value"),
         State("t2-color-dim", "value"),
         State("insight-data-scope-toggle", "value"),
+        State("session-id", "data"),
         prevent_initial_call=True,
     )
     def generate_report(
@@ -926,6 +1023,43 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         t2_y_current,
         t2_color_current,
         insight_scope_toggle,
+        session_id,
+    ):
+        # Attribute the report's LLM calls (services.usage_ledger)
+        with usage_context(
+            session=session_id or "anonymous",
+            mode=insight_mode or "individual",
+            stage="report",
+            graph_ids=list(selected_graphs or []),
+        ):
+            return _generate_report(
+                generate_clicks,
+                clear_clicks,
+                selected_graphs,
+                selected_data,
+                filters,
+                tab3_local,
+                insight_mode,
+                model_provider,
+                t2_x_current,
+                t2_y_current,
+                t2_color_current,
+                insight_scope_toggle,
+            )
+
+    def _generate_report(
+        generate_clicks,
+        clear_clicks,
+        selected_graphs,
+        selected_data,
+        filters,
+        tab3_local,
+        insight_mode,
+        model_provider,
+        t2_x_current,
+        t2_y_current,
+        t2_color_current,
+        insight_scope_toggle,
     ):
         triggered = ctx.triggered_id
         if triggered == "clear-insights":
@@ -942,689 +1076,40 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
 
         use_filtered_scope = "filtered" in (insight_scope_toggle or [])
 
-        def label(gid):
-            return GRAPH_LABELS.get(gid, gid)
-
-        # Prefer full snapshot for LLM; fall back to chart-scoped data
-        def pick_meta_for(gid: str, meta_obj: dict | None):
-            if not isinstance(meta_obj, dict):
-                return None
-            # If already in flat format
-            if "columns" in meta_obj and "records" in meta_obj:
-                return meta_obj
-            priority_filtered = [
-                "chart",
-                "alt_chart",
-                "gap_chart",
-                "filtered",
-                "full",
-                "alt_full",
-                "gap_full",
-            ]
-            priority_full = [
-                "full",
-                "alt_full",
-                "gap_full",
-                "chart",
-                "alt_chart",
-                "gap_chart",
-                "filtered",
-            ]
-            keys = priority_filtered if use_filtered_scope else priority_full
-            for key in keys:
-                val = meta_obj.get(key)
-                if isinstance(val, dict) and {
-                    "columns",
-                    "records",
-                }.issubset(set(val.keys())):
-                    return val
-            return None
-
-        def _meta_to_df(meta_dict: dict | None) -> pd.DataFrame:
-            if not isinstance(meta_dict, dict):
-                return pd.DataFrame()
-            try:
-                cols = meta_dict.get("columns")
-                rows = meta_dict.get("records") or []
-                if cols and isinstance(cols, (list, tuple)):
-                    return pd.DataFrame(rows, columns=cols)
-                return pd.DataFrame(rows)
-            except Exception:
-                try:
-                    return pd.DataFrame(meta_dict.get("records") or [])
-                except Exception:
-                    return pd.DataFrame()
-
-        def _prepare_tab2_filtered_df(
-            df: pd.DataFrame,
-            xcol: str | None,
-            ycol: str | None,
-            color_col: str | None,
-        ) -> pd.DataFrame:
-            """Mirror the on-screen Tab 2 scatter view when filtered scope is selected."""
-            if not isinstance(df, pd.DataFrame) or df.empty:
-                return df
-
-            d = df.copy()
-
-            def _coerce_numeric(dframe: pd.DataFrame, col: str | None):
-                if not col or col not in dframe.columns:
-                    return
-                series = dframe[col]
-                try:
-                    if not pd.api.types.is_numeric_dtype(series):
-                        s2 = (
-                            series.astype(str)
-                            .str.replace("%", "", regex=False)
-                            .str.replace(",", "", regex=False)
-                        )
-                        s2 = s2.str.extract(r"([-+]?\d*\.?\d+)")[0]
-                        dframe[col] = pd.to_numeric(s2, errors="coerce")
-                    else:
-                        dframe[col] = pd.to_numeric(series, errors="coerce")
-                except Exception:
-                    try:
-                        dframe[col] = pd.to_numeric(series, errors="coerce")
-                    except Exception:
-                        pass
-
-            _coerce_numeric(d, xcol)
-            _coerce_numeric(d, ycol)
-
-            subset_cols = [c for c in (xcol, ycol) if c and c in d.columns]
-            if subset_cols:
-                try:
-                    d = d.dropna(subset=subset_cols)
-                except Exception:
-                    pass
-
-            parameter_cols: list[str] = []
-            for col in (xcol, ycol, color_col):
-                if col and col in d.columns and col not in parameter_cols:
-                    parameter_cols.append(col)
-
-            if parameter_cols:
-                d = d[parameter_cols]
-
-            return d
-
-        # Prepare live, current chart data for each selected gid
-        charts_payload = []
-        analysis_cache: dict[str, pd.DataFrame] = {}
-        gf = filters or {}
-        lf = tab3_local or {}
-        def _combine(a, b):
-            la = list(a or [])
-            lb = list(b or [])
-            if la and lb:
-                sb = set(lb)
-                return [x for x in la if x in sb]
-            return la or lb
-        merged_t3 = {
-            "outlet_categories": _combine(gf.get("outlet_categories"), lf.get("outlet_categories")),
-            "regions": list(gf.get("regions", [])),
-            "sales_center_codes": list(lf.get("sales_center_codes", [])),
-            "shortfall_side": lf.get("shortfall_side"),
-            "kpi_focus": lf.get("kpi_focus"),
-            "search_text": gf.get("search_text", ""),
-            "outlet_types": list(gf.get("outlet_types", [])),
-        }
-        try:
-            tab1_cur = combine_months(filters, "tab1")
-            t1_q1_f, _t1_q2_unused, _t1_q3_f, t1_q4_f, t1_q5_f = t1_get_filtered_frames(tab1_cur, gf)
-        except Exception:
-            t1_q1_f = t1_q4_f = t1_q5_f = pd.DataFrame()
-        try:
-            _t1_q1_unused, t1_q2_u, _t1_q3_u, t1_q4_u, _t1_q5_unused = t1_get_filtered_frames(tab1_cur, {"months": list((filters or {}).get("months") or ["april"]) })
-        except Exception:
-            t1_q2_u = t1_q4_u = pd.DataFrame()
-        try:
-            tab2_cur = combine_months(filters, "tab2")
-            t2_df_chart = (t2_get_filtered_frames(tab2_cur, gf) or [pd.DataFrame()])[0]
-        except Exception:
-            t2_df_chart = pd.DataFrame()
-        try:
-            tab3_cur = combine_months(filters, "tab3")
-            t3_q1_chart, t3_q2_chart, _t3_q3_unused, _t3_q4_unused = t3_get_filtered_frames(
-                tab3_cur or {},
-                merged_t3
-            )
-        except Exception:
-            t3_q1_chart = t3_q2_chart = pd.DataFrame()
-        # DRY helper: build a month-specific dataframe for any chart gid
-        def _month_df_for_gid(base_gid: str, mlabel: str) -> pd.DataFrame:
-            try:
-                if not use_filtered_scope:
-                    base_meta = (selected_data or {}).get(base_gid)
-                    candidates = []
-                    if isinstance(base_meta, dict):
-                        if {"columns", "records"}.issubset(base_meta.keys()):
-                            candidates.append(base_meta)
-                        for key in [
-                            "full",
-                            "alt_full",
-                            "gap_full",
-                            "chart",
-                            "alt_chart",
-                            "gap_chart",
-                        ]:
-                            val = base_meta.get(key)
-                            if isinstance(val, dict):
-                                candidates.append(val)
-                    for meta_dict in candidates:
-                        df_meta = _meta_to_df(meta_dict)
-                        if (
-                            isinstance(df_meta, pd.DataFrame)
-                            and not df_meta.empty
-                            and "Month" in df_meta.columns
-                        ):
-                            return df_meta[
-                                df_meta["Month"].astype(str) == str(mlabel)
-                            ].copy()
-                    return pd.DataFrame()
-
-                # Filtered path (current UI context)
-                # Tab 1
-                if base_gid == "q2":
-                    from utils.df_summary import category_mix_by_month
-
-                    detail_df = (
-                        t1_q4_u if isinstance(t1_q4_u, pd.DataFrame) else t1_q4_f
-                    )
-                    mix_all = category_mix_by_month(detail_df)
-                    if isinstance(mix_all, pd.DataFrame) and not mix_all.empty:
-                        return mix_all[
-                            mix_all["Month"].astype(str) == str(mlabel)
-                        ].copy()
-                    return pd.DataFrame(columns=["Month", "category", "count", "pct"])
-                if base_gid == "q1":
-                    if (
-                        isinstance(t1_q4_f, pd.DataFrame)
-                        and not t1_q4_f.empty
-                        and "Month" in t1_q4_f.columns
-                    ):
-                        return t1_q4_f[
-                            t1_q4_f["Month"].astype(str) == str(mlabel)
-                        ].copy()
-                    return pd.DataFrame()
-                if base_gid == "q3":
-                    regs_sel = list((gf or {}).get("regions") or [])
-                    df = t1_q4_f
-                    if (
-                        isinstance(df, pd.DataFrame)
-                        and not df.empty
-                        and "Month" in df.columns
-                    ):
-                        sub = df[df["Month"].astype(str) == str(mlabel)].copy()
-                        if regs_sel and "rgn" in sub.columns:
-                            try:
-                                sub = sub[sub["rgn"].isin(regs_sel)]
-                            except Exception:
-                                pass
-                        return sub
-                    return pd.DataFrame()
-                if base_gid == "q6":
-                    from utils.df_summary import category_mix_by_month
-
-                    detail_df = t1_q4_f
-                    mix_all = category_mix_by_month(detail_df)
-                    if isinstance(mix_all, pd.DataFrame) and not mix_all.empty:
-                        return mix_all[
-                            mix_all["Month"].astype(str) == str(mlabel)
-                        ][["Month", "category", "count"]].copy()
-                    return pd.DataFrame(columns=["Month", "category", "count"])
-                # Tab 2
-                if base_gid == "t2-graph-dyn":
-                    if (
-                        isinstance(t2_df_chart, pd.DataFrame)
-                        and not t2_df_chart.empty
-                        and "Month" in t2_df_chart.columns
-                    ):
-                        sub = t2_df_chart[
-                            t2_df_chart["Month"].astype(str) == str(mlabel)
-                        ].copy()
-                        color_sel = t2_color_current or "outlet_category"
-                        return _prepare_tab2_filtered_df(
-                            sub,
-                            t2_x_current,
-                            t2_y_current,
-                            color_sel,
-                        )
-                    return pd.DataFrame()
-                # Tab 3
-                if base_gid == "t3-graph-1":
-                    from app_tabs.tab3.figures import KPI_DISPLAY as _KDISP
-                    import pandas as _pd
-
-                    base_live = t3_q1_chart
-                    if (
-                        isinstance(base_live, _pd.DataFrame)
-                        and not base_live.empty
-                        and "Month" in base_live.columns
-                    ):
-                        bl = base_live[base_live["Month"].astype(str) == str(mlabel)].copy()
-                        rows = []
-                        cats = ["B", "C", "D"]
-                        for col, disp in _KDISP:
-                            if col not in bl.columns:
-                                continue
-                            try:
-                                g = (
-                                    bl[bl["outlet_category"].isin(cats)]
-                                    .groupby("outlet_category")[col]
-                                    .mean()
-                                )
-                            except Exception:
-                                continue
-                            for cat in cats:
-                                if cat in g and pd.notna(g[cat]):
-                                    rows.append(
-                                        {
-                                            "Month": str(mlabel),
-                                            "outlet_category": cat,
-                                            "kpi": disp,
-                                            "gap_value": float(g[cat]) - 100.0,
-                                        }
-                                    )
-                        return _pd.DataFrame(rows)
-                    return pd.DataFrame(
-                        columns=["Month", "outlet_category", "kpi", "gap_value"]
-                    )
-                if base_gid == "t3-graph-2":
-                    if (
-                        isinstance(t3_q2_chart, pd.DataFrame)
-                        and not t3_q2_chart.empty
-                        and "Month" in t3_q2_chart.columns
-                    ):
-                        return t3_q2_chart[
-                            t3_q2_chart["Month"].astype(str) == str(mlabel)
-                        ].copy()
-                    return pd.DataFrame()
-            except Exception:
-                return pd.DataFrame()
-        for gid in selected_graphs:
-            meta_all = (selected_data or {}).get(gid)
-            meta = pick_meta_for(gid, meta_all)
-            if not meta:
-                continue
-            # Compute live chart dataframe for this gid (fallback to stored snapshot if empty)
-            live_df = pd.DataFrame()
-            try:
-                if gid == "q1":
-                    live_df = t1_q1_f
-                elif gid == "q2":
-                    # For insights: if multiple months selected, feed per-month category mix
-                    try:
-                        sel_months_local = list((gf or {}).get("months") or [])
-                    except Exception:
-                        sel_months_local = []
-                    if len(sel_months_local) > 1:
-                        try:
-                            from utils.df_summary import category_mix_by_month
-                            # Prefer unfiltered detailed frame to mirror q2 semantics
-                            detail_df = (
-                                t1_q4_u
-                                if isinstance(t1_q4_u, pd.DataFrame)
-                                else t1_q4_f
-                            )
-                            mix_all = category_mix_by_month(detail_df)
-                            if isinstance(mix_all, pd.DataFrame) and not mix_all.empty:
-                                live_df = mix_all[mix_all["Month"].astype(str).isin([str(m) for m in sel_months_local])]
-                            else:
-                                live_df = t1_q2_u
-                        except Exception:
-                            live_df = t1_q2_u
-                    else:
-                        live_df = t1_q2_u  # UI shows unfiltered category mix
-                elif gid == "q3":
-                    regs_sel = list((gf or {}).get("regions") or [])
-                    if len(regs_sel) == 1 and isinstance(t1_q4_f, pd.DataFrame) and not t1_q4_f.empty:
-                        df = t1_q4_f.copy()
-                        if "rgn" in df.columns:
-                            try:
-                                df = df[df["rgn"] == regs_sel[0]]
-                            except Exception:
-                                pass
-                        live_df = df
-                    else:
-                        live_df = t1_q1_f
-                elif gid == "q4":
-                    live_df = t1_q4_f
-                elif gid == "q5":
-                    live_df = t1_q5_f
-                elif gid == "q6":
-                    d = t1_q4_f if isinstance(t1_q4_f, pd.DataFrame) and not t1_q4_f.empty else t1_q1_f
-                    if isinstance(d, pd.DataFrame) and not d.empty:
-                        cat_col = "outlet_category" if "outlet_category" in d.columns else ("Category" if "Category" in d.columns else None)
-                        if cat_col:
-                            live_df = (
-                                d[[cat_col]]
-                                .dropna()
-                                .groupby(cat_col, dropna=False)
-                                .size()
-                                .reset_index(name="count")
-                                .rename(columns={cat_col: "category"})
-                            )
-                        else:
-                            live_df = pd.DataFrame(columns=["category", "count"])
-                elif gid == "t2-graph-dyn":
-                    live_df = t2_df_chart
-                elif gid == "t3-graph-1":
-                    live_df = t3_q1_chart
-                elif gid == "t3-graph-2":
-                    live_df = t3_q2_chart
-            except Exception:
-                live_df = pd.DataFrame()
-
-            meta_df = _meta_to_df(meta)
-            analysis_df = live_df if isinstance(live_df, pd.DataFrame) else pd.DataFrame()
-            if not use_filtered_scope and isinstance(meta_df, pd.DataFrame) and not meta_df.empty:
-                analysis_df = meta_df
-
-            if (
-                gid == "t2-graph-dyn"
-                and use_filtered_scope
-                and isinstance(analysis_df, pd.DataFrame)
-            ):
-                meta_x = None
-                meta_y = None
-                meta_color = None
-                if isinstance(meta, dict):
-                    meta_x = meta.get("x")
-                    meta_y = meta.get("y")
-                    meta_color = meta.get("color")
-                analysis_df = _prepare_tab2_filtered_df(
-                    analysis_df,
-                    t2_x_current or meta_x,
-                    t2_y_current or meta_y,
-                    (t2_color_current or meta_color or "outlet_category"),
-                )
-
-            # Special handling for Tab 3 first graph: provide a small, focused table (KPI gaps)
-            special_tab3_small = False
-            gap_df = None
-            if gid == "t3-graph-1":
-                try:
-                    from app_tabs.tab3.figures import KPI_DISPLAY as _KDISP
-                    def _gap_table(dframe: pd.DataFrame):
-                        import pandas as _pd
-                        if not isinstance(dframe, _pd.DataFrame) or dframe.empty:
-                            return _pd.DataFrame(columns=["outlet_category", "kpi", "gap_value"])
-                        rows_g = []
-                        cats = ["B", "C", "D"]
-                        for col, disp in _KDISP:
-                            if col not in dframe.columns:
-                                continue
-                            try:
-                                g = (
-                                    dframe[dframe["outlet_category"].isin(cats)]
-                                    .groupby("outlet_category")[col]
-                                    .mean()
-                                )
-                            except Exception:
-                                continue
-                            for cat in cats:
-                                if cat in g and pd.notna(g[cat]):
-                                    rows_g.append(
-                                        {
-                                            "outlet_category": cat,
-                                            "kpi": disp,
-                                            "gap_value": float(g[cat]) - 100.0,
-                                        }
-                                    )
-                        return _pd.DataFrame(rows_g)
-
-                    gap_df = _gap_table(analysis_df)
-                    if isinstance(gap_df, pd.DataFrame) and not gap_df.empty:
-                        special_tab3_small = True
-                except Exception:
-                    special_tab3_small = False
-
-            # Choose base dataframe for the payload (small focused table if available)
-            base_df = gap_df if special_tab3_small else analysis_df
-
-            item = {
-                "graph_id": gid,
-                "graph_label": label(gid) + (" — KPI gaps" if special_tab3_small else ""),
-                "filters": filters,
-                "columns": (
-                    [str(c) for c in base_df.columns]
-                    if isinstance(base_df, pd.DataFrame) and not base_df.empty
-                    else meta.get("columns", [])
-                ),
-                "n_rows": (
-                    len(base_df)
-                    if isinstance(base_df, pd.DataFrame) and not base_df.empty
-                    else meta.get("n_rows", 0)
+        # Serve a report precomputed by scripts/precompute_reports.py for the same request
+        if PRECOMPUTED_REPORTS_ENABLED:
+            stored = load_report(
+                PRECOMPUTED_REPORTS_DIR,
+                report_key(
+                    selected_graphs,
+                    filters,
+                    tab3_local,
+                    insight_mode,
+                    use_filtered_scope,
+                    [t2_x_current, t2_y_current, t2_color_current],
+                    report_data_version(filters),
                 ),
-                "rows": (
-                    base_df.to_dict("records")
-                    if isinstance(base_df, pd.DataFrame) and not base_df.empty
-                    else meta.get("records", [])
-                ),
-            }
-            payload_df = (
-                base_df
-                if isinstance(base_df, pd.DataFrame)
-                else _meta_to_df(meta)
             )
-            # Attach computed per-column statistics to reduce LLM arithmetic errors
-            try:
-                from utils.df_summary import describe_by_column, grouped_stats_selected
-                if isinstance(base_df, pd.DataFrame) and not base_df.empty:
-                    item["computed_stats"] = describe_by_column(base_df)
-                    # Also compute grouped stats by outlet_category / outlet_type when present
-                    gs = grouped_stats_selected(base_df)
-                    if gs:
-                        item["group_stats"] = gs
-                else:
-                    # Fallback: build a DataFrame from payload rows if available
-                    _cols = item.get("columns") or []
-                    _rows = item.get("rows") or []
-                    if _cols and _rows:
-                        _df_tmp = pd.DataFrame(_rows)
-                        item["computed_stats"] = describe_by_column(_df_tmp)
-                        gs = grouped_stats_selected(_df_tmp)
-                        if gs:
-                            item["group_stats"] = gs
-
-                # Month-aware context: when multiple months selected, provide underlying
-                # detailed dataset stats (which include 'Month') so LLM can compare MoM
-                try:
-                    sel_months = list((filters or {}).get("months") or [])
-                except Exception:
-                    sel_months = []
-                if len(sel_months) > 1:
-                    # Choose an underlying detailed frame per graph family
-                    ctx_df = None
-                    if gid.startswith("q"):
-                        ctx_df = t1_q1_f
-                    elif gid == "t2-graph-dyn":
-                        ctx_df = t2_df_chart
-                    elif gid.startswith("t3-"):
-                        ctx_df = t3_q1_chart
-                    if isinstance(ctx_df, pd.DataFrame) and not ctx_df.empty:
-                        # Provide extended context (full stats including Month grouping)
-                        ctx_comp = describe_by_column(ctx_df)
-                        ctx_grp = grouped_stats_selected(ctx_df)
-                        item.setdefault("context_stats", {})
-                        item["context_stats"].update(
-                            {
-                                "large_computed_stats": ctx_comp,
-                                "large_group_stats": ctx_grp,
-                            }
-                        )
-                        # Also merge Month group stats directly into group_stats so the
-                        # computed stats block shows per-month values inline
-                        if isinstance(ctx_grp, dict) and ctx_grp:
-                            item.setdefault("group_stats", {})
-                            for k, v in ctx_grp.items():
-                                # Do not overwrite if the key already exists unless it's empty
-                                if k not in item["group_stats"] or not item["group_stats"].get(k):
-                                    item["group_stats"][k] = v
-
-                # For Tab3 small table, attach large dataset stats as additional context
-                if special_tab3_small and isinstance(live_df, pd.DataFrame) and not live_df.empty:
-                    item.setdefault("context_stats", {})
-                    item["context_stats"].update(
-                        {
-                            "large_computed_stats": describe_by_column(live_df),
-                            "large_group_stats": grouped_stats_selected(live_df),
-                        }
-                    )
-                    # Mark the small table as primary
-                    item["priority"] = "primary"
-            except Exception:
-                pass
-
-            # Attach generic chart-level metadata if provided by the selector step
-            try:
-                if isinstance(meta_all, dict) and isinstance(
-                    meta_all.get("meta"), dict
-                ):
-                    item["meta"] = meta_all["meta"]
-            except Exception:
-                pass
-            # Enrich Tab 1 q2 with a month-category mix table so LLM can compare MoM
-            if gid == "q2":
-                try:
-                    # Use detailed Tab1 dataset with Month preserved
-                    t1_detail = (
-                        analysis_df
-                        if isinstance(analysis_df, pd.DataFrame)
-                        else pd.DataFrame()
-                    )
-                    if not t1_detail.empty and {
-                        "Month",
-                        "outlet_category",
-                    }.issubset(set(t1_detail.columns)):
-                        d = t1_detail.copy()
-                        # pick region column name
-                        rg = "rgn" if "rgn" in d.columns else None
-                        if rg:
-                            dd = d[["Month", rg, "outlet_category"]].dropna()
-                            mix = (
-                                dd.groupby(["Month", rg, "outlet_category"], dropna=False)
-                                .size()
-                                .reset_index(name="count")
-                            )
-                            totals = mix.groupby(["Month", rg], dropna=False)["count"].transform("sum")
-                            mix["pct"] = (mix["count"] / totals) * 100.0
-                            charts_payload.append(
-                                {
-                                    "graph_id": f"{gid}-month-mix",
-                                    "graph_label": label(gid) + " — Month category mix",
-                                    "filters": filters,
-                                    "columns": [str(c) for c in mix.columns],
-                                    "n_rows": len(mix),
-                                    "rows": mix.to_dict("records"),
-                                }
-                            )
-                            analysis_cache[f"{gid}-month-mix"] = mix.copy()
-                except Exception:
-                    pass
-
-            # Enrich Tab 3 first chart with the live derived KPI gap table
-            if gid == "t3-graph-1" and (insight_mode or "individual") == "combined":
-                try:
-                    from app_tabs.tab3.figures import KPI_DISPLAY as _KDISP
-                    def _gap_table(dframe: pd.DataFrame):
-                        import pandas as _pd
-                        if not isinstance(dframe, _pd.DataFrame) or dframe.empty:
-                            return _pd.DataFrame(columns=["outlet_category", "kpi", "gap_value"])
-                        rows_g = []
-                        cats = ["B", "C", "D"]
-                        for col, disp in _KDISP:
-                            if col not in dframe.columns:
-                                continue
-                            try:
-                                g = (
-                                    dframe[dframe["outlet_category"].isin(cats)]
-                                    .groupby("outlet_category")[col]
-                                    .mean()
-                                )
-                            except Exception:
-                                continue
-                            for cat in cats:
-                                if cat in g and pd.notna(g[cat]):
-                                    rows_g.append(
-                                        {
-                                            "outlet_category": cat,
-                                            "kpi": disp,
-                                            "gap_value": float(g[cat]) - 100.0,
-                                        }
-                                    )
-                        return _pd.DataFrame(rows_g)
-
-                    gap_df = _gap_table(t3_q1_chart)
-                    charts_payload.append(
-                        {
-                            "graph_id": f"{gid}-gaps",
-                            "graph_label": label(gid) + " — KPI gaps",
-                            "filters": filters,
-                            "columns": [str(c) for c in gap_df.columns],
-                            "n_rows": len(gap_df),
-                            "rows": gap_df.to_dict("records"),
-                        }
-                    )
-                    analysis_cache[f"{gid}-gaps"] = gap_df.copy()
-                except Exception:
-                    pass
-            # Ensure q3 reflects current drilldown handled above via live_df
-            # Enrich/override Tab 2 dynamic chart metadata with the CURRENT UI selections
-            if gid == "t2-graph-dyn" and isinstance(meta_all, dict):
-                # Start from any stored meta then override x/y/color with live values
-                try:
-                    live_meta = dict(meta_all.get("meta") or {})
-                except Exception:
-                    live_meta = {}
-                if t2_x_current:
-                    live_meta["x"] = t2_x_current
-                if t2_y_current:
-                    live_meta["y"] = t2_y_current
-                if t2_color_current:
-                    live_meta["color"] = t2_color_current
-                if live_meta:
-                    item["meta"] = live_meta
-            # Determine if month comparison is active for this request
-            try:
-                sel_months = list((filters or {}).get("months") or [])
-                compare_on = len(sel_months) > 1 and bool((filters or {}).get("compare_months"))
-            except Exception:
-                sel_months, compare_on = [], False
-
-            # When not comparing months, include the combined/concatenated dataset
-            if not compare_on:
-                charts_payload.append(item)
-                analysis_cache[item["graph_id"]] = (
-                    payload_df.copy()
-                    if isinstance(payload_df, pd.DataFrame)
-                    else pd.DataFrame()
+            metrics.cache_event("precomputed_reports", stored is not None)
+            if stored is not None:
+                record_usage(
+                    model=(stored.get("provenance") or {}).get("model") or MODEL_NAME,
+                    cache_hit=True,
+                    stage="precomputed",
                 )
+                return render_stored_report(stored), no_update, True
 
-            # If user enabled Compare Months, add per-month payloads via DRY helper and
-            # intentionally skip the concatenated one so the LLM only sees per-month frames.
-            if compare_on:
-                from utils.df_summary import describe_by_column, grouped_stats_selected
-                for mlabel in sel_months:
-                    sub = _month_df_for_gid(gid, mlabel)
-                    if not isinstance(sub, pd.DataFrame) or sub.empty:
-                        continue
-                    comp = describe_by_column(sub)
-                    grp = grouped_stats_selected(sub)
-                    charts_payload.append(
-                        {
-                            "graph_id": f"{gid}-month-{mlabel}",
-                            "graph_label": label(gid) + f" — {mlabel}",
-                            "filters": {**(filters or {}), "months": [mlabel]},
-                            "columns": [str(c) for c in sub.columns],
-                            "n_rows": len(sub),
-                            "rows": sub.to_dict("records"),
-                            "computed_stats": comp,
-                            "group_stats": grp,
-                        }
-                    )
-                    analysis_cache[f"{gid}-month-{mlabel}"] = sub.copy()
+        # Payload entries for the selected charts; only their tab families are filtered
+        report = payload_engine.build(
+            selected_graphs,
+            selected_data,
+            filters,
+            tab3_local,
+            insight_mode,
+            use_filtered_scope,
+            (t2_x_current, t2_y_current, t2_color_current),
+        )
+        charts_payload = report.charts
 
         if not charts_payload:
             return html.Div(
@@ -1634,22 +1119,7 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
                 ]
             ), no_update, False
 
-        # Derive top-level metadata for prompt (x/y/legend) when available
-        top_metadata = {}
-        try:
-            for ch in charts_payload:
-                m = ch.get("meta") if isinstance(ch, dict) else None
-                if isinstance(m, dict) and ("x" in m and "y" in m):
-                    top_metadata = {
-                        "x_axis": m.get("x", ""),
-                        "y_axis": m.get("y", ""),
-                        "legend": m.get("color") or m.get("legend") or "",
-                    }
-                    break
-        except Exception:
-            top_metadata = {}
-
-        payload = {"charts": charts_payload, "metadata": top_metadata}
+        payload = report.payload
 
         # Build sidebar debug preview for all selected charts, including q2
         def preview_all(charts):
@@ -1921,40 +1391,30 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
                 per_payload = {"charts": [ch], "metadata": per_meta}
                 per_prompt = build_prompt_individual(per_payload, context_text, fh)
 
-                # Log per-chart prompt
-                try:
-                    from datetime import datetime
-
-                    os.makedirs("logs", exist_ok=True)
-                    meta = {
-                        "ts": datetime.utcnow().isoformat() + "Z",
+                # Log per-chart prompt (enqueued; see services.prompt_log)
+                log_prompt(
+                    per_prompt,
+                    {
                         "mode": "individual-multi",
                         "provider": provider,
                         "model": MODEL_NAME,
                         "selected_graphs": [ch.get("graph_id")],
                         "graph_label": ch.get("graph_label"),
                         "focus_hint": fh.strip(),
-                    }
-                    entry = {
-                        "meta": meta,
-                        "metadata": per_meta,
-                        "charts_meta": (
-                            [{"graph_id": ch.get("graph_id"), "meta": ch_meta}]
-                            if isinstance(ch_meta, dict)
-                            else []
-                        ),
-                        "prompt": per_prompt,
-                        "prompt_lines": per_prompt.splitlines(),
-                    }
-                    with open("logs/insights_prompts.log", "a", encoding="utf-8") as f:
-                        f.write(json.dumps(entry, ensure_ascii=False, indent=2) + "\n")
-                except Exception:
-                    pass
+                    },
+                    metadata=per_meta,
+                    charts_meta=(
+                        [{"graph_id": ch.get("graph_id"), "meta": ch_meta}]
+                        if isinstance(ch_meta, dict)
+                        else []
+                    ),
+                )
 
                 # Call LLM for this chart
-                per_text, per_err = generate_markdown_from_prompt(
-                    per_prompt, model_name=MODEL_NAME, api_key=GOOGLE_API_KEY
-                )
+                with usage_context(mode="individual-multi", graph_ids=[ch.get("graph_id")]):
+                    per_text, per_err = generate_markdown_from_prompt(
+                        per_prompt, model_name=MODEL_NAME, api_key=GOOGLE_API_KEY
+                    )
                 if per_err:
                     sections.append(
                         html.Div(
@@ -2011,145 +1471,11 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
 
         # Optional map-reduce path: if full datasets exceed the UI packing limit,
         # analyze via chunked LLM passes to avoid losing information.
-        def _build_full_df_for_gid(gid: str) -> pd.DataFrame:
-            cached = analysis_cache.get(gid)
-            if isinstance(cached, pd.DataFrame) and not cached.empty:
-                return cached
-
-            meta_dict = pick_meta_for(gid, (selected_data or {}).get(gid))
-            meta_df = _meta_to_df(meta_dict)
-            if isinstance(meta_df, pd.DataFrame) and not meta_df.empty:
-                return meta_df
-
-            try:
-                if gid == "q1":
-                    return t1_q1_f
-                if gid == "q2":
-                    try:
-                        sel_months_local = list((gf or {}).get("months") or [])
-                    except Exception:
-                        sel_months_local = []
-                    if len(sel_months_local) > 1:
-                        try:
-                            from utils.df_summary import category_mix_by_month
-
-                            detail_df = (
-                                t1_q4_u if isinstance(t1_q4_u, pd.DataFrame) else t1_q4_f
-                            )
-                            mix_all = category_mix_by_month(detail_df)
-                            if isinstance(mix_all, pd.DataFrame) and not mix_all.empty:
-                                return mix_all[
-                                    mix_all["Month"].astype(str).isin(
-                                        [str(m) for m in sel_months_local]
-                                    )
-                                ].copy()
-                        except Exception:
-                            pass
-                    return t1_q2_u
-                if gid == "q3":
-                    regs_sel = list((gf or {}).get("regions") or [])
-                    if (
-                        len(regs_sel) == 1
-                        and isinstance(t1_q4_f, pd.DataFrame)
-                        and not t1_q4_f.empty
-                    ):
-                        df = t1_q4_f.copy()
-                        if "rgn" in df.columns:
-                            try:
-                                df = df[df["rgn"] == regs_sel[0]]
-                            except Exception:
-                                pass
-                        return df
-                    return t1_q1_f
-                if gid == "q4":
-                    return t1_q4_f
-                if gid == "q5":
-                    return t1_q5_f
-                if gid == "q6":
-                    d = (
-                        t1_q4_f
-                        if isinstance(t1_q4_f, pd.DataFrame) and not t1_q4_f.empty
-                        else t1_q1_f
-                    )
-                    if not isinstance(d, pd.DataFrame) or d.empty:
-                        return pd.DataFrame(columns=["category", "count"])
-                    cat_col = (
-                        "outlet_category"
-                        if "outlet_category" in d.columns
-                        else ("Category" if "Category" in d.columns else None)
-                    )
-                    if not cat_col:
-                        return pd.DataFrame(columns=["category", "count"])
-                    try:
-                        c = (
-                            d[[cat_col]]
-                            .dropna()
-                            .groupby(cat_col, dropna=False)
-                            .size()
-                            .reset_index(name="count")
-                        )
-                        return c.rename(columns={cat_col: "category"})
-                    except Exception:
-                        return pd.DataFrame(columns=["category", "count"])
-                if gid == "t2-graph-dyn":
-                    return t2_df_chart
-                if gid == "t3-graph-1":
-                    return t3_q1_chart
-                if gid == "t3-graph-2":
-                    return t3_q2_chart
-            except Exception:
-                pass
-            return pd.DataFrame()
-
         full_dfs_by_gid: dict[str, pd.DataFrame] = {}
         use_chunking = False
         for ch in charts_payload:
             gid = ch.get("graph_id")
-            # Support month-specific graph IDs (e.g., "q1-month-april", "t3-graph-1-month-May")
-            base_gid = gid
-            month_label = None
-            try:
-                import re as _re
-                m = _re.match(r"^(.*?)-month-(.+)$", str(gid))
-                if m:
-                    base_gid = m.group(1)
-                    month_label = m.group(2)
-            except Exception:
-                pass
-
-            # Build base full dataframe for the underlying gid
-            df_full = _build_full_df_for_gid(base_gid)
-
-            # Special cases for month-specific IDs handled by DRY helper
-            if month_label:
-                try:
-                    md = _month_df_for_gid(base_gid, str(month_label))
-                    if isinstance(md, pd.DataFrame) and not md.empty:
-                        df_full = md
-                except Exception:
-                    pass
-
-            # Generic month filter when Month exists on the base frame
-            if month_label and isinstance(df_full, pd.DataFrame) and not df_full.empty and "Month" in df_full.columns:
-                try:
-                    df_full = df_full[df_full["Month"].astype(str) == str(month_label)].copy()
-                except Exception:
-                    # fall back silently if filtering fails
-                    pass
-
-            if (
-                use_filtered_scope
-                and base_gid == "t2-graph-dyn"
-                and isinstance(df_full, pd.DataFrame)
-            ):
-                chart_meta = ch.get("meta") if isinstance(ch, dict) else {}
-                df_full = _prepare_tab2_filtered_df(
-                    df_full,
-                    t2_x_current or (chart_meta or {}).get("x"),
-                    t2_y_current or (chart_meta or {}).get("y"),
-                    (t2_color_current or (chart_meta or {}).get("color") or "outlet_category"),
-                )
-
+            df_full = report.full_frame(ch)
             full_dfs_by_gid[gid] = df_full
             try:
                 if isinstance(df_full, pd.DataFrame) and len(df_full) > max(300, int(ch.get("n_rows") or 0)):
@@ -2295,7 +1621,8 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
             ]
         ), debug_view, True
 
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace="ui", function_name="toggleFilterControls"),
         Output("outlet-category-filter", "disabled"),
         Output("outlet-category-filter", "style"),
         Output("region-filter", "disabled"),
@@ -2319,41 +1646,12 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         Output("t2-color-dim", "disabled"),
         Output("t2-color-dim", "style"),
         Input("insights-active", "data"),
+        State("ui-config", "data"),
     )
-    def toggle_filter_controls(insights_active):
-        disabled = bool(insights_active)
-        dropdown_style = _dropdown_cursor_style(disabled)
-        checklist_style = _checklist_cursor_style(disabled)
-        reset_style = _button_cursor_style(RESET_BUTTON_STYLE, disabled)
-        clear_sel_style = _button_cursor_style(CLEAR_SELECTION_STYLE, disabled)
-        generate_style = _button_cursor_style(GENERATE_BUTTON_STYLE, disabled)
-        return (
-            disabled,
-            dropdown_style,
-            disabled,
-            dropdown_style.copy(),
-            disabled,
-            dropdown_style.copy(),
-            disabled,
-            dropdown_style.copy(),
-            disabled,
-            reset_style,
-            disabled,
-            clear_sel_style,
-            disabled,
-            generate_style,
-            checklist_style,
-            checklist_style,
-            disabled,
-            dropdown_style.copy(),
-            disabled,
-            dropdown_style.copy(),
-            disabled,
-            dropdown_style.copy(),
-        )
 
     # ----- Filter controller: click-to-filter + global slicers -----
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace="ui", function_name="updateFilters"),
         Output("filter-store", "data"),
         Output("active-selection", "data"),
         Output("outlet-category-filter", "value"),
@@ -2382,343 +1680,47 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         State("active-selection", "data"),
         State("t2-color-dim", "value"),
         State("insights-active", "data"),
+        State("ui-config", "data"),
         prevent_initial_call=True,
     )
-    def update_filters_and_ui(
-        reset_clicks,
-        outlet_cats,
-        regions,
-        outlet_types,
-        months_value,
-        month_compare_value_side,
-        click_q2,
-        click_q3,
-        click_q4,
-        click_q5,
-        click_q6,
-        click_t2_dyn,
-        click_t3_g1,
-        click_t3_g2,
-        current_filters,
-        active_selection,
-        t2_color_dim,
-        insights_active,
-    ):
-        if bool(insights_active):
-            raise PreventUpdate
-        def make_key(graph_id, point):
-            def _cd(p, i=0, default=None):
-                try:
-                    return p.get("customdata", [default])[i]
-                except Exception:
-                    return default
-
-            # graph-q1 removed
-            if graph_id == "graph-q2":
-                # stacked 100% bar: customdata carries [region, category]
-                reg = _cd(point, 0)
-                cat = _cd(point, 1)
-                return f"q2|category={cat}|region={reg}"
-            if graph_id == "graph-q3":
-                # region-level scatter: customdata carries [region]
-                reg = _cd(point, 0)
-                return f"q3|region={reg}"
-            if graph_id == "graph-q4":
-                return f"q4|region={_cd(point, 0)}|outlet={_cd(point, 1)}"
-            if graph_id == "graph-q5":
-                return f"q5|region={_cd(point, 0)}|outlet={_cd(point, 1)}"
-            if graph_id == "graph-q6":
-                # category count bar: x is outlet_category
-                return f"q6|category={point.get('x')}"
-            return None
-
-        # removed unused Tab 2 key builder
-
-        trig = ctx.triggered[0]
-        trig_id = trig["prop_id"].split(".")[0]
-
-        if trig_id == "reset-button":
-            df = default_filters
-            return (
-                df,
-                None,
-                [],
-                [],
-                [],
-                df.get("months", ["april"]),
-            )
-
-        if trig_id in ("outlet-category-filter", "region-filter", "outlet-type-filter"):
-            new_filters = current_filters.copy()
-            new_filters["outlet_categories"] = outlet_cats or []
-            new_filters["regions"] = regions or []
-            new_filters["outlet_types"] = outlet_types or []
-            return (
-                new_filters,
-                None,
-                new_filters["outlet_categories"],
-                new_filters["regions"],
-                new_filters["outlet_types"],
-                new_filters.get("months", ["april"]),
-            )
 
-        if trig_id == "month-filter":
-            new_filters = current_filters.copy()
-            new_filters["months"] = list(months_value or [])
-            if not new_filters["months"]:
-                new_filters["months"] = ["april"]
-            # If fewer than 2 months are selected, force compare off
-            if len(new_filters["months"]) <= 1:
-                new_filters["compare_months"] = False
-            return (
-                new_filters,
-                None,
-                new_filters.get("outlet_categories", []),
-                new_filters.get("regions", []),
-                new_filters.get("outlet_types", []),
-                new_filters["months"],
-            )
+    # ----- Plot updates (stable colors via color_discrete_map) -----
+    def _tab1_month_frames(filters: dict | None):
+        from utils.dataframe import combine_month_frames
 
-        if trig_id == "month-compare-toggle-side":
-            new_filters = current_filters.copy()
-            # prefer the source of the trigger
-            val = month_compare_value_side
-            new_filters["compare_months"] = bool(val and ("compare" in val))
-            return (
-                new_filters,
-                None,
-                new_filters.get("outlet_categories", []),
-                new_filters.get("regions", []),
-                new_filters.get("outlet_types", []),
-                new_filters.get("months", ["april"]),
-            )
+        months = list((filters or {}).get("months") or ["april"])
+        return combine_month_frames(monthly_datasets or {}, months, "tab1") if monthly_datasets else tab1
 
-        if trig_id == "t2-graph-dynamic" and trig.get("value"):
-            # Update global filters based on clicked Tab 2 point, with toggle behavior
-            try:
-                point = trig["value"].get("points", [{}])[0]
-            except Exception:
-                point = {}
-            cd = point.get("customdata") or []
-            # customdata order: [outlet_name/sales_outlet, rgn, outlet_category, outlet_type]
-            reg = cd[1] if len(cd) >= 2 else None
-            cat = cd[2] if len(cd) >= 3 else None
-            otype = cd[3] if len(cd) >= 4 else None
-            # Build a stable key for toggle
-            key_parts = [f"r={reg}" if reg else None]
-            if (t2_color_dim or "") == "outlet_category" and cat:
-                key_parts.append(f"cat={cat}")
-            if (t2_color_dim or "") == "outlet_type" and otype:
-                key_parts.append(f"type={otype}")
-            key = (
-                "t2|" + "|".join([p for p in key_parts if p])
-                if any(key_parts)
-                else None
-            )
+    # Top-level layout keys the Tab 1 builders set only on some paths; a patch
+    # clears the ones the new figure lacks so nothing stale survives the merge
+    PATCH_LAYOUT_KEYS = ("annotations", "shapes", "title", "xaxis", "yaxis", "legend", "height", "margin", "uirevision")
 
-            # Toggle: clicking the same selection clears only the affected filters
-            if active_selection == key and key is not None:
-                nf = dict(current_filters or {})
-                # Clear region/category/type filters we may have set
-                if reg:
-                    nf["regions"] = []
-                if cat:
-                    nf["outlet_categories"] = []
-                if otype:
-                    nf["outlet_types"] = []
-                # Also set a toast message for Tab 2
-                # We piggyback by setting a side-effect store via a separate callback below
-                return (
-                    nf,
-                    None,
-                    nf.get("outlet_categories", []),
-                    nf.get("regions", []),
-                    nf.get("outlet_types", []),
-                    nf.get("months", ["april"]),
-                )
+    def figure_update(fig, initial: bool):
+        """`fig` on a callback's initial call, else a Patch without the layout template.
 
-            # Otherwise, apply filters and store active key
-            nf = dict(current_filters or {})
-            if reg:
-                nf["regions"] = [reg]
-            if (t2_color_dim or "") == "outlet_category" and cat:
-                nf["outlet_categories"] = [cat]
-            if (t2_color_dim or "") == "outlet_type" and otype:
-                nf["outlet_types"] = [otype]
-            # Apply and set active key
-            return (
-                nf,
-                key,
-                nf.get("outlet_categories", []),
-                nf.get("regions", []),
-                nf.get("outlet_types", []),
-                nf.get("months", ["april"]),
-            )
+        The template (~7 KB, the same for every figure) is most of a Tab 1
+        figure's payload; once the graph holds a figure from the same
+        callback only the traces and the rest of the layout change.
+        """
+        if initial:
+            return fig
+        full = fig.to_plotly_json()
+        layout = dict.fromkeys(PATCH_LAYOUT_KEYS)
+        layout.update({k: v for k, v in full["layout"].items() if k != "template"})
+        patch = Patch()
+        patch["data"] = full["data"]
+        patch["layout"].update(layout)
+        return patch
 
-        # Tab 3 -> Global filters: diverging bar click toggles outlet_category in global filters
-        if trig_id == "t3-graph-1" and trig.get("value"):
-            point = trig["value"].get("points", [{}])[0]
-            try:
-                cat = (point.get("customdata") or [None])[0]
-            except Exception:
-                cat = None
-            if not cat:
-                return (
-                    current_filters,
-                    active_selection,
-                    current_filters.get("outlet_categories", []),
-                    current_filters.get("regions", []),
-                    current_filters.get("outlet_types", []),
-                    current_filters.get("months", ["april"]),
-                )
-            key = f"t3g1|category={cat}"
-            # Toggle behavior: clicking same category clears only the category filter
-            if active_selection == key:
-                nf = dict(current_filters or {})
-                nf["outlet_categories"] = []
-                return (
-                    nf,
-                    None,
-                    nf.get("outlet_categories", []),
-                    nf.get("regions", []),
-                    nf.get("outlet_types", []),
-                    nf.get("months", ["april"]),
-                )
-            # Set selected category in global filters
-            nf = dict(current_filters or {})
-            nf["outlet_categories"] = [cat]
-            return (
-                nf,
-                key,
-                nf.get("outlet_categories", []),
-                nf.get("regions", []),
-                nf.get("outlet_types", []),
-                nf.get("months", ["april"]),
-            )
-
-        # Special toggle behavior for Tab 1 q2: clear only its filters when clicking same segment
-        if trig_id == "graph-q2" and trig.get("value"):
-            point = trig["value"].get("points", [{}])[0]
-            key = make_key(trig_id, point)
-            try:
-                reg = point.get("customdata", [None, None])[0]
-                cat = point.get("customdata", [None, None])[1]
-            except Exception:
-                reg, cat = None, None
-
-            if active_selection == key:
-                nf = dict(current_filters or {})
-                if reg:
-                    nf["regions"] = []
-                if cat:
-                    nf["outlet_categories"] = []
-                return (
-                    nf,
-                    None,
-                    nf.get("outlet_categories", []),
-                    nf.get("regions", []),
-                    nf.get("outlet_types", []),
-                    nf.get("months", ["april"]),
-                )
-
-            # Apply only the relevant filters (region/category), preserve others
-            nf = dict(current_filters or {})
-            if reg:
-                nf["regions"] = [reg]
-            if cat:
-                nf["outlet_categories"] = [cat]
-            return (
-                nf,
-                key,
-                nf.get("outlet_categories", []),
-                nf.get("regions", []),
-                nf.get("outlet_types", []),
-                nf.get("months", ["april"]),
-            )
-
-        if trig_id.startswith("graph-") and trig.get("value"):
-            point = trig["value"].get("points", [{}])[0]
-            key = make_key(trig_id, point)
-
-            if active_selection == key:
-                df = default_filters
-                return (
-                    df,
-                    None,
-                    [],
-                    [],
-                    [],
-                    df.get("months", ["april"]),
-                )
-
-            new_filters = default_filters.copy()
-            if trig_id == "graph-q1":
-                if point.get("y"):
-                    new_filters["regions"] = [point.get("y")]
-            elif trig_id == "graph-q2":
-                # stacked bar: customdata [region, category]
-                try:
-                    reg = point.get("customdata", [None, None])[0]
-                    cat = point.get("customdata", [None, None])[1]
-                except Exception:
-                    reg, cat = None, None
-                if reg:
-                    new_filters["regions"] = [reg]
-                if cat:
-                    new_filters["outlet_categories"] = [cat]
-            elif trig_id == "graph-q3":
-                # region-level scatter: customdata [region]
-                try:
-                    reg = point.get("customdata", [None])[0]
-                except Exception:
-                    reg = None
-                if reg:
-                    new_filters["regions"] = [reg]
-            elif trig_id in ("graph-q4", "graph-q5"):
-                # barh: y=Outlet
-                if point.get("y"):
-                    new_filters["outlets"] = [point.get("y")]
-            elif trig_id == "graph-q6":
-                # bar: x=outlet_category
-                if point.get("x"):
-                    new_filters["outlet_categories"] = [point.get("x")]
-
-            return (
-                new_filters,
-                key,
-                new_filters.get("outlet_categories", []),
-                new_filters.get("regions", []),
-                new_filters.get("outlet_types", []),
-                new_filters.get("months", ["april"]),
-            )
-
-        return (
-            current_filters,
-            active_selection,
-            current_filters.get("outlet_categories", []),
-            current_filters.get("regions", []),
-            current_filters.get("outlet_types", []),
-            current_filters.get("months", ["april"]),
-        )
-
-    # ----- Plot updates (stable colors via color_discrete_map) -----
     @app.callback(
         Output("graph-q3", "figure"),
         Output("graph-q6", "figure"),
-        Output("graph-q2", "figure"),
         Input("filter-store", "data"),
     )
     def update_graphs(filters):
-        # Helper: combine month datasets based on selection
-        def _combine_months(tab_key: str):
-            from utils.dataframe import combine_month_frames
-            months = list((filters or {}).get("months") or ["april"])
-            return combine_month_frames(monthly_datasets or {}, months, tab_key)
-
-        tab1_cur = _combine_months("tab1") if monthly_datasets else tab1
-        # Build filtered figures for q3 and q6
-        figs_filtered = build_tab1_figures(
-            tab1_cur,
+        # Only the filtered figures shown on the page are built
+        figs = build_tab1_figures(
+            _tab1_month_frames(filters),
             filters,
             all_outlet_categories,
             all_regions,
@@ -2726,44 +1728,54 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
             region_color_map,
             base_palette,
             GRAPH_LABELS,
+            only={"q3", "q6"},
         )
-        # Build unfiltered figure for q2 (percentage chart should ignore filters)
-        unf_filters = {"months": list((filters or {}).get("months") or ["april"]) }
-        figs_unfiltered = build_tab1_figures(
-            tab1_cur,
-            unf_filters,
+        # figs order: q1, q2, q3, q4, q5, q6
+        initial = ctx.triggered_id is None
+        return figure_update(figs[2], initial), figure_update(figs[5], initial)
+
+    # q2 (percentage chart) ignores filters: rebuild only when the month selection
+    # (or the data of a selected month, after a refresh) changes
+    @app.callback(
+        Output("graph-q2", "figure"),
+        Output("graph-q2-months", "data"),
+        Input("filter-store", "data"),
+        State("graph-q2-months", "data"),
+    )
+    def update_graph_q2(filters, drawn_months):
+        state = months_state(filters)
+        months = state[0]
+        if drawn_months is not None and list(drawn_months) == state:
+            raise PreventUpdate
+        figs = build_tab1_figures(
+            _tab1_month_frames(filters),
+            {"months": months},
             all_outlet_categories,
             all_regions,
             outlet_color_map,
             region_color_map,
             base_palette,
             GRAPH_LABELS,
+            only={"q2"},
         )
-        # figs order: q1, q2, q3, q4, q5, q6
-        return figs_filtered[2], figs_filtered[5], figs_unfiltered[1]
+        return figure_update(figs[1], drawn_months is None), state
 
     # ----- Sidebar compare toggle reset sync (avoid cyclic dependency) -----
     # Guard: disable/enable sidebar compare toggle based on month count (no value writes)
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace="ui", function_name="guardCompareSidebar"),
         Output("month-compare-toggle-side", "options"),
         Input("month-filter", "value"),
         prevent_initial_call=False,
     )
-    def guard_compare_sidebar(months_val):
-        months_list = list(months_val or [])
-        disabled = len(months_list) <= 1
-        # Return a single list (not a tuple) to match component prop type
-        # Use empty label; CSS will render the checkbox as a switch.
-        return [{"label": "", "value": "compare", "disabled": disabled}]
 
     # Reset compare toggle value on Reset button
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace="ui", function_name="resetCompareSidebar"),
         Output("month-compare-toggle-side", "value"),
         Input("reset-button", "n_clicks"),
         prevent_initial_call=True,
     )
-    def reset_compare_sidebar_value(_n):
-        return []
 
     # Tab 1 KPI cards removed per spec (no totals/overall at top)
 
@@ -2773,6 +1785,290 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         # Drilldown now rendered on the same scatter; keep this hidden container empty
         return None
 
+    # ----- Session key for server-side selection snapshots (one per page load) -----
+    @app.callback(
+        Output("session-id", "data"),
+        Input("session-id", "data"),
+    )
+    def assign_session_id(session_id):
+        if session_id:
+            raise PreventUpdate
+        return uuid.uuid4().hex
+
+    # ----- Chart datasets (selection snapshots, exports) -----
+    CHART_FRAME_IDS = {"q1", "q2", "q3", "q4", "q5", "q6", "t2-graph-dyn", "t3-graph-1", "t3-graph-2"}
+
+    def chart_frames(graph_key: str, filters: dict | None, tab3_local: dict | None = None) -> dict:
+        """{"full", "chart"} frames behind one chart, exactly as it is drawn.
+
+        "full" ignores every filter but the months; "chart" applies the global
+        filters (and the Tab 3 local ones). t3-graph-1 also returns
+        "alt_chart", the filtered radar-source table.
+        """
+        month_only = {"months": list((filters or {}).get("months") or ["april"])}
+
+        if graph_key in ("q1", "q2", "q3", "q4", "q5", "q6"):
+            # Build both full (unfiltered) and chart (current-filtered) datasets
+            df_q1_full, df_q2_full, _df_q3_full, df_q4_full, df_q5_full = t1_get_filtered_frames(
+                combine_months(month_only, "tab1"), month_only
+            )
+            df_q1_chart, _df_q2_chart, _df_q3_chart, df_q4_chart, df_q5_chart = t1_get_filtered_frames(
+                combine_months(filters, "tab1"), (filters or {})
+            )
+            # For q3, mirror the figure behavior: use region aggregates unless exactly one region selected
+            regs_sel = list((filters or {}).get("regions") or [])
+
+            # q6 figure shows aggregated counts by category; reproduce here
+            def _cat_counts(detail_df, fallback_df):
+                d = (
+                    detail_df
+                    if isinstance(detail_df, pd.DataFrame) and not detail_df.empty
+                    else fallback_df
+                )
+                if not isinstance(d, pd.DataFrame) or d.empty:
+                    return pd.DataFrame(columns=["category", "count"])
+                cat_col = (
+                    "outlet_category"
+                    if "outlet_category" in d.columns
+                    else ("Category" if "Category" in d.columns else None)
+                )
+                if not cat_col:
+                    return pd.DataFrame(columns=["category", "count"])
+                try:
+                    c = (
+                        d[[cat_col]]
+                        .dropna()
+                        .groupby(cat_col, dropna=False, observed=True)
+                        .size()
+                        .reset_index(name="count")
+                    )
+                    c = c.rename(columns={cat_col: "category"})
+                    # order A-D when present
+                    c["category"] = pd.Categorical(
+                        c["category"],
+                        categories=["A", "B", "C", "D"],
+                        ordered=True,
+                    )
+                    c = c.sort_values("category")
+                except Exception:
+                    c = pd.DataFrame(columns=["category", "count"])
+                return c
+
+            if graph_key == "q6":
+                return {
+                    "full": _cat_counts(df_q4_full, df_q1_full),
+                    "chart": _cat_counts(df_q4_chart, df_q1_chart),
+                }
+            full, chart = {
+                "q1": (df_q1_full, df_q1_chart),
+                "q2": (df_q2_full, df_q2_full),
+                "q3": (df_q1_full, df_q4_chart if len(regs_sel) == 1 else df_q1_chart),
+                "q4": (df_q4_full, df_q4_chart),
+                "q5": (df_q5_full, df_q5_chart),
+            }[graph_key]
+            return {"full": full, "chart": chart}
+
+        if graph_key == "t2-graph-dyn":
+            ret_full = t2_get_filtered_frames(combine_months(month_only, "tab2"), month_only)
+            ret_chart = t2_get_filtered_frames(combine_months(filters, "tab2"), (filters or {}))
+            return {
+                "full": ret_full[0] if isinstance(ret_full, tuple) else ret_full,
+                "chart": ret_chart[0] if isinstance(ret_chart, tuple) else ret_chart,
+            }
+
+        if graph_key in ("t3-graph-1", "t3-graph-2"):
+            tab3_current = combine_months(filters, "tab3") or {}
+            if graph_key == "t3-graph-2":
+                # Profiles should match the static pre-aggregated radar source
+                radar = tab3_current.get("radar-chart-before-filtering-q2", pd.DataFrame())
+                return {"full": radar, "chart": radar}
+            q1_t3_full, _q2, _q3, _q4 = t3_get_filtered_frames(
+                combine_months(month_only, "tab3") or {}, month_only
+            )
+
+            # Merge global and local filters for chart scope
+            gf = filters or {}
+            lf = tab3_local or {}
+
+            def combine(a, b):
+                la = list(a or [])
+                lb = list(b or [])
+                if la and lb:
+                    sb = set(lb)
+                    return [x for x in la if x in sb]
+                return la or lb
+
+            merged = {
+                "outlet_categories": combine(
+                    gf.get("outlet_categories"), lf.get("outlet_categories")
+                ),
+                "regions": list(gf.get("regions", [])),
+                "sales_center_codes": list(lf.get("sales_center_codes", [])),
+                "shortfall_side": lf.get("shortfall_side"),
+                "kpi_focus": lf.get("kpi_focus"),
+                "search_text": gf.get("search_text", ""),
+                "outlet_types": list(gf.get("outlet_types", [])),
+            }
+            q1_t3_chart, q2_t3_chart, _q3, _q4 = t3_get_filtered_frames(tab3_current, merged)
+            return {"full": q1_t3_full, "chart": q1_t3_chart, "alt_chart": q2_t3_chart}
+
+        raise KeyError(graph_key)
+
+    # ----- Metrics: Prometheus text on GET /metrics + sidebar diagnostics -----
+    if METRICS_ENABLED:
+
+        @app.server.route("/metrics")
+        def prometheus_metrics():
+            from flask import Response
+
+            return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    app.clientside_callback(
+        ClientsideFunction(namespace="ui", function_name="toggleMetricsPolling"),
+        Output("metrics-interval", "disabled"),
+        Input("metrics-summary", "n_clicks"),
+    )
+
+    @app.callback(
+        Output("metrics-panel", "children"),
+        Input("metrics-interval", "n_intervals"),
+        Input("metrics-summary", "n_clicks"),
+        prevent_initial_call=True,
+    )
+    def render_metrics_panel(_n, clicks):
+        # Only refresh while the panel is open (odd number of summary clicks)
+        if not METRICS_ENABLED or not (clicks or 0) % 2:
+            raise PreventUpdate
+        rows = metrics.recent_summary()
+        if not rows:
+            return html.Div("No callback requests recorded yet.")
+        columns = ["callback", "calls", "p50_ms", "p95_ms", "max_ms", "compute_ms", "serialize_ms", "resp_kb"]
+        return dash_table.DataTable(
+            data=rows,
+            columns=[{"name": c, "id": c} for c in columns],
+            style_table={"overflowX": "auto"},
+            style_cell={"fontSize": "11px", "padding": "2px 6px", "textAlign": "right"},
+            style_cell_conditional=[{"if": {"column_id": "callback"}, "textAlign": "left"}],
+            style_header={"fontWeight": 700},
+        )
+
+    # ----- Data refresh: started by the first request of each process, so
+    # preloaded gunicorn workers each run their own thread after the fork -----
+    if refresher is not None:
+
+        @app.server.before_request
+        def start_refresher():
+            from flask import request
+
+            if request.path not in ("/healthz", "/readyz"):
+                refresher.ensure_started()
+
+    # ----- Health: GET /healthz (process is up), GET /readyz (data is loaded) -----
+    @app.server.route("/healthz")
+    def healthz():
+        return {"status": "ok"}
+
+    @app.server.route("/readyz")
+    def readyz():
+        """200 once every month has Tab 1 rows (or DASH_OFFLINE), else 503."""
+        rows = {m: month_rows(tabs) for m, tabs in list((monthly_datasets or {}).items())}
+        ready = DASH_OFFLINE or (bool(rows) and all(rows.values()))
+        body = {
+            "status": "ready" if ready else "not_ready",
+            "pid": os.getpid(),
+            "months": rows,
+            "data_version": data_version() if ready else None,
+            "reloads": dict(month_versions),
+        }
+        return body, 200 if ready else 503
+
+    # ----- Dataset export: GET /export/<graph_id>?format=csv|arrow|parquet -----
+    # Query: scope=chart|full, filters=<filter-store JSON>, local=<Tab 3 local
+    # filter JSON>, months=all|april,May (one frame per month, streamed in
+    # turn), compression=<arrow/parquet codec>. CSV is gzip-encoded when the
+    # client accepts it. Range requests are served from a materialized file so
+    # interrupted downloads can resume.
+    @app.server.route("/export/<graph_id>")
+    def export_chart_data(graph_id):
+        from flask import Response, abort, request, send_file, stream_with_context
+
+        args = request.args
+        fmt = args.get("format", "csv")
+        scope = "full" if args.get("scope") == "full" else "chart"
+        if fmt not in EXPORT_FORMATS:
+            abort(400, f"format must be one of {', '.join(EXPORT_FORMATS)}")
+        try:
+            filters = json.loads(args.get("filters") or "{}")
+            local = json.loads(args.get("local") or "{}")
+        except ValueError:
+            abort(400, "filters/local must be JSON objects")
+        if not isinstance(filters, dict) or not isinstance(local, dict):
+            abort(400, "filters/local must be JSON objects")
+        months_arg = args.get("months")
+        if months_arg == "all":
+            months = list(monthly_datasets or {}) or None
+        elif months_arg:
+            months = [m for m in months_arg.split(",") if m]
+            valid = list(monthly_datasets or {})
+            unknown = [m for m in months if m not in valid]
+            if unknown or not months:
+                abort(400, f"unknown months: {', '.join(unknown) or months_arg}; valid months: {', '.join(['all'] + valid)}")
+        else:
+            months = None
+        if graph_id not in CHART_FRAME_IDS:
+            abort(404)
+
+        def frames() -> list:
+            # Each month's frame is computed once; stream_frames reads all of
+            # them for the schema before the first byte, so a column mismatch
+            # never fails mid-stream, and frees each one once it is written
+            return [
+                chart_frames(graph_id, filters if m is None else {**filters, "months": [m]}, local)[scope]
+                for m in months or [None]
+            ]
+
+        mimetype, ext = EXPORT_FORMATS[fmt]
+        name = f"{graph_id}-{scope}.{ext}"
+        compression = args.get("compression") or None
+        if fmt == "csv":
+            compression = None
+        try:
+            if request.range is not None:
+                os.makedirs(EXPORT_CACHE_DIR, exist_ok=True)
+                prune_exports(EXPORT_CACHE_DIR, EXPORT_CACHE_TTL)
+                digest = hashlib.sha1(
+                    json.dumps(
+                        [graph_id, fmt, scope, filters, local, months, compression,
+                         data_version()],
+                        sort_keys=True,
+                        default=str,
+                    ).encode("utf-8")
+                ).hexdigest()
+                path = os.path.abspath(os.path.join(EXPORT_CACHE_DIR, f"{digest}.{ext}"))
+                if not os.path.exists(path):
+                    write_export(frames(), path, fmt, compression)
+                return send_file(
+                    path,
+                    mimetype=mimetype,
+                    as_attachment=True,
+                    download_name=name,
+                    conditional=True,
+                    etag=digest,
+                    max_age=EXPORT_CACHE_TTL,
+                )
+            headers = {
+                "Content-Disposition": f'attachment; filename="{name}"',
+                "Accept-Ranges": "bytes",
+                "Vary": "Accept-Encoding",
+            }
+            if fmt == "csv" and "gzip" in request.headers.get("Accept-Encoding", ""):
+                compression = "gzip"
+                headers["Content-Encoding"] = "gzip"
+            body = stream_frames(frames(), fmt, compression)
+        except ImportError:
+            abort(501, "pyarrow is required for Arrow/Parquet exports")
+        return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+
     # ----- Multi-select buttons: capture selections & store snapshots -----
     @app.callback(
         Output("selected-graphs", "data"),
@@ -2790,6 +2086,7 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         State("t2-x-param", "value"),
         State("t2-y-param", "value"),
         State("t2-color-dim", "value"),
+        State("session-id", "data"),
         prevent_initial_call=True,
     )
     def handle_select(
@@ -2803,6 +2100,7 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         t2_x,
         t2_y,
         t2_color,
+        session_id,
     ):
         triggered = ctx.triggered_id
         if triggered is None:
@@ -2813,9 +2111,14 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
 
         selected_graphs = list(selected_graphs or [])
         selected_data = dict(selected_data or {})
+        # Snapshots are stored per page load; wait for assign_session_id
+        # rather than sharing one bucket between every session-less client
+        if not session_id:
+            raise PreventUpdate
 
         # Clear selection request from sidebar
         if triggered == "clear-selection":
+            selection_store.drop(session_id)
             info = html.Div(
                 "No charts selected yet.",
                 style={"color": "#6b7280", "fontSize": "13px"},
@@ -2836,11 +2139,13 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
             if graph_id in selected_graphs:
                 selected_graphs = [g for g in selected_graphs if g != graph_id]
                 selected_data.pop(graph_id, None)
+                selection_store.drop(session_id, graph_id)
             else:
                 selected_graphs.append(graph_id)
+                # Frames stay server-side; the browser store only carries handles
                 selected_data[graph_id] = {
-                    "full": pack_df(df_full),
-                    "chart": pack_df(df_chart),
+                    "full": selection_store.put(session_id, graph_id, "full", df_full),
+                    "chart": selection_store.put(session_id, graph_id, "chart", df_chart),
                 }
 
         def _basic_stats(dframe, cols):
@@ -2871,74 +2176,14 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         tab1_graphs = {"q1", "q2", "q3", "q4", "q5", "q6"}
         tab3_graphs = {"t3-graph-1", "t3-graph-2"}
 
+        try:
+            frames = chart_frames(graph_key, filters, tab3_local)
+        except KeyError:
+            raise PreventUpdate
+
         # Tab 1 mapping (ensure datasets match what's drawn)
         if graph_key in tab1_graphs:
-            # Build both full (unfiltered) and chart (current-filtered) datasets
-            tab1_full = combine_months(
-                {"months": list((filters or {}).get("months") or ["april"])}, "tab1"
-            )
-            df_q1_full, df_q2_full, df_q3_full, df_q4_full, df_q5_full = t1_get_filtered_frames(
-                tab1_full, {"months": list((filters or {}).get("months") or ["april"])}
-            )
-            tab1_chart = combine_months(filters, "tab1")
-            df_q1_chart, df_q2_chart, df_q3_chart, df_q4_chart, df_q5_chart = t1_get_filtered_frames(
-                tab1_chart, (filters or {})
-            )
-            # For q3, mirror the figure behavior: use region aggregates unless exactly one region selected
-            regs_sel = list((filters or {}).get("regions") or [])
-            q3_full_df = df_q1_full
-            q3_chart_df = df_q4_chart if len(regs_sel) == 1 else df_q1_chart
-
-            # q6 figure shows aggregated counts by category; reproduce here
-            def _cat_counts(detail_df, fallback_df):
-                import pandas as _pd
-
-                d = (
-                    detail_df
-                    if isinstance(detail_df, _pd.DataFrame) and not detail_df.empty
-                    else fallback_df
-                )
-                if not isinstance(d, _pd.DataFrame) or d.empty:
-                    return _pd.DataFrame(columns=["category", "count"])
-                cat_col = (
-                    "outlet_category"
-                    if "outlet_category" in d.columns
-                    else ("Category" if "Category" in d.columns else None)
-                )
-                if not cat_col:
-                    return _pd.DataFrame(columns=["category", "count"])
-                try:
-                    c = (
-                        d[[cat_col]]
-                        .dropna()
-                        .groupby(cat_col, dropna=False)
-                        .size()
-                        .reset_index(name="count")
-                    )
-                    c = c.rename(columns={cat_col: "category"})
-                    # order A-D when present
-                    c["category"] = _pd.Categorical(
-                        c["category"],
-                        categories=["A", "B", "C", "D"],
-                        ordered=True,
-                    )
-                    c = c.sort_values("category")
-                except Exception:
-                    c = _pd.DataFrame(columns=["category", "count"])
-                return c
-
-            id_map = {
-                "q1": (df_q1_full, df_q1_chart),
-                "q2": (df_q2_full, df_q2_full),
-                "q3": (q3_full_df, q3_chart_df),
-                "q4": (df_q4_full, df_q4_chart),
-                "q5": (df_q5_full, df_q5_chart),
-                "q6": (
-                    _cat_counts(df_q4_full, df_q1_full),
-                    _cat_counts(df_q4_chart, df_q1_chart),
-                ),
-            }
-            df_full, df_chart = id_map[graph_key]
+            df_full, df_chart = frames["full"], frames["chart"]
             toggle(graph_key, df_full, df_chart)
             # Attach meta per figure where applicable
             if graph_key == "q3":
@@ -2981,13 +2226,8 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
                     pass
         # Tab 2 dynamic (store UNFILTERED datasets for LLM)
         elif graph_key == "t2-graph-dyn":
-            tab2_full = combine_months({"months": list((filters or {}).get("months") or ["april"])}, "tab2")
-            ret_full = t2_get_filtered_frames(tab2_full, {"months": list((filters or {}).get("months") or ["april"])})
-            tab2_chart = combine_months(filters, "tab2")
-            ret_chart = t2_get_filtered_frames(tab2_chart, (filters or {}))
-            df1_full = ret_full[0] if isinstance(ret_full, tuple) else ret_full
-            df1_chart = ret_chart[0] if isinstance(ret_chart, tuple) else ret_chart
-            toggle(graph_key, df1_full, df1_chart)
+            df1_chart = frames["chart"]
+            toggle(graph_key, frames["full"], df1_chart)
             # Attach axis/color selections for LLM prompt only when selected
             if graph_key in selected_graphs:
                 md = selected_data.get(graph_key, {})
@@ -3000,114 +2240,49 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
                         if isinstance(df1_chart, pd.DataFrame)
                         else _pd.DataFrame()
                     )
-                    r = None
-                    if t2_x in d.columns and t2_y in d.columns:
-                        x2 = _pd.to_numeric(d[t2_x], errors="coerce")
-                        y2 = _pd.to_numeric(d[t2_y], errors="coerce")
-                        r = float(x2.corr(y2)) if len(d) >= 2 else None
+                    pair = correlation_stats(
+                        d, cache_key=t2_corr_key(filters)
+                    ).pair(t2_x, t2_y) or {}
                     md["meta"] = {
                         "x": t2_x,
                         "y": t2_y,
                         "color": t2_color,
                         "stats": _basic_stats(d, [t2_x, t2_y]),
-                        "correlation_r": r,
+                        "correlation_r": pair.get("pearson_r"),
+                        "pair_stats": pair or None,
                     }
                 except Exception:
                     md["meta"] = {"x": t2_x, "y": t2_y, "color": t2_color}
                 selected_data[graph_key] = md
         # Tab 3 mapping (store UNFILTERED datasets for LLM)
         elif graph_key in tab3_graphs:
-            # Build both full (unfiltered) and chart (global+local filtered) datasets
-            tab3_full = combine_months({"months": list((filters or {}).get("months") or ["april"])}, "tab3")
-            q1_t3_full, q2_t3_full, q3_t3_full, q4_t3_full = t3_get_filtered_frames(
-                tab3_full or {},
-                {"months": list((filters or {}).get("months") or ["april"]) }
-            )
-
-            # Merge global and local filters for chart scope
-            gf = filters or {}
-            lf = tab3_local or {}
-
-            def combine(a, b):
-                la = list(a or [])
-                lb = list(b or [])
-                if la and lb:
-                    sb = set(lb)
-                    return [x for x in la if x in sb]
-                return la or lb
-
-            merged = {
-                "outlet_categories": combine(
-                    gf.get("outlet_categories"), lf.get("outlet_categories")
-                ),
-                "regions": list(gf.get("regions", [])),
-                "sales_center_codes": list(lf.get("sales_center_codes", [])),
-                "shortfall_side": lf.get("shortfall_side"),
-                "kpi_focus": lf.get("kpi_focus"),
-                "search_text": gf.get("search_text", ""),
-                "outlet_types": list(gf.get("outlet_types", [])),
-            }
-            tab3_current = combine_months(filters, "tab3") or {}
-            q1_t3_chart, q2_t3_chart, q3_t3_chart, q4_t3_chart = t3_get_filtered_frames(
-                tab3_current,
-                merged
-            )
-            id_map3 = {
-                "t3-graph-1": (q1_t3_full, q1_t3_chart),
-                # Profiles should match the static pre-aggregated radar source
-                "t3-graph-2": (
-                    tab3_current.get("radar-chart-before-filtering-q2", pd.DataFrame()),
-                    tab3_current.get("radar-chart-before-filtering-q2", pd.DataFrame()),
-                ),
-            }
-            df_full, df_chart = id_map3[graph_key]
-            toggle(graph_key, df_full, df_chart)
+            toggle(graph_key, frames["full"], frames["chart"])
             # For the top Tab 3 chart, also include the alternate dataset (q2) for LLM when selected
             if graph_key == "t3-graph-1" and (graph_key in selected_graphs):
                 sd = selected_data.get(graph_key, {})
                 # alt_full should reflect the pre-aggregated q2 table from data layer (sheet3)
-                alt_unfiltered = (data_dict_3 or {}).get("q2", pd.DataFrame())
-                sd["alt_full"] = pack_df(alt_unfiltered)
+                default_tab3 = next(iter((monthly_datasets or {}).values()), {}).get("tab3") or data_dict_3
+                alt_unfiltered = (default_tab3 or {}).get("q2", pd.DataFrame())
+                sd["alt_full"] = selection_store.put(
+                    session_id, graph_key, "alt_full", alt_unfiltered
+                )
                 # alt_chart uses the filtered radar-source table
-                sd["alt_chart"] = pack_df(q2_t3_chart)
+                sd["alt_chart"] = selection_store.put(
+                    session_id, graph_key, "alt_chart", frames["alt_chart"]
+                )
 
                 # Add derived KPI gap table (what bar actually plots) as a third dataset
-                def _gap_table(dframe: pd.DataFrame):
-                    import pandas as _pd
-
-                    if not isinstance(dframe, _pd.DataFrame) or dframe.empty:
-                        return _pd.DataFrame(columns=["outlet_category", "kpi", "gap_value"])
-                    rows = []
-                    cats = ["B", "C", "D"]
-                    for col, disp in KPI_DISPLAY:
-                        if col not in dframe.columns:
-                            continue
-                        try:
-                            g = (
-                                dframe[dframe["outlet_category"].isin(cats)]
-                                .groupby("outlet_category")[col]
-                                .mean()
-                            )
-                        except Exception:
-                            continue
-                        for cat in cats:
-                            if cat in g and pd.notna(g[cat]):
-                                rows.append(
-                                    {
-                                        "outlet_category": cat,
-                                        "kpi": disp,
-                                        "gap_value": float(g[cat]) - 100.0,
-                                    }
-                                )
-                    return _pd.DataFrame(rows)
-
-                sd["gap_full"] = pack_df(_gap_table(q1_t3_full))
-                sd["gap_chart"] = pack_df(_gap_table(q1_t3_chart))
+                sd["gap_full"] = selection_store.put(
+                    session_id, graph_key, "gap_full", kpi_gap_table(frames["full"])
+                )
+                sd["gap_chart"] = selection_store.put(
+                    session_id, graph_key, "gap_chart", kpi_gap_table(frames["chart"])
+                )
                 # Meta: top absolute gaps and which categories included
                 try:
                     import pandas as _pd
 
-                    gdf = _gap_table(q1_t3_chart)
+                    gdf = kpi_gap_table(frames["chart"])
                     top = []
                     if isinstance(gdf, _pd.DataFrame) and not gdf.empty:
                         gdf["abs_gap"] = gdf["gap_value"].abs()
@@ -3173,210 +2348,168 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         return selected_graphs, pressed, selected_data, info
 
     # ----- View-underlying-data tables (inline) -----
-    @app.callback(
-        # Tab 1 tables
-        Output("table-q1", "children"),
-        Output("table-q2", "children"),
-        Output("table-q3", "children"),
-        Output("table-q4", "children"),
-        Output("table-q5", "children"),
-        Output("table-q6", "children"),
-        # Tab 2 table
-        Output("table-t2-dyn", "children"),
-        # Tab 3 tables
-        Output("table-t3-1", "children"),
-        Output("table-t3-2", "children"),
-        Output("table-t3-3", "children"),
-        # Pressed state for all view buttons
-        Output("btn-view-q1", "aria-pressed"),
-        Output("btn-view-q2", "aria-pressed"),
-        Output("btn-view-q3", "aria-pressed"),
-        Output("btn-view-q4", "aria-pressed"),
-        Output("btn-view-q5", "aria-pressed"),
-        Output("btn-view-q6", "aria-pressed"),
-        Output("btn-view-t2-dyn", "aria-pressed"),
-        Output("btn-view-t3-1", "aria-pressed"),
-        Output("btn-view-t3-1-new", "aria-pressed"),
-        Output("btn-view-t3-3", "aria-pressed"),
-        # Inputs: all view buttons
-        Input("btn-view-q1", "n_clicks"),
-        Input("btn-view-q2", "n_clicks"),
-        Input("btn-view-q3", "n_clicks"),
-        Input("btn-view-q4", "n_clicks"),
-        Input("btn-view-q5", "n_clicks"),
-        Input("btn-view-q6", "n_clicks"),
-        Input("btn-view-t2-dyn", "n_clicks"),
-        Input("btn-view-t3-1", "n_clicks"),
-        Input("btn-view-t3-1-new", "n_clicks"),
-        Input("btn-view-t3-3", "n_clicks"),
-        # States: filters
-        State("filter-store", "data"),
-        State("tab3-filter-store", "data"),
-        State("t2-selected-region", "data"),
-        # States: current table contents for toggling
-        State("table-q1", "children"),
-        State("table-q2", "children"),
-        State("table-q3", "children"),
-        State("table-q4", "children"),
-        State("table-q5", "children"),
-        State("table-q6", "children"),
-        State("table-t2-dyn", "children"),
-        State("table-t3-1", "children"),
-        State("table-t3-2", "children"),
-        State("table-t3-3", "children"),
-        prevent_initial_call=True,
-    )
-    def show_underlying_tables(
-        vq1,
-        vq2,
-        vq3,
-        vq4,
-        vq5,
-        vq6,
-        vt2dyn,
-        vt3_1,
-        vt3_1_new,
-        vt3_3,
-        filters,
-        tab3_local,
-        t2_selected_region,
-        tq1,
-        tq2,
-        tq3,
-        tq4,
-        tq5,
-        tq6,
-        tt2dyn,
-        tt3_1,
-        tt3_2,
-        tt3_3,
-    ):
-        triggered = ctx.triggered_id
-        if triggered is None:
-            raise PreventUpdate
-
-        # Helper: build a DataTable from a DataFrame
-        def table_from_df(df):
-            import pandas as pd  # local import to avoid global dependency if not used elsewhere
-
-            if df is None or isinstance(df, pd.DataFrame) and df.empty:
-                return html.Div(
-                    "No data to display.",
-                    style={"color": "#6b7280", "fontSize": "13px", "marginTop": "6px"},
-                )
-            # Limit rows for UI responsiveness
-            try:
-                df = df.head(300)
-            except Exception:
-                pass
-            columns = [{"name": str(c), "id": str(c)} for c in df.columns]
-            return dash_table.DataTable(
-                columns=columns,
-                data=df.to_dict("records"),
-                page_size=10,
+    # Helper: build a DataTable from a DataFrame
+    def table_from_df(df, src: str | None = None, session_id: str | None = None):
+        """DataTable for a "View data" panel.
+
+        With a session the full frame is kept server-side and paged, sorted and
+        filtered there (page_view_table), so only one page is sent per request;
+        without one the first 300 rows are sent for native paging.
+        """
+        if df is None or isinstance(df, pd.DataFrame) and df.empty:
+            return html.Div(
+                "No data to display.",
+                style={"color": "#6b7280", "fontSize": "13px", "marginTop": "6px"},
+            )
+        columns = [
+            {
+                "name": str(c),
+                "id": str(c),
+                "type": "numeric" if pd.api.types.is_numeric_dtype(df[c]) else "text",
+            }
+            for c in df.columns
+        ]
+        if src and session_id:
+            ref = session_store.put(SessionStore.key(session_id, "view", src), df)
+            page, page_count, _ = query_frame(df, 0, 10)
+            paging = dict(
+                id={"type": "view-table", "src": src},
+                data=to_records(page),
+                page_current=0,
+                page_count=page_count,
+                page_action="custom",
+                sort_action="custom",
+                filter_action="custom",
+                filter_query="",
+            )
+            extra = [dcc.Store(id={"type": "view-table-ref", "src": src}, data=ref)]
+        else:
+            paging = dict(
+                data=to_records(df.head(300)),
                 sort_action="native",
                 filter_action="native",
-                style_table={
-                    "overflowX": "auto",
-                    "marginTop": "6px",
-                    "maxHeight": "50vh",
-                    "overflowY": "auto",
-                    "border": "1px solid #e5e7eb",
-                    "borderRadius": "8px",
-                },
-                style_cell={
-                    "fontFamily": "Roboto, sans-serif",
-                    "fontSize": 12,
-                    "padding": "8px",
-                    "whiteSpace": "normal",
-                    "height": "auto",
-                    "textAlign": "left",
-                },
-                style_header={
-                    "fontWeight": "bold",
-                    "backgroundColor": "#f3f4f6",
-                    "borderBottom": "1px solid #e5e7eb",
-                },
-                style_data_conditional=[
-                    {"if": {"row_index": "odd"}, "backgroundColor": "#fafafa"},
-                ],
-                fixed_rows={"headers": True},
-                style_as_list_view=True,
             )
+            extra = []
+        table = dash_table.DataTable(
+            columns=columns,
+            page_size=10,
+            **paging,
+            style_table={
+                "overflowX": "auto",
+                "marginTop": "6px",
+                "maxHeight": "50vh",
+                "overflowY": "auto",
+                "border": "1px solid #e5e7eb",
+                "borderRadius": "8px",
+            },
+            style_cell={
+                "fontFamily": "Roboto, sans-serif",
+                "fontSize": 12,
+                "padding": "8px",
+                "whiteSpace": "normal",
+                "height": "auto",
+                "textAlign": "left",
+            },
+            style_header={
+                "fontWeight": "bold",
+                "backgroundColor": "#f3f4f6",
+                "borderBottom": "1px solid #e5e7eb",
+            },
+            style_data_conditional=[
+                {"if": {"row_index": "odd"}, "backgroundColor": "#fafafa"},
+            ],
+            fixed_rows={"headers": True},
+            style_as_list_view=True,
+        )
+        return html.Div(extra + [table]) if extra else table
 
-        # Defaults: no update for all table outputs
-        out = [no_update] * 10
-
-        # Resolve filtered frames based on which section triggered
-        if triggered.startswith("btn-view-q"):
-            # Tab 1: all graphs are based on the same sheet1.q1 table
-            df_q1, _df2, _df3, df_q4, df_q5 = t1_get_filtered_frames(
-                tab1, (filters or {})
-            )
-            f = filters or {}
-            regs = list(f.get("regions") or [])
-            df_for_q3 = df_q4 if len(regs) == 1 else df_q1
+    @app.callback(
+        Output({"type": "view-table", "src": MATCH}, "data"),
+        Output({"type": "view-table", "src": MATCH}, "page_count"),
+        Output({"type": "view-table", "src": MATCH}, "page_current"),
+        Input({"type": "view-table", "src": MATCH}, "page_current"),
+        Input({"type": "view-table", "src": MATCH}, "page_size"),
+        Input({"type": "view-table", "src": MATCH}, "sort_by"),
+        Input({"type": "view-table", "src": MATCH}, "filter_query"),
+        State({"type": "view-table-ref", "src": MATCH}, "data"),
+        prevent_initial_call=True,
+    )
+    def page_view_table(page_current, page_size, sort_by, filter_query, ref):
+        df = session_store.get(ref)
+        if not isinstance(df, pd.DataFrame):
+            raise PreventUpdate
+        # A new sort/filter starts again at the first page
+        prop = (ctx.triggered[0]["prop_id"] if ctx.triggered else "").rsplit(".", 1)[-1]
+        if prop in ("sort_by", "filter_query"):
+            page_current = 0
+        page, page_count, page_current = query_frame(
+            df,
+            page_current,
+            page_size,
+            sort_by,
+            filter_query,
+            cache_key=json.dumps(ref, sort_keys=True),
+        )
+        return to_records(page), page_count, page_current
 
-            # Build unfiltered q2 dataset (rgn, category, count, pct) for view
+    def _view_frame(button_id: str, filters: dict | None, t2_selected_region) -> pd.DataFrame:
+        """Frame behind one "View data" button; only that button's data is computed."""
+        f = filters or {}
+        if button_id == "btn-view-q2":
+            # Unfiltered q2 dataset (rgn, category, count, pct), like the chart
             _q1_unf, df_q2_unf, _d3, _d4, _d5 = t1_get_filtered_frames(
-                combine_months(filters, "tab1"), {"months": list((filters or {}).get("months") or ["april"]) }
+                combine_months(filters, "tab1"), {"months": list(f.get("months") or ["april"])}
             )
-
-            id_map = {
-                "btn-view-q1": (0, df_q1, tq1),
-                "btn-view-q2": (1, df_q2_unf, tq2),
-                "btn-view-q3": (2, df_for_q3, tq3),
-                "btn-view-q4": (3, df_q1, tq4),
-                "btn-view-q5": (4, df_q1, tq5),
-            }
-            if triggered == "btn-view-q6":
-                # Build aggregated counts by category
-                detail = (
-                    df_q4
-                    if isinstance(df_q4, pd.DataFrame) and not df_q4.empty
-                    else df_q1
+            return df_q2_unf
+        if button_id.startswith("btn-view-q"):
+            # Tab 1: all other graphs are based on the same sheet1.q1 table,
+            # combined over the selected months exactly like the charts
+            df_q1, _df2, _df3, df_q4, _df5 = t1_get_filtered_frames(combine_months(filters, "tab1"), f)
+            if button_id == "btn-view-q3":
+                return df_q4 if len(list(f.get("regions") or [])) == 1 else df_q1
+            if button_id != "btn-view-q6":
+                return df_q1
+            # Aggregated counts by category
+            detail = (
+                df_q4
+                if isinstance(df_q4, pd.DataFrame) and not df_q4.empty
+                else df_q1
+            )
+            try:
+                cat_col = (
+                    "outlet_category"
+                    if "outlet_category" in detail.columns
+                    else ("Category" if "Category" in detail.columns else None)
                 )
+            except Exception:
+                cat_col = None
+            if not cat_col:
+                return detail
+            try:
+                counts = (
+                    detail[[cat_col]]
+                    .dropna()
+                    .groupby(cat_col, dropna=False, observed=True)
+                    .size()
+                    .reset_index(name="count")
+                )
+                # Order A-D when applicable
                 try:
-                    cat_col = (
-                        "outlet_category"
-                        if "outlet_category" in detail.columns
-                        else ("Category" if "Category" in detail.columns else None)
+                    counts[cat_col] = pd.Categorical(
+                        counts[cat_col],
+                        categories=["A", "B", "C", "D"],
+                        ordered=True,
                     )
+                    counts = counts.sort_values(cat_col)
                 except Exception:
-                    cat_col = None
-                if cat_col:
-                    try:
-                        counts = (
-                            detail[[cat_col]]
-                            .dropna()
-                            .groupby(cat_col, dropna=False)
-                            .size()
-                            .reset_index(name="count")
-                        )
-                        # Order A-D when applicable
-                        try:
-                            import pandas as _pd
-
-                            counts[cat_col] = _pd.Categorical(
-                                counts[cat_col],
-                                categories=["A", "B", "C", "D"],
-                                ordered=True,
-                            )
-                            counts = counts.sort_values(cat_col)
-                        except Exception:
-                            pass
-                    except Exception:
-                        counts = detail[[cat_col]].copy()
-                    out[5] = None if tq6 else table_from_df(counts)
-                else:
-                    out[5] = None if tq6 else table_from_df(detail)
-            else:
-                idx, df, cur = id_map[triggered]
-                out[idx] = None if cur else table_from_df(df)
-        elif triggered == "btn-view-t2-dyn":
+                    pass
+            except Exception:
+                counts = detail[[cat_col]]
+            return counts
+        if button_id == "btn-view-t2-dyn":
             # Match graph behavior: respect global filters; when drilling down, ignore the global region
             # and apply a normalized region filter after fetching the data.
-            df_src = dict(filters or {})
+            df_src = dict(f)
             if t2_selected_region and "regions" in df_src:
                 df_src.pop("regions", None)
             ret = t2_get_filtered_frames(combine_months(filters, "tab2"), df_src)
@@ -3388,66 +2521,82 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
                 and "rgn" in q1_t2.columns
             ):
                 try:
-                    sr = str(t2_selected_region).strip().casefold()
-                    tmp = q1_t2.copy()
-                    tmp["__r"] = tmp["rgn"].astype(str).str.strip().str.casefold()
-                    q1_t2 = tmp[tmp["__r"] == sr].drop(columns=["__r"])
+                    q1_t2 = q1_t2[casefold_mask(q1_t2["rgn"], [t2_selected_region])]
                 except Exception:
                     q1_t2 = q1_t2[q1_t2["rgn"] == t2_selected_region]
-            idx, df, cur = 6, q1_t2, tt2dyn
-            out[idx] = None if cur else table_from_df(df)
-        else:
-            # Tab 3 buttons: ensure each toggles its own table independently
-            if triggered == "btn-view-t3-1":
-                # View complete data: show unfiltered q1
-                df = (combine_months(filters, "tab3") or {}).get("q1", pd.DataFrame())
-                out[7] = None if tt3_1 else table_from_df(df)
-                out[8] = None
-            elif triggered == "btn-view-t3-1-new":
-                # View data: show q2 table from data layer (pre-aggregated / sheet3)
-                df = (combine_months(filters, "tab3") or {}).get("q2", pd.DataFrame())
-                out[8] = None if tt3_2 else table_from_df(df)
-                out[7] = None
-            elif triggered == "btn-view-t3-3":
-                # Profiles: show pre-aggregated radar-source table before filtering
-                df = (combine_months(filters, "tab3") or {}).get(
-                    "radar-chart-before-filtering-q2", pd.DataFrame()
-                )
-                out[9] = None if tt3_3 else table_from_df(df)
-
-        # Build final visibility/pressed states for each table button
-        current_tables = [
-            tq1,
-            tq2,
-            tq3,
-            tq4,
-            tq5,
-            tq6,  # 0..5
-            tt2dyn,  # 6
-            tt3_1,  # 7
-            tt3_2,  # 8
-            tt3_3,  # 9
-        ]
-        # Apply updated ones
-        final_tables = [
-            (out[i] if out[i] is not no_update else current_tables[i])
-            for i in range(10)
-        ]
-        # Pressed sequence: q1..q6, t2-dyn, t3-1 (q1 table), t3-1-new (q2 table), t3-3
-        pressed = [
-            ("true" if final_tables[0] is not None else "false"),
-            ("true" if final_tables[1] is not None else "false"),
-            ("true" if final_tables[2] is not None else "false"),
-            ("true" if final_tables[3] is not None else "false"),
-            ("true" if final_tables[4] is not None else "false"),
-            ("true" if final_tables[5] is not None else "false"),
-            ("true" if final_tables[6] is not None else "false"),
-            ("true" if final_tables[7] is not None else "false"),
-            ("true" if final_tables[8] is not None else "false"),
-            ("true" if final_tables[9] is not None else "false"),
-        ]
+            return q1_t2
+        # Tab 3: complete q1, pre-aggregated q2, or radar-source table before filtering
+        key = {
+            "btn-view-t3-1": "q1",
+            "btn-view-t3-1-new": "q2",
+            "btn-view-t3-3": "radar-chart-before-filtering-q2",
+        }[button_id]
+        return (combine_months(filters, "tab3") or {}).get(key, pd.DataFrame())
+
+    # One toggle callback per button: a click only rebuilds its own table, and the
+    # button's aria-pressed (not the rendered tables) tells whether it is open.
+    # No Patch here: opening sends a table built from the current filters (a
+    # previous one may be stale) and closing sends None, so there is no
+    # unchanged part of the output a partial update could leave out.
+    VIEW_TABLES = {
+        "btn-view-q1": "table-q1",
+        "btn-view-q2": "table-q2",
+        "btn-view-q3": "table-q3",
+        "btn-view-q4": "table-q4",
+        "btn-view-q5": "table-q5",
+        "btn-view-q6": "table-q6",
+        "btn-view-t2-dyn": "table-t2-dyn",
+        "btn-view-t3-3": "table-t3-3",
+    }
+    for _btn, _tbl in VIEW_TABLES.items():
+
+        @app.callback(
+            Output(_tbl, "children"),
+            Output(_btn, "aria-pressed"),
+            Input(_btn, "n_clicks"),
+            State(_btn, "aria-pressed"),
+            State("filter-store", "data"),
+            State("t2-selected-region", "data"),
+            State("session-id", "data"),
+            prevent_initial_call=True,
+        )
+        def toggle_view_table(
+            _n, pressed, filters, t2_selected_region, session_id, _btn=_btn
+        ):
+            if pressed == "true":
+                return None, "false"
+            table = table_from_df(
+                _view_frame(_btn, filters, t2_selected_region), _btn, session_id
+            )
+            return table, "true"
 
-        return tuple(out + pressed)
+    # Tab 3 top chart: "View complete data" and "View data" share one slot
+    @app.callback(
+        Output("table-t3-1", "children"),
+        Output("table-t3-2", "children"),
+        Output("btn-view-t3-1", "aria-pressed"),
+        Output("btn-view-t3-1-new", "aria-pressed"),
+        Input("btn-view-t3-1", "n_clicks"),
+        Input("btn-view-t3-1-new", "n_clicks"),
+        State("btn-view-t3-1", "aria-pressed"),
+        State("btn-view-t3-1-new", "aria-pressed"),
+        State("filter-store", "data"),
+        State("session-id", "data"),
+        prevent_initial_call=True,
+    )
+    def toggle_view_table_t3_1(_n1, _n2, pressed_1, pressed_2, filters, session_id):
+        triggered = ctx.triggered_id
+        if triggered is None:
+            raise PreventUpdate
+        was_open = (pressed_1 if triggered == "btn-view-t3-1" else pressed_2) == "true"
+        table = (
+            None
+            if was_open
+            else table_from_df(_view_frame(triggered, filters, None), triggered, session_id)
+        )
+        if triggered == "btn-view-t3-1":
+            return table, None, ("false" if was_open else "true"), "false"
+        return None, table, "false", ("false" if was_open else "true")
 
     # ----- Tab 2: dynamic correlation scatter -----
 
@@ -3459,9 +2608,12 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         Input("t2-y-param", "value"),
         Input("t2-color-dim", "value"),
         Input("t2-selected-region", "data"),
+        Input("t2-graph-dynamic", "relayoutData"),
     )
-    def update_tab2_dynamic_scatter(filters, xcol, ycol, color_dim, t2_selected_region):
-        import plotly.express as px
+    def update_tab2_dynamic_scatter(
+        filters, xcol, ycol, color_dim, t2_selected_region, relayout
+    ):
+        from utils import figures as fast_px
         from utils.colors import (
             category_color_map,
             brand_palette,
@@ -3476,7 +2628,7 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         df_src = dict(filters or {})
         df_tuple = t2_get_filtered_frames(combine_months(filters, "tab2"), df_src)
         df = df_tuple[0] if isinstance(df_tuple, tuple) else df_tuple
-        fig = px.scatter(
+        fig = fast_px.scatter(
             title=GRAPH_LABELS.get("t2-graph-dyn", "Explore Parameter Relationships")
         )
         if df is None or df.empty:
@@ -3493,38 +2645,11 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         # Normalize outlet name
         if "outlet_name" not in df.columns and "sales_outlet" in df.columns:
             df = df.rename(columns={"sales_outlet": "outlet_name"})
-        # Normalize region text (trim/casefold) to make filtering robust
-        if "rgn" in df.columns:
-            try:
-                df["rgn"] = df["rgn"].astype(str).str.strip()
-            except Exception:
-                pass
-
-        # Robust numeric coercion: handle strings like "85%", "85.0", or with commas
+        # KPI columns are typed at load time (data_layer.schema), so axis changes
+        # skip string parsing; only untyped input still goes through the schema
         def _coerce_numeric_col(dframe, col):
-            if col not in dframe.columns:
-                return
-            s = dframe[col]
-            try:
-                import pandas as _pd
-
-                if not _pd.api.types.is_numeric_dtype(s):
-                    s2 = (
-                        s.astype(str)
-                        .str.replace("%", "", regex=False)
-                        .str.replace(",", "", regex=False)
-                    )
-                    # extract the first numeric token
-                    s2 = s2.str.extract(r"([-+]?\d*\.?\d+)")[0]
-                    dframe[col] = _pd.to_numeric(s2, errors="coerce")
-                else:
-                    # already numeric
-                    pass
-            except Exception:
-                try:
-                    dframe[col] = pd.to_numeric(s, errors="coerce")
-                except Exception:
-                    pass
+            if col in dframe.columns and not _pd.api.types.is_numeric_dtype(dframe[col]):
+                dframe[col] = coerce_numeric(dframe[col])[0]
 
         _coerce_numeric_col(df, xcol)
         _coerce_numeric_col(df, ycol)
@@ -3544,7 +2669,7 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
 
         # Always show outlet-level points; refine to selected region(s) if present
         regs = list((filters or {}).get("regions") or [])
-        d = df.copy()
+        d = df
         # If a local region is selected (click), override to that single region
         if t2_selected_region and "rgn" in d.columns:
 
@@ -3556,8 +2681,7 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
 
             sr = _norm(t2_selected_region)
             try:
-                d["__r"] = d["rgn"].astype(str).str.strip().str.casefold()
-                d = d[d["__r"] == sr].drop(columns=["__r"])
+                d = d[casefold_mask(d["rgn"], [sr])]
             except Exception:
                 d = d[d["rgn"] == t2_selected_region]
             title_suffix = f" — {t2_selected_region}"
@@ -3571,11 +2695,33 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
 
         _coerce_numeric_col(d, xcol)
         _coerce_numeric_col(d, ycol)
+        # All KPI pairs of this view at once, so axis changes reuse the cached stats
+        pair = {}
+        try:
+            pair = correlation_stats(
+                d, cache_key=t2_corr_key(filters, "scatter", t2_selected_region)
+            ).pair(xcol, ycol) or {}
+        except Exception:
+            pass
         try:
             d = d.dropna(subset=[xcol, ycol])
         except Exception:
             pass
 
+        # Zoom/pan only needs a server round trip when the overview was reduced:
+        # redraw the visible window, with individual outlets once few enough remain
+        window = None
+        if ctx.triggered_id == "t2-graph-dynamic":
+            window = zoom_window(relayout)
+            if (
+                window is None
+                or T2_SCATTER_MAX_POINTS <= 0
+                or len(d) <= T2_SCATTER_MAX_POINTS
+            ):
+                raise PreventUpdate
+        plot_df = in_window(d, xcol, ycol, window) if window else d
+        reduced = 0 < T2_SCATTER_MAX_POINTS < len(plot_df)
+
         # Build color mapping according to selected legend
         color_dim = color_dim or "outlet_category"
         hover_cols = (
@@ -3619,33 +2765,75 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         if "outlet_type" in d.columns:
             cd_cols.append("outlet_type")
 
-        fig = px.scatter(
-            d,
-            x=xcol,
-            y=ycol,
-            color=color_arg,
-            hover_data=hover_cols,
-            title=GRAPH_LABELS.get("t2-graph-dyn", "Explore Parameter Relationships")
-            + title_suffix,
-            labels={xcol: xcol, ycol: ycol},
-            custom_data=cd_cols,
-            color_discrete_map=cmap,
+        title = (
+            GRAPH_LABELS.get("t2-graph-dyn", "Explore Parameter Relationships")
+            + title_suffix
         )
-        fig.update_traces(
-            marker=dict(size=10, opacity=0.9, line=dict(width=1, color="#ffffff"))
+        view_note = ""
+        if reduced and T2_SCATTER_OVERFLOW == "density":
+            view_note = f" — density of {len(plot_df)} outlets, zoom in for detail"
+            fig = fast_px.density_heatmap(
+                plot_df, x=xcol, y=ycol, nbins=T2_SCATTER_DENSITY_BINS, title=title
+            )
+        else:
+            if reduced:
+                n_view = len(plot_df)
+                plot_df = thin_points(
+                    plot_df, xcol, ycol, T2_SCATTER_MAX_POINTS, by=color_arg
+                )
+                view_note = f" — showing {len(plot_df)} of {n_view}, zoom in for detail"
+            fig = fast_px.scatter(
+                plot_df,
+                x=xcol,
+                y=ycol,
+                color=color_arg,
+                hover_data=hover_cols,
+                title=title,
+                custom_data=cd_cols,
+                color_map=cmap,
+                render_mode=(
+                    "webgl" if len(plot_df) > T2_SCATTER_WEBGL_THRESHOLD else "svg"
+                ),
+            )
+            fig.update_traces(
+                marker=dict(size=10, opacity=0.9, line=dict(width=1, color="#ffffff"))
+            )
+        # Keep the user's zoom across the redraws it triggers; new data resets it
+        fig.update_layout(
+            uirevision=json.dumps(
+                [filters, xcol, ycol, color_dim, t2_selected_region],
+                sort_keys=True,
+                default=str,
+            )
         )
-        # Correlation across outlets in current view
+        if window:
+            if "x" in window:
+                fig.update_xaxes(range=list(window["x"]))
+            if "y" in window:
+                fig.update_yaxes(range=list(window["y"]))
+        # Correlation and OLS trendline across outlets in current view
         try:
-            x2 = _pd.to_numeric(d[xcol], errors="coerce")
-            y2 = _pd.to_numeric(d[ycol], errors="coerce")
-            mask = x2.notna() & y2.notna()
-            x2, y2 = x2[mask], y2[mask]
-            r = float(x2.corr(y2)) if len(x2) >= 2 else _np.nan
+            r = pair.get("pearson_r")
+            r = _np.nan if r is None else r
             fig.update_layout(
                 title=GRAPH_LABELS.get(
                     "t2-graph-dyn", "Explore Parameter Relationships"
                 )
-                + f"{title_suffix} (r={r:.2f}, n={len(x2)})")
+                + f"{title_suffix} (r={r:.2f}, n={pair.get('n', 0)}){view_note}")
+            if pair.get("slope") is not None and len(d):
+                x0, x1 = float(d[xcol].min()), float(d[xcol].max())
+                b, a = pair["slope"], pair["intercept"]
+                fig.add_shape(
+                    type="line",
+                    xref="x",
+                    yref="y",
+                    x0=x0,
+                    x1=x1,
+                    y0=a + b * x0,
+                    y1=a + b * x1,
+                    line=dict(color="#7f7f7f", width=1.5, dash="dash"),
+                    layer="below",
+                )
         except Exception:
             pass
 
@@ -3654,39 +2842,13 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
         return fig
 
     # Tab 2: keep drilldown local — set selected region in a local store, do not change global filters
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace="ui", function_name="setT2SelectedRegion"),
         Output("t2-selected-region", "data"),
         Input("t2-graph-dynamic", "clickData"),
         State("t2-selected-region", "data"),
         prevent_initial_call=True,
     )
-    def set_t2_selected_region(click, current):
-        if not click:
-            raise PreventUpdate
-        try:
-            point = click.get("points", [{}])[0]
-            cd = point.get("customdata") or []
-        except Exception:
-            cd = []
-        # Extract region from customdata: [rgn] at region level; [outlet_name, rgn] at outlet level
-        region = None
-        if cd:
-            if len(cd) == 1 and cd[0]:
-                region = str(cd[0]).strip()
-            elif len(cd) >= 2 and cd[1]:
-                region = str(cd[1]).strip()
-        # Fallback: region name might be in point text label for region-level scatter
-        if not region:
-            try:
-                txt = point.get("text")
-                if isinstance(txt, str) and txt.strip():
-                    region = txt.strip()
-            except Exception:
-                pass
-        if not region:
-            raise PreventUpdate
-        # Toggle behavior: clicking same region clears selection
-        return None if (current == region) else region
 
     # ----- Tab 3: Five-Chart Dashboard figures -----
     @app.callback(
@@ -3732,6 +2894,7 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
             all_outlet_categories=all_outlet_categories,
             labels=GRAPH_LABELS,
             scatter_color_map=scatter_color_map,
+            cache_key=t3_profile_key(gf, merged),
         )
         # Return bar + 4 radars
         return figs[0], figs[1], figs[2], figs[3], figs[4]
@@ -3793,26 +2956,7 @@ def create_dashboard(data_dict, data_dict_2, data_dict_3=None, monthly_datasets:
 
 if __name__ == "__main__":
     try:
-        if os.environ.get("DASH_OFFLINE", "0") == "1":
-            # Offline/dev mode: skip DB calls and start app with empty datasets
-            data_dict = _ensure_tab1_defaults({})
-            data_dict_tab2 = {}
-            data_dict_tab3 = {}
-            monthly = {}
-        else:
-            # Load april as default for existing tabs
-            data_dict = get_tab1_results("kpi_april")
-            data_dict_tab2 = get_tab2_results("kpi_april")
-            data_dict_tab3 = get_tab3_results("kpi_april")
-            # Load May for comparison
-            data_may_t1 = get_tab1_results("kpi_may")
-            data_may_t2 = get_tab2_results("kpi_may")
-            data_may_t3 = get_tab3_results("kpi_may")
-            monthly = {
-                "april": {"tab1": data_dict, "tab2": data_dict_tab2, "tab3": data_dict_tab3},
-                "May": {"tab1": data_may_t1, "tab2": data_may_t2, "tab3": data_may_t3},
-            }
-        app = create_dashboard(data_dict, data_dict_tab2, data_dict_tab3, monthly)
+        app = create_dashboard(*load_startup_datasets(), refresh_interval=DATA_REFRESH_INTERVAL)
         app.run(debug=True, port=8090)
     except ImportError:
         print(
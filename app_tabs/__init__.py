@@ -1 +1 @@
-
+import data_layer  # noqa: F401  (copy-on-write for the shared month frames)
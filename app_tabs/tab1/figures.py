@@ -1,8 +1,8 @@
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Set
 
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+from utils import figures as fast_px
 from utils.colors import brand_palette
 from utils.colors import category_color_map as get_category_color_map
 from utils.colors import color_map_from_list
@@ -12,7 +12,7 @@ def get_filtered_frames(
     data_dict: Dict[str, pd.DataFrame], filters: Dict
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """Single-source Tab 1: derive region aggregates from detailed q1 and return outlet detail for q4/q5."""
-    base = data_dict.get("q1", pd.DataFrame()).copy()
+    base = data_dict.get("q1", pd.DataFrame()).copy(deep=False)
 
     # normalize outlet name column
     if "outlet_name" not in base.columns and "sales_outlet" in base.columns:
@@ -40,7 +40,7 @@ def get_filtered_frames(
         agg = pd.DataFrame()
     else:
         agg = (
-            base.groupby("rgn", dropna=False)
+            base.groupby("rgn", dropna=False, observed=True)
             .agg(
                 avg_total_score=("total_score", "mean"),
                 avg_rate_performance=("rate_performance", "mean"),
@@ -62,7 +62,7 @@ def get_filtered_frames(
                 c for c in ["cat_a", "cat_b", "cat_c", "cat_d"] if c in agg.columns
             ]
             if rcol and cat_cols:
-                mix = agg[[rcol] + cat_cols].copy()
+                mix = agg[[rcol] + cat_cols]
                 mix = mix.melt(id_vars=[rcol], var_name="category", value_name="count")
                 # Friendly A/B/C/D labels
                 try:
@@ -71,14 +71,14 @@ def get_filtered_frames(
                     )
                 except Exception:
                     pass
-                totals = mix.groupby(rcol, dropna=False)["count"].transform("sum")
+                totals = mix.groupby(rcol, dropna=False, observed=True)["count"].transform("sum")
                 mix["pct"] = (mix["count"] / totals) * 100.0
                 df_q2 = mix
     except Exception:
         df_q2 = pd.DataFrame()
 
     # Use detailed base for q4/q5
-    return agg, df_q2, pd.DataFrame(), base.copy(), base.copy()
+    return agg, df_q2, pd.DataFrame(), base, base
 
 
 def build_tab1_figures(
@@ -90,6 +90,7 @@ def build_tab1_figures(
     region_color_map: Dict[str, str],
     base_palette: List[str],
     GRAPH_LABELS: Dict[str, str],
+    only: Set[str] | None = None,
 ):
     """Return Tab 1 figures with:
     - q1: Avg Total Score by Region
@@ -98,9 +99,14 @@ def build_tab1_figures(
     - q4: Top Outlets by Score
     - q5: Bottom Outlets by Score
     - q6: Outlet Count by Category
+
+    `only` restricts building to those keys; the other figures are returned empty.
     """
     df_q1, df_q2, _df3, df_q4, df_q5 = get_filtered_frames(data_dict, filters)
 
+    def want(key: str) -> bool:
+        return only is None or key in only
+
     def pick_col(d: pd.DataFrame, prefer: List[str], fallback: List[str] | None = None):
         # Prefer real (non-null) columns first, then fall back to presence-only
         for n in prefer:
@@ -117,20 +123,20 @@ def build_tab1_figures(
 
     # 1) Average Total Score by Region (lollipop-like horizontal bar)
     fig_q1 = go.Figure()
-    if not df_q1.empty:
+    if want("q1") and not df_q1.empty:
         rcol = pick_col(df_q1, ["Region"], ["rgn"])
         scol = pick_col(df_q1, ["Average Total Score"], ["avg_total_score"])
         if rcol and scol:
             plot = df_q1.sort_values(scol, ascending=True)
             # Bar as base
-            fig_q1 = px.bar(
+            fig_q1 = fast_px.bar(
                 plot,
                 y=rcol,
                 x=scol,
                 orientation="h",
                 title=GRAPH_LABELS.get("q1", "Average Total Score by Region"),
                 custom_data=[rcol],
-                color_discrete_sequence=base_palette,
+                sequence=base_palette,
             )
             # Add markers to mimic lollipop heads
             try:
@@ -155,17 +161,17 @@ def build_tab1_figures(
 
     # 2) 100% stacked bar: Category mix by Region (A/B/C/D) — compute % manually for compatibility
     fig_q2 = go.Figure()
-    if isinstance(df_q2, pd.DataFrame) and not df_q2.empty:
+    if want("q2") and isinstance(df_q2, pd.DataFrame) and not df_q2.empty:
         rcol = "rgn" if "rgn" in df_q2.columns else ("Region" if "Region" in df_q2.columns else None)
         if rcol and {"category", "pct"}.issubset(set(df_q2.columns)):
-            fig_q2 = px.bar(
+            fig_q2 = fast_px.bar(
                 df_q2,
                 x=rcol,
                 y="pct",
                 color="category",
                 barmode="stack",
                 title=GRAPH_LABELS.get("q2", "Category Mix by Region (100%)"),
-                color_discrete_map=get_category_color_map(),
+                color_map=get_category_color_map(),
                 custom_data=[rcol, "category"],
             )
             fig_q2.update_layout(uirevision="t1", margin=dict(t=24), height=420)
@@ -180,7 +186,8 @@ def build_tab1_figures(
     fig_q3 = go.Figure()
     selected_regions = list((filters or {}).get("regions") or [])
     if (
-        len(selected_regions) == 1
+        want("q3")
+        and len(selected_regions) == 1
         and isinstance(df_q4, pd.DataFrame)
         and not df_q4.empty
     ):
@@ -192,7 +199,7 @@ def build_tab1_figures(
         rp = pick_col(df_q4, ["Rate Performance", "rate_performance"])
         rg = pick_col(df_q4, ["Region", "rgn"])
         if rq and rp and cat:
-            d = df_q4.copy()
+            d = df_q4
             if rg:
                 try:
                     d = d[d[rg] == sel]
@@ -204,7 +211,7 @@ def build_tab1_figures(
             hover = [c for c in [s_outlet, rg, cat] if c]
             # Consistent category colors across app
             cat_map = get_category_color_map()
-            fig_q3 = px.scatter(
+            fig_q3 = fast_px.scatter(
                 d,
                 x=rq,
                 y=rp,
@@ -212,14 +219,14 @@ def build_tab1_figures(
                 hover_data=hover,
                 title=f"Performance vs. Quality in {sel}",
                 custom_data=[rg] if rg else None,
-                color_discrete_map=cat_map,
+                color_map=cat_map,
             )
             fig_q3.update_traces(
                 marker=dict(size=12, opacity=0.92, line=dict(width=1, color="#ffffff"))
             )
             fig_q3.update_layout(uirevision="t1", margin=dict(t=24), height=680)
     else:
-        if not df_q1.empty:
+        if want("q3") and not df_q1.empty:
             rcol = pick_col(df_q1, ["Region"], ["rgn"])
             xcol = pick_col(df_q1, ["Average Quality Rate"], ["avg_rate_quality"])
             ycol = pick_col(
@@ -229,14 +236,14 @@ def build_tab1_figures(
                 # Brand palette for regions
                 regs = df_q1[rcol].dropna().unique().tolist()
                 reg_blue_map = color_map_from_list(regs, palette=brand_palette)
-                fig_q3 = px.scatter(
+                fig_q3 = fast_px.scatter(
                     df_q1,
                     x=xcol,
                     y=ycol,
                     text=rcol,
                     color=rcol,
                     title=GRAPH_LABELS.get("q3", "Performance vs. Quality by Region"),
-                    color_discrete_map=reg_blue_map,
+                    color_map=reg_blue_map,
                     custom_data=[rcol],
                 )
                 # Reference means
@@ -269,7 +276,7 @@ def build_tab1_figures(
     # 4) Top 20 Outlets by Score (from sheet1.q1 if outlet-level cols exist)
     fig_q4 = go.Figure()
     df_for_q4 = df_q4 if df_q4 is not None and not df_q4.empty else df_q1
-    if not df_for_q4.empty:
+    if want("q4") and not df_for_q4.empty:
         s = pick_col(df_for_q4, ["Outlet", "sales_outlet", "outlet_name"])
         ts = pick_col(df_for_q4, ["Total Score", "total_score"])
         oc = pick_col(df_for_q4, ["Category", "outlet_category"])
@@ -285,7 +292,7 @@ def build_tab1_figures(
             )
             color = oc if oc else None
             custom = [rg, oc] if rg and oc else None
-            fig_q4 = px.bar(
+            fig_q4 = fast_px.bar(
                 plot,
                 y=s,
                 x=ts,
@@ -293,7 +300,7 @@ def build_tab1_figures(
                 color=color,
                 title=GRAPH_LABELS.get("q4", "Top Outlets by Score"),
                 custom_data=custom,
-                color_discrete_sequence=base_palette,
+                sequence=base_palette,
             )
             fig_q4.update_layout(
                 yaxis=dict(autorange="reversed"),
@@ -309,7 +316,7 @@ def build_tab1_figures(
     # 5) Bottom 20 Outlets by Score (from sheet1.q1 if available)
     fig_q5 = go.Figure()
     df_for_q5 = df_q5 if df_q5 is not None and not df_q5.empty else df_q1
-    if not df_for_q5.empty:
+    if want("q5") and not df_for_q5.empty:
         s = pick_col(df_for_q5, ["Outlet", "sales_outlet", "outlet_name"])
         ts = pick_col(df_for_q5, ["Total Score", "total_score"])
         oc = pick_col(df_for_q5, ["Category", "outlet_category"])
@@ -325,7 +332,7 @@ def build_tab1_figures(
             )
             color = oc if oc else None
             custom = [rg, oc] if rg and oc else None
-            fig_q5 = px.bar(
+            fig_q5 = fast_px.bar(
                 plot,
                 y=s,
                 x=ts,
@@ -333,7 +340,7 @@ def build_tab1_figures(
                 color=color,
                 title=GRAPH_LABELS.get("q5", "Bottom Outlets by Score"),
                 custom_data=custom,
-                color_discrete_sequence=base_palette,
+                sequence=base_palette,
             )
             fig_q5.update_layout(
                 yaxis=dict(autorange="reversed"),
@@ -348,7 +355,7 @@ def build_tab1_figures(
 
     # 6) Outlet Count by Category (A/B/C/D) — Pie chart
     fig_q6 = go.Figure()
-    if not df_q1.empty:
+    if want("q6") and not df_q1.empty:
         # We can reuse detailed df_q4 (same as base) for counting
         detail = df_q4 if df_q4 is not None and not df_q4.empty else df_q1
         cat_col = pick_col(detail, ["Category", "outlet_category"])
@@ -356,7 +363,7 @@ def build_tab1_figures(
             counts = (
                 detail[[cat_col]]
                 .dropna()
-                .groupby(cat_col, dropna=False)
+                .groupby(cat_col, dropna=False, observed=True)
                 .size()
                 .reset_index(name="count")
             )
@@ -369,13 +376,12 @@ def build_tab1_figures(
                 counts = counts.sort_values(cat_col)
             except Exception:
                 pass
-            fig_q6 = px.pie(
+            fig_q6 = fast_px.pie(
                 counts,
                 names=cat_col,
                 values="count",
                 title="Number of Outlets by Category",
-                color=cat_col,
-                color_discrete_map=get_category_color_map(),
+                color_map=get_category_color_map(),
                 hole=0.35,
             )
             fig_q6.update_traces(textposition="inside", textinfo="percent+label")
@@ -384,8 +390,8 @@ def build_tab1_figures(
         fig_q6.update_layout(title="Number of Outlets by Category", margin=dict(t=24))
 
     # If any figure empty, annotate reason for user clarity
-    def annotate_if_empty(fig: go.Figure, title: str, need_cols: list[str]):
-        if not fig.data:
+    def annotate_if_empty(key: str, fig: go.Figure, title: str, need_cols: list[str]):
+        if want(key) and not fig.data:
             fig.add_annotation(
                 text=f"No data available. Required columns: {', '.join(need_cols)}",
                 xref="paper",
@@ -398,26 +404,31 @@ def build_tab1_figures(
             fig.update_layout(title=title, margin=dict(t=24))
 
     annotate_if_empty(
+        "q1",
         fig_q1,
         GRAPH_LABELS.get("q1", "Average Total Score by Region"),
         ["rgn", "avg_total_score"],
     )
     annotate_if_empty(
+        "q2",
         fig_q2,
         GRAPH_LABELS.get("q2", "Category Mix by Region (100%)"),
         ["rgn", "cat_a..cat_d"],
     )
     annotate_if_empty(
+        "q3",
         fig_q3,
         GRAPH_LABELS.get("q3", "Performance vs. Quality by Region"),
         ["avg_rate_performance", "avg_rate_quality"],
     )
     annotate_if_empty(
+        "q4",
         fig_q4,
         GRAPH_LABELS.get("q4", "Top Outlets by Score"),
         ["outlet_name", "total_score"],
     )
     annotate_if_empty(
+        "q5",
         fig_q5,
         GRAPH_LABELS.get("q5", "Bottom Outlets by Score"),
         ["outlet_name", "total_score"],
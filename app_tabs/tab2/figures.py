@@ -1,7 +1,10 @@
 from typing import Dict, Tuple, Optional, List
 
+import numpy as np
 import pandas as pd
 
+from utils.dataframe import casefold_mask
+
 
 def get_filtered_frames(
     tab2: Dict[str, pd.DataFrame], filters: Dict
@@ -11,7 +14,7 @@ def get_filtered_frames(
     Expected columns from sql_queries.sheet2.q1: rgn, outlet_name, outlet_type, outlet_category,
     rate_performance, rate_quality, total_score, rank_region, rank_nationwide, and KPI % columns.
     """
-    df = tab2.get("q1", pd.DataFrame()).copy()
+    df = tab2.get("q1", pd.DataFrame()).copy(deep=False)
     if df.empty:
         return (df,)
 
@@ -40,10 +43,7 @@ def get_filtered_frames(
         d1 = df[df[rcol].isin(regions)]
         if d1.empty:
             try:
-                tmp = df.copy()
-                tmp["__r"] = tmp[rcol].astype(str).str.strip().str.casefold()
-                rnorm = [str(x).strip().casefold() for x in regions]
-                d1 = tmp[tmp["__r"].isin(rnorm)].drop(columns=["__r"])
+                d1 = df[casefold_mask(df[rcol], regions)]
             except Exception:
                 d1 = df[df[rcol].isin(regions)]
         df = d1
@@ -72,3 +72,73 @@ def get_filtered_frames(
     df = clamp_range(df, "rank_nationwide", rnw)
 
     return (df,)
+
+
+def zoom_window(relayout: Optional[Dict]) -> Optional[Dict]:
+    """Axis ranges from a graph's relayoutData.
+
+    Returns None when the event does not touch the axes (autosize, etc.), {}
+    on an autorange reset, else {"x": (lo, hi), "y": (lo, hi)} for the axes
+    that were zoomed.
+    """
+    if not isinstance(relayout, dict):
+        return None
+    window: Dict = {}
+    touched = False
+    for axis in ("x", "y"):
+        key = f"{axis}axis"
+        if relayout.get(f"{key}.autorange"):
+            touched = True
+            continue
+        rng = relayout.get(f"{key}.range")
+        if rng is None and f"{key}.range[0]" in relayout:
+            rng = [relayout.get(f"{key}.range[0]"), relayout.get(f"{key}.range[1]")]
+        try:
+            lo, hi = sorted(float(v) for v in rng)
+        except Exception:
+            continue
+        window[axis] = (lo, hi)
+        touched = True
+    return window if touched else None
+
+
+def in_window(df: pd.DataFrame, xcol: str, ycol: str, window: Optional[Dict]) -> pd.DataFrame:
+    """Rows of df whose (xcol, ycol) fall inside a zoom_window() result."""
+    mask = pd.Series(True, index=df.index)
+    for axis, col in (("x", xcol), ("y", ycol)):
+        if window and axis in window:
+            lo, hi = window[axis]
+            mask &= df[col].between(lo, hi)
+    return df[mask]
+
+
+def thin_points(
+    df: pd.DataFrame,
+    xcol: str,
+    ycol: str,
+    max_points: int,
+    by: Optional[str] = None,
+) -> pd.DataFrame:
+    """Reduce df to at most max_points rows that still cover the scatter's shape.
+
+    Points are snapped to a ~sqrt(max_points) square grid and the first row per
+    occupied cell (per `by` group, so every colour keeps its footprint) is kept;
+    sparse outliers therefore survive while dense clusters are thinned. An even
+    stride caps whatever is still above max_points. Row order is preserved.
+    """
+    if max_points <= 0 or len(df) <= max_points:
+        return df
+    n = max(1, int(np.sqrt(max_points)))
+    cells = []
+    for col in (xcol, ycol):
+        v = df[col].to_numpy(dtype=float)
+        lo, hi = np.nanmin(v), np.nanmax(v)
+        span = (hi - lo) or 1.0
+        cells.append(np.clip(((v - lo) / span * n).astype(int), 0, n - 1))
+    key = pd.DataFrame({"cx": cells[0], "cy": cells[1]}, index=df.index)
+    if by and by in df.columns:
+        key["by"] = df[by].to_numpy()
+    out = df[~key.duplicated().to_numpy()]
+    if len(out) > max_points:
+        out = out.iloc[np.linspace(0, len(out) - 1, max_points).astype(int)]
+    return out
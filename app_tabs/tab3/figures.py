@@ -1,9 +1,12 @@
+from collections import OrderedDict
 from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+from utils import figures as fast_px
 from utils.colors import category_color_map as get_category_color_map
+from utils.metrics import cache_event
 
 
 KPI_DISPLAY = [
@@ -23,11 +26,52 @@ KPI_DISPLAY = [
     ("cs_service_pct", "CS Service"),
 ]
 
+# KPI scope by outlet type: 1S outlets have no service KPIs, 2S outlets no sales KPIs
+SALES_KPIS = (
+    "new_car_reg_pct",
+    "gear_up_ach_pct",
+    "ins_renew_1st_pct",
+    "ins_renew_overall_pct",
+    "pov_pct",
+    "nps_sales_pct",
+    "cs_sales_pct",
+)
+SERVICE_KPIS = (
+    "intake_pct",
+    "revenue_pct",
+    "parts_pct",
+    "lubricant_pct",
+    "eappointment_pct",
+    "qpi_pct",
+    "cs_service_pct",
+)
+# Column aliases of the radar queries (sql_queries/tab3.py), in query order
+RADAR_ALIASES = {
+    "new_car_reg_pct": "avg_new_car_reg",
+    "gear_up_ach_pct": "avg_gear_up",
+    "ins_renew_1st_pct": "avg_ins_renew_1st",
+    "ins_renew_overall_pct": "avg_ins_renew_overall",
+    "pov_pct": "avg_pov",
+    "nps_sales_pct": "avg_nps_sales",
+    "cs_sales_pct": "avg_cs_sales",
+    "intake_pct": "avg_intake",
+    "revenue_pct": "avg_revenue",
+    "parts_pct": "avg_parts",
+    "lubricant_pct": "avg_lubricant",
+    "eappointment_pct": "avg_eappointment",
+    "qpi_pct": "avg_qpi",
+    "cs_service_pct": "avg_cs_service",
+}
+OUTLET_TYPES = ("1S", "2S", "1+2S", "3S")
+
+_PROFILE_CACHE: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_PROFILE_CACHE_SIZE = 64
+
 
 def _apply_filters(df: pd.DataFrame, f: Dict) -> pd.DataFrame:
     if df is None or df.empty:
         return df
-    out = df.copy()
+    out = df.copy(deep=False)
     # Normalize outlet name
     if "outlet_name" not in out.columns and "sales_outlet" in out.columns:
         out = out.rename(columns={"sales_outlet": "outlet_name"})
@@ -50,7 +94,7 @@ def _normalize_cols(d: pd.DataFrame) -> pd.DataFrame:
     """Normalize column names to KPI *_pct names for downstream use (radars)."""
     if d is None or d.empty:
         return d
-    out = d.copy()
+    out = d
     rename_map = {}
     for k, _ in KPI_DISPLAY:
         ak = f"avg_{k.replace('_pct', '')}"
@@ -64,6 +108,74 @@ def _normalize_cols(d: pd.DataFrame) -> pd.DataFrame:
     return out
 
 
+def kpi_gap_table(
+    df: pd.DataFrame, cats: Tuple[str, ...] = ("B", "C", "D"), with_kpi_col: bool = False
+) -> pd.DataFrame:
+    """Average (KPI_pct - 100) per outlet_category x KPI from a single groupby.
+
+    Rows are KPI-major in KPI_DISPLAY order (categories in `cats` order), with
+    columns outlet_category, kpi, gap_value (+ kpi_col). Missing means are dropped.
+    """
+    out_cols = ["outlet_category", "kpi", "gap_value"] + (["kpi_col"] if with_kpi_col else [])
+    cols = [k for k, _ in KPI_DISPLAY if isinstance(df, pd.DataFrame) and k in df.columns]
+    if not cols or df.empty or "outlet_category" not in df.columns:
+        return pd.DataFrame(columns=out_cols)
+    cats = list(cats)
+    means = (
+        df[df["outlet_category"].isin(cats)]
+        .groupby("outlet_category", observed=True)[cols]
+        .mean()
+        .reindex(cats)
+    )
+    # means.T is KPI x category; ravel() walks it KPI-major
+    gaps = means.T.to_numpy(dtype="float64").ravel() - 100.0
+    name_map = dict(KPI_DISPLAY)
+    long = pd.DataFrame(
+        {
+            "outlet_category": np.tile(cats, len(cols)),
+            "kpi": np.repeat([name_map[c] for c in cols], len(cats)),
+            "gap_value": gaps,
+            "kpi_col": np.repeat(cols, len(cats)),
+        }
+    )
+    return long[~np.isnan(gaps)].reset_index(drop=True)[out_cols]
+
+
+def kpi_type_profiles(df: pd.DataFrame, cache_key: str | None = None) -> pd.DataFrame:
+    """Average KPI profile per outlet type (rows OUTLET_TYPES) from one groupby.
+
+    KPIs outside a type's scope are zeroed through a type x KPI mask, and
+    `n_outlets` holds the group sizes. Results are memoized by `cache_key`
+    (the filter state) so the radars and the LLM payload share one result.
+    """
+    if cache_key is not None:
+        hit = cache_key in _PROFILE_CACHE
+        cache_event("tab3_profiles", hit)
+        if hit:
+            _PROFILE_CACHE.move_to_end(cache_key)
+            return _PROFILE_CACHE[cache_key]
+    cols = [k for k, _ in KPI_DISPLAY if isinstance(df, pd.DataFrame) and k in df.columns]
+    if not cols or df.empty or "outlet_type" not in df.columns:
+        return pd.DataFrame(columns=["n_outlets"] + cols)
+    grouped = df.groupby("outlet_type", observed=True)
+    means = grouped[cols].mean().reindex(OUTLET_TYPES)
+    counts = grouped.size().reindex(OUTLET_TYPES, fill_value=0)
+    in_scope = np.ones((len(OUTLET_TYPES), len(cols)), dtype=bool)
+    in_scope[OUTLET_TYPES.index("1S"), [c in SERVICE_KPIS for c in cols]] = False
+    in_scope[OUTLET_TYPES.index("2S"), [c in SALES_KPIS for c in cols]] = False
+    profiles = means.where(in_scope, 0.0)
+    profiles.insert(0, "n_outlets", counts.astype(int))
+    if cache_key is not None:
+        _PROFILE_CACHE[cache_key] = profiles
+        while len(_PROFILE_CACHE) > _PROFILE_CACHE_SIZE:
+            _PROFILE_CACHE.popitem(last=False)
+    return profiles
+
+
+def clear_profile_cache() -> None:
+    _PROFILE_CACHE.clear()
+
+
 def get_filtered_frames_simple(
     data: Dict[str, pd.DataFrame], filters: Dict
 ) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
@@ -97,44 +209,26 @@ def build_tab3_figures(
     all_outlet_categories: List[str] | None = None,
     labels: Dict[str, str] | None = None,
     scatter_color_map: Dict[str, str] | None = None,
+    cache_key: str | None = None,
 ) -> Tuple[go.Figure, go.Figure, go.Figure, go.Figure, go.Figure]:
     """Tab 3 — Category and Type Diagnostics per spec.
 
     - fig1: Diverging bar chart of average (KPI_pct - 100) by outlet_category (B/C/D) across KPIs.
     - fig2: Radar chart of average KPI profiles by outlet_type for the selected category.
     - fig3: removed per new spec (two charts only).
+
+    `cache_key` (the filter state) memoizes the outlet-type profiles.
     """
-    df0 = data.get("q1", pd.DataFrame()).copy()
+    df0 = data.get("q1", pd.DataFrame())
     df = _apply_filters(df0, filters)
 
     # 1) Diverging bar chart (grouped by category B/C/D)
     fig1 = go.Figure()
     if not df.empty:
         # Compute avg gap from target 100 for each KPI by category
-        rows = []
-        cats = ["B", "C", "D"]
-        for col, disp in KPI_DISPLAY:
-            if col not in df.columns:
-                continue
-            g = (
-                df[df["outlet_category"].isin(cats)]
-                .groupby("outlet_category")[col]
-                .mean()
-                .reindex(cats)
-            )
-            for cat, val in g.items():
-                if pd.notna(val):
-                    rows.append(
-                        {
-                            "outlet_category": cat,
-                            "kpi": disp,
-                            "gap_value": float(val) - 100.0,
-                            "kpi_col": col,
-                        }
-                    )
-        if rows:
-            plot = pd.DataFrame(rows)
-            fig1 = px.bar(
+        plot = kpi_gap_table(df, with_kpi_col=True)
+        if not plot.empty:
+            fig1 = fast_px.bar(
                 plot,
                 x="gap_value",
                 y="kpi",
@@ -144,7 +238,7 @@ def build_tab3_figures(
                 title=(labels or {}).get(
                     "t3-graph-1", "What's Holding Back B, C, & D Outlets?"
                 ),
-                color_discrete_map=get_category_color_map(),
+                color_map=get_category_color_map(),
                 custom_data=["outlet_category", "kpi_col", "kpi"],
             )
             fig1.add_vline(x=0, line_color="#9CA3AF")
@@ -171,7 +265,7 @@ def build_tab3_figures(
 
     # 2) Radar chart: Average Performance Profile by Outlet Type within selected category
 
-    df_after = df.copy()
+    df_after = df
 
     # Harmonize columns to KPI names
     after_tbl = _normalize_cols(df_after)
@@ -190,13 +284,15 @@ def build_tab3_figures(
     cols_after = [k for k, _ in KPI_DISPLAY if k in after_tbl.columns]
     name_map = dict(KPI_DISPLAY)
 
-    def radar_for_type(df_src: pd.DataFrame, typ: str) -> go.Figure:
+    profiles = kpi_type_profiles(after_tbl, cache_key=cache_key)
+
+    def radar_for_type(typ: str) -> go.Figure:
         fig = go.Figure()
         if (
-            df_src is None
-            or df_src.empty
+            after_tbl is None
+            or after_tbl.empty
             or not cols_after
-            or "outlet_type" not in df_src.columns
+            or "outlet_type" not in after_tbl.columns
         ):
             fig.update_layout(
                 title=f"{typ} — Average Performance Profile {title_suffix}",
@@ -212,33 +308,7 @@ def build_tab3_figures(
                 font=dict(color="#6b7280"),
             )
             return fig
-        sub = df_src[df_src["outlet_type"] == typ].copy()
-        # Enforce KPI scope by outlet type: set out-of-scope KPIs to 0
-        sales_kpis = {
-            "new_car_reg_pct",
-            "gear_up_ach_pct",
-            "ins_renew_1st_pct",
-            "ins_renew_overall_pct",
-            "pov_pct",
-            "nps_sales_pct",
-            "cs_sales_pct",
-        }
-        service_kpis = {
-            "intake_pct",
-            "revenue_pct",
-            "parts_pct",
-            "lubricant_pct",
-            "eappointment_pct",
-            "qpi_pct",
-            "cs_service_pct",
-        }
-        if typ == "1S":
-            for col in service_kpis.intersection(sub.columns):
-                sub[col] = 0
-        if typ == "2S":
-            for col in sales_kpis.intersection(sub.columns):
-                sub[col] = 0
-        if sub.empty:
+        if not profiles.loc[typ, "n_outlets"]:
             fig.update_layout(
                 title=f"{typ} — Average Performance Profile {title_suffix}",
                 margin=dict(t=24),
@@ -253,10 +323,10 @@ def build_tab3_figures(
                 font=dict(color="#6b7280"),
             )
             return fig
-        mv = sub[cols_after].mean(numeric_only=True)
-        plot = pd.DataFrame({"kpi": mv.index, "value": mv.values})
+        mv = profiles.loc[typ, cols_after]
+        plot = pd.DataFrame({"kpi": mv.index, "value": mv.values.astype(float)})
         plot["kpi_disp"] = plot["kpi"].map(name_map).fillna(plot["kpi"])
-        fig = px.line_polar(
+        fig = fast_px.line_polar(
             plot,
             r="value",
             theta="kpi_disp",
@@ -281,10 +351,7 @@ def build_tab3_figures(
         )
         return fig
 
-    fig_1s = radar_for_type(after_tbl, "1S")
-    fig_2s = radar_for_type(after_tbl, "2S")
-    fig_1p2s = radar_for_type(after_tbl, "1+2S")
-    fig_3s = radar_for_type(after_tbl, "3S")
+    fig_1s, fig_2s, fig_1p2s, fig_3s = (radar_for_type(t) for t in OUTLET_TYPES)
 
     # Return bar + four radars
     return fig1, fig_1s, fig_2s, fig_1p2s, fig_3s
@@ -0,0 +1,309 @@
+// Pure UI state transitions, registered as clientside callbacks in app.py.
+// They only move values, flags and styles between components, so they run in
+// the browser; the server is contacted when filter-store (or another data
+// input) changes and figures have to be recomputed.
+(function () {
+    const dc = (window.dash_clientside = window.dash_clientside || {});
+
+    function stop() {
+        throw dc.PreventUpdate;
+    }
+
+    // dict.get(key, default): the default only applies when the key is absent
+    function get(obj, key, dflt) {
+        return obj && Object.prototype.hasOwnProperty.call(obj, key) ? obj[key] : dflt;
+    }
+
+    function copy(obj) {
+        return JSON.parse(JSON.stringify(obj || {}));
+    }
+
+    // Python str() of the values used in selection keys ("None" for missing)
+    function str(v) {
+        if (v === null || v === undefined) {
+            return "None";
+        }
+        if (v === true || v === false) {
+            return v ? "True" : "False";
+        }
+        return String(v);
+    }
+
+    function at(list, i) {
+        return Array.isArray(list) && i < list.length ? list[i] : null;
+    }
+
+    function firstPoint(clickData) {
+        const points = (clickData && clickData.points) || [{}];
+        return points[0] || {};
+    }
+
+    function dropdownStyle(disabled) {
+        return {cursor: disabled ? "not-allowed" : "pointer"};
+    }
+
+    function checklistStyle(disabled) {
+        return {cursor: disabled ? "not-allowed" : "pointer", opacity: disabled ? 0.55 : 1};
+    }
+
+    function buttonStyle(base, disabled) {
+        const style = Object.assign({}, base || {});
+        style.cursor = disabled ? "not-allowed" : "pointer";
+        if (disabled) {
+            if (!("opacity" in style)) {
+                style.opacity = 0.6;
+            }
+        } else {
+            delete style.opacity;
+        }
+        return style;
+    }
+
+    // filter-store, active-selection and the four slicer values
+    function filterOutputs(filters, active) {
+        return [
+            filters,
+            active,
+            get(filters, "outlet_categories", []),
+            get(filters, "regions", []),
+            get(filters, "outlet_types", []),
+            get(filters, "months", ["april"]),
+        ];
+    }
+
+    function selectionKey(graphId, point) {
+        const cd = point.customdata;
+        switch (graphId) {
+            case "graph-q2":
+                // stacked 100% bar: customdata carries [region, category]
+                return `q2|category=${str(at(cd, 1))}|region=${str(at(cd, 0))}`;
+            case "graph-q3":
+                return `q3|region=${str(at(cd, 0))}`;
+            case "graph-q4":
+            case "graph-q5":
+                return `${graphId.slice(6)}|region=${str(at(cd, 0))}|outlet=${str(at(cd, 1))}`;
+            case "graph-q6":
+                return `q6|category=${str(point.x)}`;
+            default:
+                return null;
+        }
+    }
+
+    dc.ui = {
+        toggleSidebar: function (nClicks, visibility) {
+            if (!nClicks) {
+                stop();
+            }
+            const openedOnce = Boolean(get(visibility, "opened_once", false));
+            if (!get(visibility, "visible", false)) {
+                // First open at 25% of the screen width
+                const panel = openedOnce
+                    ? {height: "100%", backgroundColor: "#f8f9fa"}
+                    : {height: "100%", backgroundColor: "#f8f9fa", width: "25%"};
+                return [
+                    panel,
+                    {width: "5px", cursor: "col-resize", backgroundColor: "#ccc"},
+                    {visible: true, opened_once: true},
+                ];
+            }
+            return [
+                {minWidth: 0, width: 0, display: "none", height: "100%", backgroundColor: "#f8f9fa"},
+                {display: "none"},
+                {visible: false, opened_once: openedOnce},
+            ];
+        },
+
+        guardInsightMode: function (selectedGraphs) {
+            const options = [
+                {label: "Individual Insights", value: "individual"},
+                {label: "Combined Insights", value: "combined"},
+            ];
+            if ((selectedGraphs || []).length <= 1) {
+                return [[options[0]], "individual"];
+            }
+            return [options, "combined"];
+        },
+
+        toggleFilterControls: function (insightsActive, ui) {
+            const disabled = Boolean(insightsActive);
+            const styles = get(ui, "button_styles", {});
+            const dropdown = dropdownStyle(disabled);
+            const checklist = checklistStyle(disabled);
+            return [
+                disabled, dropdown,
+                disabled, dropdownStyle(disabled),
+                disabled, dropdownStyle(disabled),
+                disabled, dropdownStyle(disabled),
+                disabled, buttonStyle(styles.reset, disabled),
+                disabled, buttonStyle(styles.clear_selection, disabled),
+                disabled, buttonStyle(styles.generate, disabled),
+                checklist,
+                checklistStyle(disabled),
+                disabled, dropdownStyle(disabled),
+                disabled, dropdownStyle(disabled),
+                disabled, dropdownStyle(disabled),
+            ];
+        },
+
+        guardCompareSidebar: function (months) {
+            // Empty label; CSS renders the checkbox as a switch
+            return [{label: "", value: "compare", disabled: (months || []).length <= 1}];
+        },
+
+        resetCompareSidebar: function () {
+            return [];
+        },
+
+        // Diagnostics <details>: poll metrics only while it is open
+        toggleMetricsPolling: function (nClicks) {
+            return (nClicks || 0) % 2 === 0;
+        },
+
+        setT2SelectedRegion: function (click, current) {
+            if (!click) {
+                stop();
+            }
+            const point = firstPoint(click);
+            const cd = point.customdata || [];
+            // Region from customdata: [rgn] at region level; [outlet_name, rgn] at outlet level
+            let region = null;
+            if (cd.length === 1 && cd[0]) {
+                region = String(cd[0]).trim();
+            } else if (cd.length >= 2 && cd[1]) {
+                region = String(cd[1]).trim();
+            }
+            // Fallback: region name might be in the point text of the region-level scatter
+            if (!region && typeof point.text === "string" && point.text.trim()) {
+                region = point.text.trim();
+            }
+            if (!region) {
+                stop();
+            }
+            // Clicking the same region clears the selection
+            return current === region ? null : region;
+        },
+
+        // Click-to-filter + global slicers -> filter-store
+        updateFilters: function () {
+            const args = Array.prototype.slice.call(arguments);
+            const [, outletCats, regions, outletTypes, monthsValue, compareValue] = args;
+            const [current, active, t2ColorDim, insightsActive, ui] = args.slice(-5);
+            if (insightsActive) {
+                stop();
+            }
+            const defaults = get(ui, "default_filters", {});
+            const trig = dc.callback_context.triggered[0] || {};
+            const trigId = String(trig.prop_id || "").split(".")[0];
+            const value = trig.value;
+
+            if (trigId === "reset-button") {
+                return [defaults, null, [], [], [], get(defaults, "months", ["april"])];
+            }
+
+            if (["outlet-category-filter", "region-filter", "outlet-type-filter"].includes(trigId)) {
+                const nf = copy(current);
+                nf.outlet_categories = outletCats || [];
+                nf.regions = regions || [];
+                nf.outlet_types = outletTypes || [];
+                return filterOutputs(nf, null);
+            }
+
+            if (trigId === "month-filter") {
+                const nf = copy(current);
+                nf.months = (monthsValue || []).length ? monthsValue.slice() : ["april"];
+                // Fewer than 2 months: compare is forced off
+                if (nf.months.length <= 1) {
+                    nf.compare_months = false;
+                }
+                return filterOutputs(nf, null);
+            }
+
+            if (trigId === "month-compare-toggle-side") {
+                const nf = copy(current);
+                nf.compare_months = Boolean(compareValue && compareValue.includes("compare"));
+                return filterOutputs(nf, null);
+            }
+
+            if (trigId === "t2-graph-dynamic" && value) {
+                // customdata order: [outlet_name/sales_outlet, rgn, outlet_category, outlet_type]
+                const cd = firstPoint(value).customdata || [];
+                const reg = cd.length >= 2 ? cd[1] : null;
+                const cat = cd.length >= 3 ? cd[2] : null;
+                const otype = cd.length >= 4 ? cd[3] : null;
+                const color = t2ColorDim || "";
+                const parts = [];
+                if (reg) parts.push(`r=${str(reg)}`);
+                if (color === "outlet_category" && cat) parts.push(`cat=${str(cat)}`);
+                if (color === "outlet_type" && otype) parts.push(`type=${str(otype)}`);
+                const key = parts.length ? "t2|" + parts.join("|") : null;
+
+                const nf = copy(current);
+                // Clicking the same selection clears only the affected filters
+                if (key !== null && active === key) {
+                    if (reg) nf.regions = [];
+                    if (cat) nf.outlet_categories = [];
+                    if (otype) nf.outlet_types = [];
+                    return filterOutputs(nf, null);
+                }
+                if (reg) nf.regions = [reg];
+                if (color === "outlet_category" && cat) nf.outlet_categories = [cat];
+                if (color === "outlet_type" && otype) nf.outlet_types = [otype];
+                return filterOutputs(nf, key);
+            }
+
+            // Tab 3 diverging bar: toggles outlet_category in the global filters
+            if (trigId === "t3-graph-1" && value) {
+                const cat = at(firstPoint(value).customdata || [null], 0);
+                if (!cat) {
+                    return filterOutputs(current, active);
+                }
+                const key = `t3g1|category=${str(cat)}`;
+                const nf = copy(current);
+                if (active === key) {
+                    nf.outlet_categories = [];
+                    return filterOutputs(nf, null);
+                }
+                nf.outlet_categories = [cat];
+                return filterOutputs(nf, key);
+            }
+
+            // Tab 1 q2: clicking the same segment clears only its filters
+            if (trigId === "graph-q2" && value) {
+                const point = firstPoint(value);
+                const key = selectionKey(trigId, point);
+                const reg = at(point.customdata, 0);
+                const cat = at(point.customdata, 1);
+                const nf = copy(current);
+                if (active === key) {
+                    if (reg) nf.regions = [];
+                    if (cat) nf.outlet_categories = [];
+                    return filterOutputs(nf, null);
+                }
+                if (reg) nf.regions = [reg];
+                if (cat) nf.outlet_categories = [cat];
+                return filterOutputs(nf, key);
+            }
+
+            if (trigId.startsWith("graph-") && value) {
+                const point = firstPoint(value);
+                const key = selectionKey(trigId, point);
+                if (active === key) {
+                    return [defaults, null, [], [], [], get(defaults, "months", ["april"])];
+                }
+                const nf = copy(defaults);
+                if (trigId === "graph-q3") {
+                    const reg = at(point.customdata, 0);
+                    if (reg) nf.regions = [reg];
+                } else if (trigId === "graph-q4" || trigId === "graph-q5") {
+                    // barh: y = outlet
+                    if (point.y) nf.outlets = [point.y];
+                } else if (trigId === "graph-q6") {
+                    if (point.x) nf.outlet_categories = [point.x];
+                }
+                return filterOutputs(nf, key);
+            }
+
+            return filterOutputs(current, active);
+        },
+    };
+})();
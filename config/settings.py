@@ -18,4 +18,77 @@ ODBC_DRIVER = os.environ.get("ODBC_DRIVER", "ODBC Driver 17 for SQL Server")
 CONNECTION_URI = (
     f"mssql+pyodbc://{DB_USERNAME}:{DB_PASSWORD}@{DB_SERVER}/{DB_DATABASE}"
     f"?driver={ODBC_DRIVER.replace(' ', '+')}"
-)
\ No newline at end of file
+)
+
+# Tab 2 outlet scatter: switch to WebGL (Scattergl) above this many points, and
+# above T2_SCATTER_MAX_POINTS (0 disables) reduce the overview either by grid
+# thinning ("thin") or server-side 2-D binning ("density"). Zooming in redraws
+# the visible window with individual, clickable outlets again.
+T2_SCATTER_WEBGL_THRESHOLD = int(os.environ.get("T2_SCATTER_WEBGL_THRESHOLD", "1000"))
+T2_SCATTER_MAX_POINTS = int(os.environ.get("T2_SCATTER_MAX_POINTS", "5000"))
+T2_SCATTER_OVERFLOW = os.environ.get("T2_SCATTER_OVERFLOW", "thin")
+T2_SCATTER_DENSITY_BINS = int(os.environ.get("T2_SCATTER_DENSITY_BINS", "60"))
+
+# Dataset exports (/export/<graph_id>): ranged (resumable) downloads are served
+# from files materialized here and kept for EXPORT_CACHE_TTL seconds
+EXPORT_CACHE_DIR = os.environ.get("EXPORT_CACHE_DIR", os.path.join("logs", "exports"))
+EXPORT_CACHE_TTL = int(os.environ.get("EXPORT_CACHE_TTL", "3600"))
+
+# Precomputed insight reports written by scripts/precompute_reports.py; when
+# enabled, "Generate" serves a stored report whose request and data match
+PRECOMPUTED_REPORTS_DIR = os.environ.get("PRECOMPUTED_REPORTS_DIR", os.path.join("logs", "reports"))
+PRECOMPUTED_REPORTS_ENABLED = os.environ.get("PRECOMPUTED_REPORTS_ENABLED", "1") == "1"
+
+# Per-callback latency/payload metrics: Prometheus text on GET /metrics and a
+# rolling "Diagnostics" panel in the insights sidebar
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+
+# Prompt log (generate_report): compact JSON lines in PROMPT_LOG_PATH with the
+# prompt bodies stored once per content hash under PROMPT_LOG_BODIES_DIR. The
+# log rotates at PROMPT_LOG_MAX_BYTES or after PROMPT_LOG_MAX_AGE_HOURS, old
+# files are gzipped and kept for PROMPT_LOG_RETENTION; PROMPT_LOG_SAMPLE_RATE
+# (0..1) logs only that fraction of prompts.
+PROMPT_LOG_ENABLED = os.environ.get("PROMPT_LOG_ENABLED", "1") == "1"
+PROMPT_LOG_PATH = os.environ.get("PROMPT_LOG_PATH", os.path.join("logs", "insights_prompts.jsonl"))
+PROMPT_LOG_BODIES_DIR = os.environ.get("PROMPT_LOG_BODIES_DIR", os.path.join("logs", "prompts"))
+PROMPT_LOG_MAX_BYTES = int(os.environ.get("PROMPT_LOG_MAX_BYTES", str(20 * 1024 * 1024)))
+PROMPT_LOG_MAX_AGE_HOURS = float(os.environ.get("PROMPT_LOG_MAX_AGE_HOURS", "24"))
+PROMPT_LOG_RETENTION = os.environ.get("PROMPT_LOG_RETENTION", "14 days")
+PROMPT_LOG_SAMPLE_RATE = float(os.environ.get("PROMPT_LOG_SAMPLE_RATE", "1.0"))
+
+# LLM usage ledger (services.usage_ledger): one SQLite row per LLM call with
+# tokens, latency, cost and chart/session attribution. LLM_PRICING_FILE is an
+# optional JSON {"<model>": {"prompt": usd_per_1M, "candidates": usd_per_1M}}.
+USAGE_LEDGER_ENABLED = os.environ.get("USAGE_LEDGER_ENABLED", "1") == "1"
+USAGE_LEDGER_PATH = os.environ.get("USAGE_LEDGER_PATH", os.path.join("logs", "usage.db"))
+LLM_PRICING_FILE = os.environ.get("LLM_PRICING_FILE")
+
+# Startup data and production server (wsgi.py, gunicorn.conf.py): DATA_MONTHS
+# are the cr_kpi.kpi_<month> tables loaded at startup (the first is the default
+# view); DASH_OFFLINE=1 starts with empty datasets instead. gunicorn preloads
+# them once in the master and forks WEB_WORKERS processes of WEB_THREADS threads
+# that share the month data copy-on-write; WEB_TIMEOUT covers slow LLM calls.
+DATA_MONTHS = [m.strip() for m in os.environ.get("DATA_MONTHS", "april,May").split(",") if m.strip()]
+DASH_OFFLINE = os.environ.get("DASH_OFFLINE", "0") == "1"
+WEB_BIND = os.environ.get("WEB_BIND", "0.0.0.0:8050")
+WEB_WORKERS = int(os.environ.get("WEB_WORKERS", "2"))
+WEB_THREADS = int(os.environ.get("WEB_THREADS", "8"))
+WEB_TIMEOUT = int(os.environ.get("WEB_TIMEOUT", "180"))
+
+# Server-side session state (selected-chart snapshots, view-table pages etc.)
+# "memory" keeps state per process and is only usable with a single worker, so
+# the default is a SQLite file shared by all workers whenever WEB_WORKERS > 1,
+# e.g. export SESSION_STORE_URL="sqlite:///logs/sessions.db"
+SESSION_STORE_URL = os.environ.get(
+    "SESSION_STORE_URL", "sqlite:///" + os.path.join("logs", "sessions.db") if WEB_WORKERS > 1 else "memory"
+)
+SESSION_STORE_MAX_ENTRIES = int(os.environ.get("SESSION_STORE_MAX_ENTRIES", "4096"))
+
+# Hot reload of the month data: every DATA_REFRESH_INTERVAL seconds each process
+# probes the DATA_MONTHS tables (row count + checksum) and swaps any month that
+# changed for a freshly loaded snapshot; 0 disables the refresh.
+DATA_REFRESH_INTERVAL = float(os.environ.get("DATA_REFRESH_INTERVAL", "300"))
+# Months that are still open (e.g. the current one) reload incrementally: only
+# outlets whose row hash changed are fetched and only the aggregates they
+# touch are rebuilt. Needs a unique sales_outlet per table; empty = none.
+DATA_DELTA_MONTHS = [m.strip() for m in os.environ.get("DATA_DELTA_MONTHS", "").split(",") if m.strip()]
@@ -0,0 +1,9 @@
+import pandas as pd
+
+# Copy-on-write for every process that touches the month data (the app, the
+# scripts and the benchmarks alike). The month snapshots are loaded once and
+# shared by all callbacks; the filter helpers in app_tabs and services slice
+# them through shallow copies and views instead of defensive .copy() calls,
+# which is only safe when a later write copies the touched data rather than
+# mutating the shared frames.
+pd.set_option("mode.copy_on_write", True)
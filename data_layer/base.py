@@ -1,40 +1,56 @@
-from sqlalchemy import create_engine
 import pandas as pd
 from loguru import logger
 from config.settings import CONNECTION_URI, DB_DATABASE, DB_SERVER
 from typing import Dict, Callable
+import time
+from utils import metrics
 
-def execute_queries(sql_map: Dict[str, str], tab_name: str, remap_logic: Callable[[Dict[str, pd.DataFrame]], Dict[str, pd.DataFrame]] = None):
-    """Execute SQL queries and return results as a dictionary of DataFrames."""
+def execute_queries(sql_map: Dict[str, str], tab_name: str, remap_logic: Callable[[Dict[str, pd.DataFrame]], Dict[str, pd.DataFrame]] = None, engine=None):
+    """Execute SQL queries and return results as a dictionary of DataFrames.
+
+    `engine` (e.g. a SQLite stand-in for benchmarks) replaces the CONNECTION_URI
+    engine and is left open for the caller.
+    """
     tab_logger = logger.bind(tab=tab_name)
     tab_logger.info("Starting database connection and query execution")
 
-    try:
-        engine = create_engine(CONNECTION_URI)
-        tab_logger.info(
-            f"Successfully connected to database: {DB_DATABASE} on server: {DB_SERVER}"
-        )
-    except Exception as e:
-        tab_logger.error(f"Failed to create database engine: {e}")
-        return {}
+    own_engine = engine is None
+    if own_engine:
+        try:
+            # Imported here: SQLAlchemy adds ~0.2s to app startup and is only needed to load data
+            from sqlalchemy import create_engine
+
+            engine = create_engine(CONNECTION_URI)
+            tab_logger.info(
+                f"Successfully connected to database: {DB_DATABASE} on server: {DB_SERVER}"
+            )
+        except Exception as e:
+            tab_logger.error(f"Failed to create database engine: {e}")
+            return {}
 
     results: dict[str, pd.DataFrame] = {}
     successful_queries = 0
     failed_queries = 0
 
     for key, query in sql_map.items():
+        labels = {"tab": tab_name, "query": key}
+        t0 = time.perf_counter()
         try:
             tab_logger.info(f"Executing query: {key}")
             df = pd.read_sql(query, engine)
             results[key] = df
             successful_queries += 1
+            metrics.inc("insightdash_sql_rows_total", labels, len(df))
             tab_logger.success(
                 f"Query {key} executed successfully. Rows returned: {len(df)}"
             )
         except Exception as e:
             failed_queries += 1
+            metrics.inc("insightdash_sql_errors_total", labels)
             tab_logger.error(f"Error executing query {key}: {e}")
             results[key] = pd.DataFrame()  # Return empty DataFrame on failure
+        finally:
+            metrics.observe("insightdash_sql_query_seconds", time.perf_counter() - t0, labels)
 
     if remap_logic:
         results = remap_logic(results)
@@ -45,10 +61,11 @@ def execute_queries(sql_map: Dict[str, str], tab_name: str, remap_logic: Callabl
     )
 
     # Close the connection
-    try:
-        engine.dispose()
-        tab_logger.info("Database connection closed successfully")
-    except Exception as e:
-        tab_logger.warning(f"Error while closing database connection: {e}")
+    if own_engine:
+        try:
+            engine.dispose()
+            tab_logger.info("Database connection closed successfully")
+        except Exception as e:
+            tab_logger.warning(f"Error while closing database connection: {e}")
 
     return results
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from loguru import logger
+
+from app_tabs.tab3.figures import KPI_DISPLAY, RADAR_ALIASES, SALES_KPIS, SERVICE_KPIS
+from sql_queries.delta import (
+    OUTLET_COLUMNS,
+    OUTLET_KEY,
+    build_outlet_hash_sql_map,
+    build_outlet_rows_sql_map,
+)
+from sql_queries.tab1 import build_first_sql_map
+from sql_queries.tab2 import build_second_sql_map
+from sql_queries.tab3 import build_third_sql_map
+
+from .base import execute_queries
+from .loader import month_table
+from .normalize import normalize_monthly_datasets, shared_categories
+from .schema import coerce_numeric, is_numeric_column
+from .tab_1 import remap_tab1
+from .tab_2 import remap_tab2
+
+KPI_COLUMNS = [k for k, _ in KPI_DISPLAY]
+# The sheet queries FRAMES reproduces; the first load of a month is checked against them
+SHEET_SQL_MAPS = {"tab1": build_first_sql_map, "tab2": build_second_sql_map, "tab3": build_third_sql_map}
+
+
+# ---- pandas equivalents of the Tab 1-3 queries, over outlet rows ----
+def _t1_scatter(rows: pd.DataFrame) -> pd.DataFrame:
+    keep = rows.dropna(subset=["rgn", "outlet_category", "rate_performance", "rate_quality"])
+    return keep[["rgn", "outlet_category", "sales_outlet", "rate_performance", "rate_quality", "total_score"]]
+
+
+def _t1_bar(rows: pd.DataFrame) -> pd.DataFrame:
+    return rows.groupby("outlet_category").size().reset_index(name="outlet_count")
+
+
+def _t1_stack(rows: pd.DataFrame) -> pd.DataFrame:
+    counts = rows.groupby(["rgn", "outlet_category"]).size().reset_index(name="outlet_count")
+    counts["percentage"] = (
+        counts["outlet_count"] * 100.0 / counts.groupby("rgn")["outlet_count"].transform("sum")
+    ).round(2)
+    return counts
+
+
+def _t2_scatter(rows: pd.DataFrame) -> pd.DataFrame:
+    any_kpi = rows[["new_car_reg_pct", "gear_up_ach_pct", "cs_sales_pct", "nps_sales_pct"]].notna().any(axis=1)
+    return rows.loc[any_kpi, ["sales_outlet", "rgn", "outlet_category", "outlet_type"] + KPI_COLUMNS]
+
+
+def _t3_rows(rows: pd.DataFrame) -> pd.DataFrame:
+    keep = rows[rows["rgn"].notna() & rows["outlet_category"].isin(["B", "C", "D"])]
+    cols = ["rgn", "outlet_category", "outlet_type", "sales_outlet", "rate_performance", "rate_quality", "total_score"]
+    return keep[cols + KPI_COLUMNS]
+
+
+def _t3_gaps(rows: pd.DataFrame) -> pd.DataFrame:
+    bcd = rows[rows["outlet_category"].isin(["B", "C", "D"])]
+    gaps = (bcd.groupby("outlet_category")[KPI_COLUMNS].mean() - 100).reset_index()
+    gaps = gaps.melt(id_vars="outlet_category", var_name="kpi", value_name="gap_value")
+    gaps["kpi"] = gaps["kpi"].map(dict(KPI_DISPLAY))
+    return gaps
+
+
+def _radar(by: List[str]) -> Callable[[pd.DataFrame], pd.DataFrame]:
+    def build(rows: pd.DataFrame) -> pd.DataFrame:
+        t = rows.dropna(subset=by).copy()
+        t.loc[t["outlet_type"] == "2S", list(SALES_KPIS)] = 0
+        t.loc[t["outlet_type"] == "1S", list(SERVICE_KPIS)] = 0
+        out = t.groupby(by)[list(RADAR_ALIASES)].mean().reset_index()
+        return out.rename(columns=RADAR_ALIASES)
+
+    return build
+
+
+# (tab, query key) -> (partition column, builder, ORDER BY). A changed outlet
+# only affects the partitions it belonged to before and after the change, so
+# only those are rebuilt; outlet-level frames are partitioned by the outlet key.
+FRAMES: Dict[Tuple[str, str], Tuple[str, Callable, List[str]]] = {
+    ("tab1", "scatter-plot-q1"): (OUTLET_KEY, _t1_scatter, []),
+    ("tab1", "bar-chart-q2"): ("outlet_category", _t1_bar, ["outlet_category"]),
+    ("tab1", "stack-bar-chart-q3"): ("rgn", _t1_stack, ["rgn", "outlet_category"]),
+    ("tab2", "dynamic-scatter-plot"): (OUTLET_KEY, _t2_scatter, []),
+    ("tab3", "q1"): (OUTLET_KEY, _t3_rows, []),
+    ("tab3", "q2"): ("outlet_category", _t3_gaps, ["outlet_category", "kpi"]),
+    ("tab3", "radar-chart-before-filtering-q2"): ("outlet_type", _radar(["outlet_type"]), ["outlet_type"]),
+    ("tab3", "radar-chart-after-filtering-q3"): (
+        "outlet_type",
+        _radar(["outlet_type", "outlet_category"]),
+        ["outlet_type", "outlet_category"],
+    ),
+}
+
+
+def _sorted(df: pd.DataFrame, order: List[str]) -> pd.DataFrame:
+    # SQL Server's default collation orders text case-insensitively
+    if not order or df.empty:
+        return df.reset_index(drop=True)
+    return df.sort_values(order, key=lambda s: s.astype(str).str.lower(), kind="stable").reset_index(drop=True)
+
+
+def splice(old: pd.DataFrame, rows: pd.DataFrame, touched: pd.DataFrame, by: str, build: Callable, order: List[str]) -> pd.DataFrame:
+    """`old` with the `by` partitions in `touched` rebuilt from the current outlet `rows`."""
+    parts = touched[by].dropna().unique()
+    fresh = build(rows[rows[by].isin(parts)])
+    kept = old[~old[by].isin(parts)]
+    return _sorted(pd.concat([kept, fresh], ignore_index=True), order)
+
+
+def _canonical(df: pd.DataFrame) -> pd.DataFrame:
+    # Numbers rounded to cents, text trimmed, rows in a fixed order
+    cols = {}
+    for c in df.columns:
+        num = pd.to_numeric(df[c], errors="coerce")
+        if num.notna().sum() == df[c].notna().sum():
+            cols[c] = num.astype(float).round(2)
+        else:
+            cols[c] = df[c].astype(str).str.strip().where(df[c].notna())
+    out = pd.DataFrame(cols)
+    return out.sort_values(list(out.columns), kind="stable").reset_index(drop=True)
+
+
+def frames_match(ours: pd.DataFrame, sql: pd.DataFrame | None, tol: float = 0.011) -> bool:
+    """True when `ours` has the columns and rows (in any order) of the query result `sql`."""
+    if sql is None or list(ours.columns) != list(sql.columns) or len(ours) != len(sql):
+        return False
+    a, b = _canonical(ours), _canonical(sql)
+    for c in a.columns:
+        if pd.api.types.is_float_dtype(a[c]) != pd.api.types.is_float_dtype(b[c]):
+            return False
+        if pd.api.types.is_float_dtype(a[c]):
+            diff = (a[c] - b[c]).abs()
+            if ((diff > tol) | (a[c].isna() != b[c].isna())).any():
+                return False
+        elif not a[c].fillna("\0").equals(b[c].fillna("\0")):
+            return False
+    return True
+
+
+def _unique(keys: pd.Series) -> bool:
+    return not (keys.isna().any() or keys.duplicated().any())
+
+
+def typed_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Outlet rows with numeric KPI/score columns (the aggregates need numbers)."""
+    out = df.copy()
+    for c in out.columns:
+        if is_numeric_column(c):
+            out[c] = coerce_numeric(out[c])[0]
+    return out
+
+
+class DeltaMonth:
+    """Incremental reloads of one (still open) month table.
+
+    The first load reads every outlet row once and derives the Tab 1-3
+    results from it in pandas. Later loads read only the (outlet key, row
+    hash) pairs, fetch the rows that are new or whose hash changed, merge
+    them into the cached outlet rows and rebuild just the partitions
+    (regions, categories, outlet types, outlets) those rows touch.
+    The first load also runs the sheet queries once and compares their
+    results with the pandas ones (frames_match); a mismatch, like a table
+    without a unique outlet key, turns `enabled` off and callers then reload
+    the month in full.
+    """
+
+    def __init__(self, month: str, query: Callable = execute_queries):
+        self.month = month
+        self.table = month_table(month)
+        self.query = query
+        self.rows: Optional[pd.DataFrame] = None  # outlet rows + row_hash, indexed by outlet key
+        self.raw: Dict[str, dict] = {}  # un-normalized {tab: {key: DataFrame}}
+        self.enabled = True
+
+    def load(self, monthly_datasets: Dict) -> Optional[Dict[str, dict]]:
+        """New snapshot of the month, the current one when nothing changed, or None on failure."""
+        if self.rows is None:
+            return self._full(monthly_datasets)
+        hashes = self.query(build_outlet_hash_sql_map(self.table), "Delta").get("hashes")
+        if hashes is None or hashes.empty:
+            return None
+        if not _unique(hashes[OUTLET_KEY]):
+            return self._disable(f"{OUTLET_KEY} is not a unique, non-null key")
+        hashes = hashes.set_index(OUTLET_KEY)["row_hash"]
+        known = self.rows["row_hash"]
+        removed = known.index.difference(hashes.index)
+        common = hashes.index.intersection(known.index)
+        changed = common[hashes[common].to_numpy() != known[common].to_numpy()]
+        fetch = hashes.index.difference(known.index).append(changed)
+        if not len(removed) and not len(fetch):
+            return monthly_datasets.get(self.month)
+
+        fetched = self._fetch(fetch)
+        if fetched is None:
+            return None
+        # Rows deleted between the hash and the row query count as removed
+        dropped = removed.union(changed)
+        before = self.rows.loc[dropped]
+        rows = pd.concat([self.rows.drop(index=dropped), fetched[self.rows.columns]])
+        touched = pd.concat([before, fetched]).reset_index()
+        logger.bind(tab="Delta").info(
+            f"{self.table}: {len(fetch) - len(changed)} new, {len(changed)} changed, "
+            f"{len(removed)} removed; {len(rows)} outlets"
+        )
+
+        flat = rows.reset_index()
+        for (tab, key), (by, build, order) in FRAMES.items():
+            self.raw[tab][key] = splice(self.raw[tab][key], flat, touched, by, build, order)
+        self.rows = rows
+        return self._snapshot(monthly_datasets)
+
+    def _fetch(self, keys) -> Optional[pd.DataFrame]:
+        if not len(keys):
+            return pd.DataFrame(columns=OUTLET_COLUMNS + ["row_hash"]).set_index(OUTLET_KEY)
+        sql_map = build_outlet_rows_sql_map(self.table, keys)
+        res = self.query(sql_map, "Delta")
+        if len(res) < len(sql_map) or any(len(df.columns) == 0 for df in res.values()):
+            return None
+        return typed_rows(pd.concat(res.values(), ignore_index=True)).set_index(OUTLET_KEY)
+
+    def _full(self, monthly_datasets: Dict) -> Optional[Dict[str, dict]]:
+        df = self.query(build_outlet_rows_sql_map(self.table), "Delta").get("rows")
+        if df is None or df.empty:
+            return None
+        rows = typed_rows(df)
+        if not _unique(rows[OUTLET_KEY]):
+            return self._disable(f"{OUTLET_KEY} is not a unique, non-null key")
+        sheets = {tab: self.query(build(self.table), "Delta") for tab, build in SHEET_SQL_MAPS.items()}
+        if any(sheets[tab].get(key) is None for tab, key in FRAMES):
+            return None
+        self.raw = {"tab1": {}, "tab2": {}, "tab3": {}}
+        for (tab, key), (_, build, order) in FRAMES.items():
+            self.raw[tab][key] = _sorted(build(rows), order)
+        differ = [f"{tab}/{key}" for tab, key in FRAMES if not frames_match(self.raw[tab][key], sheets[tab][key])]
+        if differ:
+            # A write between the two reads can trip this too; the month then reloads in full
+            self.raw = sheets
+            snapshot = self._snapshot(monthly_datasets)
+            self._disable(f"pandas results differ from the sheet queries ({', '.join(differ)})")
+            return snapshot
+        self.rows = rows.set_index(OUTLET_KEY)
+        return self._snapshot(monthly_datasets)
+
+    def _disable(self, reason: str) -> None:
+        logger.warning(f"{self.table}: {reason}; falling back to full reloads")
+        self.enabled = False
+        self.rows = None
+        self.raw = {}
+        return None
+
+    def _snapshot(self, monthly_datasets: Dict) -> Dict[str, dict]:
+        raw = {
+            "tab1": remap_tab1(dict(self.raw["tab1"])),
+            "tab2": remap_tab2(dict(self.raw["tab2"])),
+            "tab3": dict(self.raw["tab3"]),
+        }
+        categories = shared_categories({**monthly_datasets, self.month: raw})
+        return normalize_monthly_datasets({self.month: raw}, categories=categories)[self.month]
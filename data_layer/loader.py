@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable
+
+from .normalize import normalize_monthly_datasets
+from .tab_1 import get_tab1_results
+from .tab_2 import get_tab2_results
+from .tab_3 import get_tab3_results
+
+
+def month_table(month: str) -> str:
+    """cr_kpi table for a month label ("May" -> "kpi_may")."""
+    return f"kpi_{month.lower()}"
+
+
+def load_month(month: str) -> Dict[str, dict]:
+    """Raw {"tab1", "tab2", "tab3"} query results for one month table."""
+    table = month_table(month)
+    return {
+        "tab1": get_tab1_results(table),
+        "tab2": get_tab2_results(table),
+        "tab3": get_tab3_results(table),
+    }
+
+
+def load_monthly_datasets(months: Iterable[str]) -> Dict[str, dict]:
+    """Normalized {month: {tab: {key: DataFrame}}} for `months`, in order."""
+    return normalize_monthly_datasets({m: load_month(m) for m in months})
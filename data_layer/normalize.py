@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from .schema import apply_schema, is_numeric_column, report_frame
+
+# Low-cardinality text dimensions shared by every tab/month
+DIMENSION_COLUMNS = ("rgn", "outlet_category", "outlet_type", "sales_outlet")
+
+# Unparseable numeric cells found by the last normalize_monthly_datasets call
+_VALIDATION_REPORT = report_frame([])
+
+# float32 keeps ~7 significant digits; only downcast when 2-decimal values survive
+_FLOAT32_TOLERANCE = 0.005
+
+
+def _iter_frames(monthly_datasets: Dict) -> Iterable[pd.DataFrame]:
+    for tabs in (monthly_datasets or {}).values():
+        for frames in (tabs or {}).values():
+            for df in (frames or {}).values():
+                if isinstance(df, pd.DataFrame):
+                    yield df
+
+
+def _frame_bytes(monthly_datasets: Dict) -> int:
+    seen: set[int] = set()
+    total = 0
+    for df in _iter_frames(monthly_datasets):
+        if id(df) in seen:
+            continue
+        seen.add(id(df))
+        total += int(df.memory_usage(deep=True).sum())
+    return total
+
+
+def shared_categories(monthly_datasets: Dict, columns: Iterable[str] = DIMENSION_COLUMNS) -> Dict[str, list]:
+    """Union of non-null values (trimmed) per dimension column across all months and tabs."""
+    values: Dict[str, set] = {c: set() for c in columns}
+    for df in _iter_frames(monthly_datasets):
+        for c in values:
+            if c in df.columns:
+                values[c].update(df[c].dropna().astype(str).str.strip().unique().tolist())
+    return {c: sorted(v) for c, v in values.items() if v}
+
+
+def validation_report() -> pd.DataFrame:
+    """Numeric cells the schema could not parse during the last load (one row per column)."""
+    return _VALIDATION_REPORT.copy()
+
+
+def _downcast_float(s: pd.Series) -> pd.Series:
+    """Return a float32 copy of `s` when no value moves by more than half a cent."""
+    if not pd.api.types.is_float_dtype(s) or s.dtype == np.float32:
+        return s
+    try:
+        finite = s[np.isfinite(s)]
+        if finite.empty:
+            return s.astype(np.float32)
+        s32 = s.astype(np.float32)
+        err = (s32[finite.index].astype(np.float64) - finite).abs().max()
+        return s32 if err <= _FLOAT32_TOLERANCE else s
+    except Exception:
+        return s
+
+
+def normalize_frame(df: pd.DataFrame, categories: Dict[str, list]) -> pd.DataFrame:
+    """Convert dimensions to shared (trimmed) categoricals and downcast KPI columns to float32."""
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return df
+    cols: Dict[str, pd.Series] = {}
+    for c in df.columns:
+        s = df[c]
+        if c in categories:
+            try:
+                cols[c] = pd.Series(
+                    pd.Categorical(s.astype(str).str.strip().where(s.notna()), categories=categories[c]),
+                    index=df.index,
+                    name=c,
+                )
+                continue
+            except Exception:
+                pass
+        if is_numeric_column(c):
+            s = _downcast_float(s)
+        cols[c] = s
+    return pd.DataFrame(cols, index=df.index)
+
+
+def _frame_key(df: pd.DataFrame):
+    try:
+        return (
+            tuple(map(str, df.columns)),
+            tuple(map(str, df.dtypes)),
+            len(df),
+            int(pd.util.hash_pandas_object(df, index=True).sum()),
+        )
+    except Exception:
+        return None
+
+
+def normalize_monthly_datasets(monthly_datasets: Dict, categories: Dict[str, list] | None = None) -> Dict:
+    """Return a compact copy of `monthly_datasets` ({month: {tab: {key: DataFrame}}}).
+
+    KPI/score columns are first coerced to numbers by the typed schema
+    (data_layer.schema); cells that cannot be parsed become NaN and are
+    listed in validation_report(). Dimensions become categoricals with the
+    same categories across months so month frames concatenate without
+    falling back to object dtype, KPI columns are downcast to float32 where
+    that is lossless at 2 decimals, and frames with identical content (e.g.
+    remapped aliases, tabs selecting the same columns) are stored once.
+    """
+    global _VALIDATION_REPORT
+    if not monthly_datasets:
+        return monthly_datasets
+    norm_logger = logger.bind(tab="DataLayer")
+    before = _frame_bytes(monthly_datasets)
+    partial = categories is not None
+    if not partial:
+        categories = shared_categories(monthly_datasets)
+
+    by_id: Dict[int, pd.DataFrame] = {}
+    by_key: Dict[tuple, pd.DataFrame] = {}
+    issues: list = []
+    out: Dict = {}
+    for month, tabs in monthly_datasets.items():
+        out[month] = {}
+        for tab_key, frames in (tabs or {}).items():
+            out[month][tab_key] = {}
+            for key, df in (frames or {}).items():
+                if not isinstance(df, pd.DataFrame):
+                    out[month][tab_key][key] = df
+                    continue
+                if id(df) not in by_id:
+                    typed, found = apply_schema(df)
+                    issues.extend(
+                        {"month": month, "tab": tab_key, "frame": key, **i} for i in found
+                    )
+                    nd = normalize_frame(typed, categories)
+                    fk = _frame_key(nd)
+                    if fk is not None:
+                        nd = by_key.setdefault(fk, nd)
+                    by_id[id(df)] = nd
+                out[month][tab_key][key] = by_id[id(df)]
+
+    report = report_frame(issues)
+    for row in report.itertuples(index=False):
+        norm_logger.warning(
+            f"{row.month}/{row.tab}/{row.frame}: {row.invalid} of {row.rows} "
+            f"'{row.column}' values are not numeric (e.g. {row.examples})"
+        )
+
+    if partial:
+        kept = _VALIDATION_REPORT[~_VALIDATION_REPORT["month"].isin(list(monthly_datasets))]
+        report = report_frame(kept.to_dict("records") + issues)
+    _VALIDATION_REPORT = report
+
+    after = _frame_bytes(out)
+    norm_logger.info(
+        f"Normalized monthly datasets: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB "
+        f"({len(by_key)} unique frames)"
+    )
+    return out
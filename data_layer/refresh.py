@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from loguru import logger
+
+from sql_queries.probe import build_probe_sql_map
+
+from .base import execute_queries
+from .delta import DeltaMonth
+from .loader import load_month, month_table
+from .normalize import normalize_monthly_datasets, shared_categories
+
+
+def probe_month(month: str) -> Optional[tuple]:
+    """(row count, checksum) of a month table, or None when the probe fails."""
+    df = execute_queries(build_probe_sql_map(month_table(month)), "Refresh").get("probe")
+    if df is None or df.empty:
+        return None
+    return tuple(df.iloc[0].tolist())
+
+
+def reload_month(month: str, monthly_datasets: Dict) -> Dict[str, dict]:
+    """Normalized {tab: {key: DataFrame}} for `month`, sharing categories with `monthly_datasets`."""
+    raw = load_month(month)
+    categories = shared_categories({**monthly_datasets, month: raw})
+    return normalize_monthly_datasets({month: raw}, categories=categories)[month]
+
+
+def month_rows(tabs: dict | None) -> int:
+    """Tab 1 row count of a month snapshot (0 when it did not load)."""
+    df = ((tabs or {}).get("tab1") or {}).get("q1")
+    return 0 if df is None else int(len(df))
+
+
+class MonthlyRefresher:
+    """Reloads month tables whose content changed and swaps them into `monthly_datasets`.
+
+    Each check probes every month (`probe(month)` returns a comparable
+    signature or None). A month whose signature differs from the last one
+    is reloaded into a new snapshot (`load(month, monthly_datasets)`), which
+    replaces the old one with a single dict assignment; requests already
+    holding the old frames finish with them. `on_swap(months)` runs after
+    the swap so callers can invalidate caches. Failed probes and empty
+    reloads keep the current snapshot and are retried on the next check.
+    Months in `delta_months` are reloaded incrementally (data_layer.delta).
+    """
+
+    def __init__(
+        self,
+        monthly_datasets: Dict,
+        interval: float,
+        on_swap: Callable[[list], None] | None = None,
+        probe: Callable[[str], Optional[tuple]] = probe_month,
+        load: Callable[[str, Dict], Dict[str, dict]] = reload_month,
+        delta_months: Iterable[str] = (),
+    ):
+        self.monthly_datasets = monthly_datasets
+        self.interval = interval
+        self.on_swap = on_swap
+        self.probe = probe
+        self.load = load
+        self.signatures: Dict[str, tuple] = {}
+        self.deltas = {m: DeltaMonth(m) for m in delta_months}
+        self._check_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def prime(self, months: Iterable[str] | None = None) -> None:
+        """Record the current signatures (call right after loading the data)."""
+        for month in list(months or self.monthly_datasets):
+            sig = self.probe(month)
+            if sig is not None:
+                self.signatures[month] = sig
+
+    def check(self) -> list:
+        """Probe every month, swap in the changed ones; returns the swapped months."""
+        swapped = []
+        with self._check_lock:
+            for month in list(self.monthly_datasets):
+                sig = self.probe(month)
+                if sig is None or sig == self.signatures.get(month):
+                    continue
+                if month not in self.signatures:
+                    self.signatures[month] = sig
+                    continue
+                logger.info(f"Month '{month}' changed ({self.signatures[month]} -> {sig}); reloading")
+                delta = self.deltas.get(month)
+                if delta is not None and delta.enabled:
+                    snapshot = delta.load(self.monthly_datasets)
+                else:
+                    snapshot = self.load(month, self.monthly_datasets)
+                if snapshot is not None and snapshot is self.monthly_datasets.get(month):
+                    self.signatures[month] = sig  # probe changed, tracked columns did not
+                    continue
+                if not month_rows(snapshot):
+                    logger.warning(f"Reload of month '{month}' failed or returned no rows; keeping the current data")
+                    continue
+                self.monthly_datasets[month] = snapshot
+                self.signatures[month] = sig
+                swapped.append(month)
+        if swapped:
+            logger.info(f"Swapped in refreshed data for {swapped}")
+            if self.on_swap is not None:
+                self.on_swap(swapped)
+        return swapped
+
+    def ensure_started(self) -> None:
+        """Start the background thread in this process (threads do not survive a fork)."""
+        if self.interval <= 0 or self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            # A lock copied from the parent may have been held at fork time
+            self._check_lock = threading.Lock()
+            self._stopped = threading.Event()
+            self._thread = threading.Thread(target=self._run, name="monthly-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Monthly data refresh failed: {e}")
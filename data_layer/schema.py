@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Typed schema applied once at load time: every KPI percentage column and the
+# score columns are float64 (normalize may then downcast them to float32), so
+# callbacks never have to parse strings like "85%" or "1,234.5" again.
+SCORE_COLUMNS = ("rate_performance", "rate_quality", "total_score")
+
+# Same token the callbacks used to extract from text cells
+_NUMBER = r"([-+]?\d*\.?\d+)"
+_BLANK = {"", "nan", "none", "null", "n/a", "na", "-"}
+
+
+def is_numeric_column(name) -> bool:
+    return str(name).endswith("_pct") or name in SCORE_COLUMNS
+
+
+def coerce_numeric(s: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Return (float64 series, mask of non-blank cells that could not be parsed).
+
+    Plain numbers go through pd.to_numeric; only the cells that fail there are
+    cleaned (%, thousands separators) and the first numeric token extracted.
+    """
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return s.astype(np.float64), pd.Series(False, index=s.index)
+    if not pd.api.types.is_object_dtype(s):
+        s = s.astype(object)
+
+    out = pd.to_numeric(s, errors="coerce").astype(np.float64)
+    retry = out.isna() & s.notna()
+    if retry.any():
+        text = s[retry].astype(str)
+        cleaned = (
+            text.str.replace("%", "", regex=False)
+            .str.replace(",", "", regex=False)
+            .str.extract(_NUMBER)[0]
+        )
+        out.loc[retry] = pd.to_numeric(cleaned, errors="coerce")
+        blank = text.str.strip().str.lower().isin(_BLANK)
+        invalid = pd.Series(False, index=s.index)
+        invalid.loc[retry] = out[retry].isna() & ~blank
+        return out, invalid
+    return out, pd.Series(False, index=s.index)
+
+
+def apply_schema(df: pd.DataFrame, max_examples: int = 5) -> Tuple[pd.DataFrame, List[Dict]]:
+    """Coerce the schema's numeric columns of `df`; returns (frame, per-column issues).
+
+    Each issue is {"column", "invalid", "rows", "examples"} for a column with
+    cells that became NaN although they were not blank.
+    """
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return df, []
+    issues: List[Dict] = []
+    cols: Dict = {}
+    changed = False
+    for c in df.columns:
+        s = df[c]
+        if is_numeric_column(c) and s.dtype != np.float64 and s.dtype != np.float32:
+            s, invalid = coerce_numeric(s)
+            changed = True
+            n_bad = int(invalid.sum())
+            if n_bad:
+                issues.append(
+                    {
+                        "column": str(c),
+                        "invalid": n_bad,
+                        "rows": int(len(df)),
+                        "examples": df[c][invalid].astype(str).unique()[:max_examples].tolist(),
+                    }
+                )
+        cols[c] = s
+    if not changed:
+        return df, issues
+    return pd.DataFrame(cols, index=df.index), issues
+
+
+def report_frame(issues: List[Dict]) -> pd.DataFrame:
+    """Validation issues (with month/tab/frame context) as a sortable table."""
+    columns = ["month", "tab", "frame", "column", "invalid", "rows", "examples"]
+    if not issues:
+        return pd.DataFrame(columns=columns)
+    return (
+        pd.DataFrame(issues)
+        .reindex(columns=columns)
+        .sort_values(["invalid", "month", "tab", "frame"], ascending=[False, True, True, True])
+        .reset_index(drop=True)
+    )
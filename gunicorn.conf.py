@@ -0,0 +1,20 @@
+# gunicorn -c gunicorn.conf.py wsgi:server
+# Sizes come from config.settings (WEB_BIND, WEB_WORKERS, WEB_THREADS, WEB_TIMEOUT).
+from config.settings import SESSION_STORE_URL, WEB_BIND, WEB_THREADS, WEB_TIMEOUT, WEB_WORKERS
+
+bind = WEB_BIND
+workers = WEB_WORKERS
+threads = WEB_THREADS
+worker_class = "gthread"
+timeout = WEB_TIMEOUT
+# Load the month data once in the master; forked workers share it copy-on-write
+preload_app = True
+
+# Session state (selection handles, view-table paging/sorting) must be visible
+# to every worker: requests of one browser land on any of them. The in-process
+# "memory" store only works with a single worker, so refuse to start otherwise.
+if workers > 1 and not SESSION_STORE_URL.startswith("sqlite:///"):
+    raise RuntimeError(
+        f"SESSION_STORE_URL={SESSION_STORE_URL!r} keeps session state per process; "
+        f"use sqlite:///path/to/sessions.db with WEB_WORKERS={workers}"
+    )
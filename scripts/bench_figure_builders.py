@@ -0,0 +1,89 @@
+"""plotly.express vs utils.figures build times for the dashboard's chart shapes.
+
+Usage: python scripts/bench_figure_builders.py [scale] [repeats]
+
+Builds each chart (tab 1 stacked bar / scatter / pie, tab 3 grouped gap bar
+and radar, tab 2 outlet scatter) from synthetic month data with both builders
+and prints the median build + to_plotly_json time in milliseconds.
+"""
+import os
+import statistics
+import sys
+import time
+
+import plotly.express as px
+
+# Ensure project root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from synthetic_kpi import KPI_COLUMNS, make_monthly_datasets
+from app_tabs.tab3.figures import kpi_gap_table
+from data_layer.normalize import normalize_monthly_datasets
+from utils import figures as fast_px
+
+
+def _cases(month: dict) -> dict:
+    t1, t2, t3 = month["tab1"], month["tab2"], month["tab3"]
+    q3 = t1["stack-bar-chart-q3"]
+    outlets = t2["dynamic-scatter-plot"]
+    gaps = kpi_gap_table(t3["q1"])
+    radar = gaps[gaps["outlet_category"] == "B"]
+    counts = outlets.groupby("outlet_category", observed=True).size().reset_index(name="count")
+    hover = ["sales_outlet", "rgn", "outlet_type"]
+    x, y = KPI_COLUMNS[0], KPI_COLUMNS[1]
+
+    return {
+        "tab1 stacked bar": (
+            lambda: px.bar(q3, x="rgn", y="percentage", color="outlet_category"),
+            lambda: fast_px.bar(q3, x="rgn", y="percentage", color="outlet_category"),
+        ),
+        "tab1 pie": (
+            lambda: px.pie(counts, names="outlet_category", values="count", color="outlet_category"),
+            lambda: fast_px.pie(counts, names="outlet_category", values="count"),
+        ),
+        "tab3 gap bar": (
+            lambda: px.bar(gaps, x="gap_value", y="kpi", color="outlet_category",
+                           orientation="h", barmode="group"),
+            lambda: fast_px.bar(gaps, x="gap_value", y="kpi", color="outlet_category",
+                                orientation="h", barmode="group"),
+        ),
+        "tab3 radar": (
+            lambda: px.line_polar(radar, r="gap_value", theta="kpi", line_close=True),
+            lambda: fast_px.line_polar(radar, r="gap_value", theta="kpi", line_close=True),
+        ),
+        "tab2 scatter": (
+            lambda: px.scatter(outlets, x=x, y=y, color="outlet_category",
+                               hover_data=hover, custom_data=hover),
+            lambda: fast_px.scatter(outlets, x=x, y=y, color="outlet_category",
+                                    hover_data=hover, custom_data=hover),
+        ),
+    }
+
+
+def _median_ms(build, repeats: int) -> float:
+    build().to_plotly_json()  # warm up imports/templates
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        build().to_plotly_json()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    month = next(iter(normalize_monthly_datasets(make_monthly_datasets(1, scale)).values()))
+
+    print(f"scale={scale} repeats={repeats}")
+    print(f"{'chart':<20}{'px ms':>10}{'fast ms':>10}{'speedup':>10}")
+    for name, (slow, fast) in _cases(month).items():
+        a, b = _median_ms(slow, repeats), _median_ms(fast, repeats)
+        print(f"{name:<20}{a:>10.2f}{b:>10.2f}{a / b:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Cold-start benchmark: time from a fresh interpreter to a dashboard serving its first page.
+
+Usage:
+    python scripts/bench_startup.py [--runs 5] [--scale 1] [--months 2]
+                                    [--importtime 15] [--max-seconds S]
+
+Each run starts a new Python process (in a scratch directory, so log files
+stay out of the repo) and times its phases:
+
+    import     `import app` (Dash, pandas, tab modules, services)
+    data       synthetic monthly datasets from scripts/synthetic_kpi.py
+    create     create_dashboard (layout, callbacks, plotly template)
+    page       first GET /, /_dash-layout and /_dash-dependencies
+    figures    first filter-store callbacks (Tab 1-3 figures)
+    ready      import + create + page + figures (all but `data`)
+
+plus `interpreter`, the process start-up before `import app`. Medians and
+minimums over `--runs` are printed; `--importtime N` adds the N
+slowest top-level imports from `python -X importtime`. With `--max-seconds`
+the script exits 1 when the median `ready` time is above the budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Ensure project root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+
+PHASES = ["import", "data", "create", "page", "figures", "ready"]
+
+
+def child(scale: float, n_months: int) -> dict:
+    """Runs in the fresh process; returns seconds per phase."""
+    t_start = time.perf_counter()
+    times = {}
+    import app as app_module
+
+    times["import"] = time.perf_counter() - t_start
+
+    t0 = time.perf_counter()
+    sys.path.insert(0, SCRIPTS)
+    from data_layer.normalize import normalize_monthly_datasets
+    from synthetic_kpi import make_monthly_datasets
+
+    monthly = normalize_monthly_datasets(make_monthly_datasets(n_months, scale))
+    first = next(iter(monthly.values()))
+    times["data"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    dash_app = app_module.create_dashboard(first["tab1"], first["tab2"], first["tab3"], monthly)
+    times["create"] = time.perf_counter() - t0
+
+    from dash_client import DashClient
+
+    t0 = time.perf_counter()
+    dash_app.server.test_client().get("/")
+    dash = DashClient(dash_app.server)  # fetches /_dash-layout and /_dash-dependencies
+    times["page"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    client = dash.session()
+    values = {("filter-store", "data"): dash.default("filter-store", "data", {})}
+    values[("tab3-filter-store", "data")] = dash.default("tab3-filter-store", "data", {})
+    for cid in ("t2-x-param", "t2-y-param", "t2-color-dim"):
+        values[(cid, "value")] = dash.default(cid, "value")
+    for output_id in ("graph-q3", "graph-q2", "t2-graph-dynamic", "t3-graph-1"):
+        dash.call(client, output_id, values, "filter-store.data")
+    times["figures"] = time.perf_counter() - t0
+    times["ready"] = time.perf_counter() - t_start - times["data"]
+    return times
+
+
+def run_child(scale: float, n_months: int, workdir: str) -> dict:
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", "--scale", str(scale), "--months", str(n_months)]
+    t0 = time.perf_counter()
+    out = subprocess.run(cmd, cwd=workdir, capture_output=True, text=True, check=True)
+    times = json.loads(out.stdout.strip().splitlines()[-1])
+    # Interpreter start-up and site imports happen before the child's clock starts
+    times["interpreter"] = time.perf_counter() - t0 - sum(v for k, v in times.items() if k != "ready")
+    return times
+
+
+def slowest_imports(n: int, workdir: str) -> list:
+    """[(cumulative seconds, module)] for the slowest top-level imports of `import app`."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=workdir,
+        env={**os.environ, "PYTHONPATH": ROOT},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows, pending = [], []
+    for line in out.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) < 3 or not parts[1].strip().isdigit():
+            continue
+        # Modules are listed after their own imports, indented two spaces per level
+        name = parts[2]
+        indent = len(name) - len(name.lstrip())
+        if indent == 1:
+            if name.strip() == "app":
+                rows = pending
+            pending = []
+        elif indent == 3:
+            pending.append((int(parts[1]) / 1e6, name.strip()))
+    return sorted(rows, reverse=True)[:n]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--months", type=int, default=2)
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="show the N slowest imports")
+    parser.add_argument("--max-seconds", type=float, default=None, help="fail when median ready time exceeds this")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        from loguru import logger
+
+        logger.remove()
+        print(json.dumps(child(args.scale, args.months)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as workdir:
+        runs = [run_child(args.scale, args.months, workdir) for _ in range(args.runs)]
+        imports = slowest_imports(args.importtime, workdir) if args.importtime else []
+
+    print(f"{'phase':<14}{'median s':>10}{'min s':>10}")
+    for phase in ["interpreter"] + PHASES:
+        values = [r[phase] for r in runs]
+        print(f"{phase:<14}{statistics.median(values):>10.3f}{min(values):>10.3f}")
+    if imports:
+        print("\nSlowest imports under `import app` (cumulative):")
+        for seconds, module in imports:
+            print(f"  {seconds:>7.3f}s  {module}")
+
+    ready = statistics.median(r["ready"] for r in runs)
+    if args.max_seconds is not None and ready > args.max_seconds:
+        print(f"\nMedian ready time {ready:.3f}s exceeds {args.max_seconds:.3f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
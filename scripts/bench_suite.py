@@ -0,0 +1,256 @@
+"""Benchmark suite for the data, figure and insight-payload paths, with baseline gating.
+
+Usage:
+    python scripts/bench_suite.py [--scales 1,10,100] [--months 2,24] [--only PATTERN]
+                                  [--repeats 5] [--save | --check] [--tolerance 0.3]
+                                  [--baseline scripts/bench_baseline.json]
+
+Each dataset is generated by scripts/synthetic_kpi.py from csv_files/kpi_*.csv at
+`scale` x the real outlet count for `months` months. Cases per dataset:
+
+    sql/tab1..3        execute_queries with the real sql_queries maps on a SQLite stand-in
+    load/normalize     normalize_monthly_datasets over all months
+    combine/tab1..3    combine_month_frames over all months
+    filter/tab1..3     each tab's get_filtered_frames with a region + category filter
+    figures/tab1, figures/tab3   build_tab1_figures / build_tab3_figures
+    summary/describe   describe_by_column on the combined Tab 2 frame
+    payload/build      PayloadEngine.build for every chart (filtered scope)
+    payload/chart/<id> PayloadEngine.build for that chart alone; with lazy
+                       resolution it only pays for the chart's own tab family
+    prompt/individual  build_prompt_individual on that payload
+
+Medians (ms) are printed per case. `--save` writes them to the baseline file;
+`--check` compares against it and exits 1 when a case is slower than
+baseline * (1 + tolerance) by more than --floor ms. Baselines are only
+comparable on the same machine and library versions (stored under "meta").
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+# Ensure project root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from loguru import logger
+from sqlalchemy import create_engine, event
+
+from synthetic_kpi import load_seed, make_month_table, make_monthly_datasets
+from app_tabs.tab1.figures import build_tab1_figures, get_filtered_frames as t1_filtered
+from app_tabs.tab2.figures import get_filtered_frames as t2_filtered
+from app_tabs.tab3.figures import (
+    build_tab3_figures,
+    clear_profile_cache,
+    get_filtered_frames_simple as t3_filtered,
+)
+from data_layer.base import execute_queries
+from data_layer.normalize import normalize_monthly_datasets
+from data_layer.tab_1 import remap_tab1
+from data_layer.tab_2 import remap_tab2
+from services.payload_engine import PayloadEngine
+from services.prompts import build_prompt_individual
+from services.selection_store import selection_store
+from sql_queries.tab1 import build_first_sql_map
+from sql_queries.tab2 import build_second_sql_map
+from sql_queries.tab3 import build_third_sql_map
+from utils.colors import base_palette, color_map_from_list, tier_color_map
+from utils.dataframe import combine_month_frames
+from utils.df_summary import describe_by_column
+
+DEFAULT_BASELINE = os.path.join(ROOT, "scripts", "bench_baseline.json")
+GRAPHS = ["q1", "q2", "q3", "q4", "q5", "q6", "t2-graph-dyn", "t3-graph-1", "t3-graph-2"]
+T2_VIEW = ("cs_service_pct", "revenue_pct", "outlet_category")
+SQL_MAPS = {
+    "tab1": (build_first_sql_map, remap_tab1),
+    "tab2": (build_second_sql_map, remap_tab2),
+    "tab3": (build_third_sql_map, None),
+}
+
+
+def sqlite_standin(table: pd.DataFrame, workdir: str, name: str = "kpi_april"):
+    """SQLAlchemy engine whose connections see `table` as cr_kpi.<name>."""
+    kpi_db = os.path.join(workdir, "cr_kpi.db")
+    with sqlite3.connect(kpi_db) as conn:
+        table.to_sql(name, conn, index=False, if_exists="replace")
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'main.db')}")
+
+    @event.listens_for(engine, "connect")
+    def _attach(dbapi_conn, _record):
+        dbapi_conn.execute("ATTACH DATABASE ? AS cr_kpi", (kpi_db,))
+
+    return engine
+
+
+def dataset_cases(scale: float, n_months: int, workdir: str) -> dict:
+    """name -> zero-argument callable for one dataset."""
+    raw = make_monthly_datasets(n_months, scale)
+    monthly = normalize_monthly_datasets(raw)
+    months = list(monthly)
+    first = monthly[months[0]]
+    regions = sorted(first["tab1"]["q1"]["rgn"].dropna().astype(str).unique())
+    categories = sorted(first["tab1"]["q1"]["outlet_category"].dropna().astype(str).unique())
+    filters = {"months": months, "regions": regions[:2], "outlet_categories": ["B", "C"]}
+
+    combined = {tab: combine_month_frames(monthly, months, tab) for tab in ("tab1", "tab2", "tab3")}
+    engine = sqlite_standin(make_month_table(load_seed(), scale), workdir)
+    outlet_colors = color_map_from_list(categories)
+    region_colors = color_map_from_list(regions)
+
+    def month_frames(f, tab_key):
+        return combine_month_frames(monthly, list((f or {}).get("months") or months[:1]), tab_key)
+
+    payload_engine = PayloadEngine(month_frames)
+    frames = payload_engine.build([], None, filters).frames
+    selected = {
+        gid: {
+            "full": selection_store.put("bench-suite", gid, "full", frames.chart(gid)),
+            "chart": selection_store.put("bench-suite", gid, "chart", frames.chart(gid)),
+        }
+        for gid in GRAPHS
+    }
+
+    def build_payload():
+        return payload_engine.build(GRAPHS, selected, filters, t2_view=T2_VIEW, filtered_scope=True)
+
+    payload = build_payload().payload
+
+    def tab3_figures():
+        # The radar profile cache would turn every repeat into a lookup
+        clear_profile_cache()
+        return build_tab3_figures(
+            combined["tab3"],
+            filters,
+            outlet_color_map=outlet_colors,
+            tier_colors=tier_color_map(),
+            all_outlet_categories=categories,
+            cache_key="bench",
+        )
+
+    cases = {}
+    for tab, (build_map, remap) in SQL_MAPS.items():
+        sql_map = build_map("kpi_april")
+        cases[f"sql/{tab}"] = lambda m=sql_map, r=remap, t=tab: execute_queries(m, t, r, engine=engine)
+    cases["load/normalize"] = lambda: normalize_monthly_datasets(raw)
+    for tab in ("tab1", "tab2", "tab3"):
+        cases[f"combine/{tab}"] = lambda t=tab: combine_month_frames(monthly, months, t)
+    cases["filter/tab1"] = lambda: t1_filtered(combined["tab1"], filters)
+    cases["filter/tab2"] = lambda: t2_filtered(combined["tab2"], filters)
+    cases["filter/tab3"] = lambda: t3_filtered(combined["tab3"], filters)
+    cases["figures/tab1"] = lambda: build_tab1_figures(
+        combined["tab1"], filters, categories, regions, outlet_colors, region_colors, base_palette, {}
+    )
+    cases["figures/tab3"] = tab3_figures
+    cases["summary/describe"] = lambda: describe_by_column(combined["tab2"]["q1"])
+    cases["payload/build"] = build_payload
+    for gid in GRAPHS:
+        cases[f"payload/chart/{gid}"] = lambda g=gid: payload_engine.build(
+            [g], selected, filters, t2_view=T2_VIEW, filtered_scope=True
+        )
+    cases["prompt/individual"] = lambda: build_prompt_individual(payload)
+    return cases
+
+
+def median_ms(fn, repeats: int, budget_s: float) -> float:
+    fn()  # warm up imports and caches
+    times = []
+    start = time.perf_counter()
+    while len(times) < repeats and (len(times) < 3 or time.perf_counter() - start < budget_s):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def _meta() -> dict:
+    import numpy
+    import plotly
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "pandas": pd.__version__,
+        "numpy": numpy.__version__,
+        "plotly": plotly.__version__,
+        "saved": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1,10,100")
+    parser.add_argument("--months", default="2,24")
+    parser.add_argument("--only", default="*", help="fnmatch pattern on case names, e.g. 'figures/*'")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds per case before stopping at 3 runs")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--save", action="store_true", help="write results to the baseline file")
+    mode.add_argument("--check", action="store_true", help="fail on regressions against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3)
+    parser.add_argument("--floor", type=float, default=2.0, help="ignore slowdowns below this many ms")
+    args = parser.parse_args(argv)
+
+    logger.remove()  # execute_queries logs every query
+    baseline = {}
+    if args.check:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    results, regressions = {}, []
+    print(f"{'case':<40}{'ms':>10}{'baseline':>10}{'ratio':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in [float(s) for s in args.scales.split(",")]:
+            for n_months in [int(m) for m in args.months.split(",")]:
+                label = f"{scale:g}x-{n_months}m"
+                cases = {
+                    name: fn
+                    for name, fn in dataset_cases(scale, n_months, workdir).items()
+                    if fnmatch.fnmatch(name, args.only)
+                }
+                for name, fn in cases.items():
+                    key = f"{name}@{label}"
+                    ms = median_ms(fn, args.repeats, args.budget)
+                    results[key] = round(ms, 3)
+                    base = baseline.get(key)
+                    flag = ""
+                    if base:
+                        ratio = ms / base
+                        if ratio > 1 + args.tolerance and ms - base > args.floor:
+                            regressions.append(key)
+                            flag = "  REGRESSION"
+                        print(f"{key:<40}{ms:>10.2f}{base:>10.2f}{ratio:>8.2f}{flag}")
+                    else:
+                        print(f"{key:<40}{ms:>10.2f}{'-':>10}{'-':>8}")
+
+    if args.save:
+        existing = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                existing = json.load(f).get("results", {})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"meta": _meta(), "results": {**existing, **results}}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nSaved {len(results)} results to {args.baseline}")
+    if args.check:
+        missing = [k for k in results if k not in baseline]
+        if missing:
+            print(f"\n{len(missing)} case(s) have no baseline yet: {', '.join(missing[:5])}")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Minimal Dash callback client for the dev scripts (precompute, load test).
+
+`DashClient` reads the callback map and initial layout from a running
+dashboard, then fires server callbacks through /_dash-update-component the
+way the browser does: in-process through the Flask test client, or over HTTP
+when given a base URL.
+"""
+import json
+
+DASH_UPDATE = "/_dash-update-component"
+
+
+def walk(node):
+    if isinstance(node, dict):
+        yield node
+        for v in (node.get("props") or {}).values():
+            yield from walk(v)
+    elif isinstance(node, list):
+        for v in node:
+            yield from walk(v)
+
+
+def text(node) -> str:
+    children = (node.get("props") or {}).get("children")
+    if isinstance(children, list):
+        return "".join(c for c in children if isinstance(c, str))
+    return children if isinstance(children, str) else ""
+
+
+def pattern_key(cid: dict) -> str:
+    """`values` key for a pattern-matching component id."""
+    return json.dumps(cid, sort_keys=True)
+
+
+def prop_id(cid, prop: str) -> str:
+    """changedPropIds entry as the Dash renderer sends it."""
+    if isinstance(cid, dict):
+        cid = json.dumps(cid, sort_keys=True, separators=(",", ":"))
+    return f"{cid}.{prop}"
+
+
+class _HTTPSession:
+    """requests.Session with the test-client calls DashClient uses."""
+
+    def __init__(self, base_url: str):
+        import requests
+
+        self.base_url = base_url
+        self._session = requests.Session()
+
+    def get(self, path):
+        return _HTTPResponse(self._session.get(self.base_url + path, timeout=60))
+
+    def post(self, path, json=None):
+        return _HTTPResponse(self._session.post(self.base_url + path, json=json, timeout=600))
+
+
+class _HTTPResponse:
+    def __init__(self, r):
+        self.status_code = r.status_code
+        self.data = r.content
+        self._r = r
+
+    def get_json(self):
+        return self._r.json()
+
+
+class DashClient:
+    """Callback map, layout defaults and pattern ids of a dashboard, plus `call`."""
+
+    def __init__(self, target):
+        # target: a Flask server (in-process) or a base URL such as http://127.0.0.1:8050
+        if isinstance(target, str):
+            self.server, self.base_url = None, target.rstrip("/")
+        else:
+            self.server, self.base_url = target, None
+        client = self.session()
+        self.deps = [d for d in client.get("/_dash-dependencies").get_json() if not d.get("clientside_function")]
+        self.defaults = {}
+        self.pattern_ids = []
+        for node in walk(client.get("/_dash-layout").get_json()):
+            props = node.get("props") or {}
+            cid = props.get("id")
+            if isinstance(cid, dict):
+                self.pattern_ids.append(cid)
+            elif isinstance(cid, str):
+                self.defaults[cid] = props
+
+    @property
+    def select_ids(self) -> list:
+        return [i for i in self.pattern_ids if i.get("type") == "select-btn"]
+
+    def session(self):
+        """A new connection: a Flask test client in-process, a requests.Session over HTTP."""
+        if self.server is not None:
+            return self.server.test_client()
+        return _HTTPSession(self.base_url)
+
+    def default(self, cid: str, prop: str, fallback=None):
+        value = self.defaults.get(cid, {}).get(prop)
+        return fallback if value is None else value
+
+    def dep(self, output_id: str, changed: str = None) -> dict:
+        """Server callback writing `output_id` (the one triggered by `changed` if several do)."""
+        matches = []
+        for d in self.deps:
+            ids = [part.rsplit(".", 1)[0] for part in d["output"].strip(".").split("...")]
+            if output_id in ids:
+                matches.append(d)
+        if changed:
+            for d in matches:
+                if any(prop_id(i["id"], i["property"]) == changed for i in d["inputs"]):
+                    return d
+        if not matches:
+            raise KeyError(output_id)
+        return matches[0]
+
+    def body(self, output_id: str, values: dict, changed: str) -> dict:
+        """Request body for one callback; `values` maps (component id, prop) -> value."""
+        dep = self.dep(output_id, changed)
+
+        def fill(specs, with_value=True):
+            out = []
+            for spec in specs:
+                cid, prop = spec["id"], spec["property"]
+                if cid.startswith("{"):
+                    pattern = json.loads(cid)
+                    ids = [i for i in self.pattern_ids if i.get("type") == pattern.get("type")]
+                    out.append(
+                        [
+                            {"id": i, "property": prop, **({"value": i if prop == "id" else values.get((pattern_key(i), prop))} if with_value else {})}
+                            for i in ids
+                        ]
+                    )
+                else:
+                    out.append({"id": cid, "property": prop, **({"value": values.get((cid, prop))} if with_value else {})})
+            return out
+
+        outputs = []
+        for part in dep["output"].strip(".").split("..."):
+            cid, prop = part.rsplit(".", 1)
+            outputs.append({"id": cid, "property": prop})
+        outputs = fill(outputs, with_value=False)
+        return {
+            "output": dep["output"],
+            "outputs": outputs if len(outputs) > 1 else outputs[0],
+            "inputs": fill(dep["inputs"]),
+            "state": fill(dep["state"]),
+            "changedPropIds": [changed],
+        }
+
+    def post(self, client, body: dict):
+        """POST a callback body; returns (status code, response dict, response bytes)."""
+        r = client.post(DASH_UPDATE, json=body)
+        if r.status_code != 200:
+            return r.status_code, {}, len(r.data or b"")
+        return r.status_code, r.get_json().get("response", {}), len(r.data)
+
+    def call(self, client, output_id: str, values: dict, changed: str) -> dict:
+        """Fire one callback and return its response ({} when it did not update)."""
+        status, response, _ = self.post(client, self.body(output_id, values, changed))
+        if status == 204:
+            return {}
+        if status != 200:
+            raise RuntimeError(f"{output_id} callback failed with HTTP {status}")
+        return response
@@ -0,0 +1,148 @@
+"""Peak allocation per callback data path: a baseline revision vs the current tree.
+
+Usage:
+    python scripts/dev_profile_callback_memory.py [--scale 20] [--months 2] [--baseline REV]
+
+Runs the data work behind update_graphs (tab 1), update_tab2_dynamic_scatter
+and update_tab3_figures on synthetic month tables and prints tracemalloc
+peaks. With `--baseline REV` (e.g. the commit before the copy-on-write
+change) the same paths also run from `git archive REV`, with the defensive
+copies that revision had and the pandas options its app module sets at
+import, so the table shows what the change saved. Both sides get identical input frames; each runs in its own
+process so imports from one tree never leak into the other.
+"""
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+
+# Ensure project root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+
+FILTERS = [
+    {},
+    {"regions": ["NORTHERN", "SOUTHERN"], "outlet_categories": ["B", "C"]},
+    {"outlet_types": ["3S"], "search_text": "a"},
+]
+
+
+def _paths(monthly: dict, months: list) -> dict:
+    from app_tabs.tab1.figures import get_filtered_frames as t1_filtered
+    from app_tabs.tab2.figures import get_filtered_frames as t2_filtered
+    from app_tabs.tab3.figures import get_filtered_frames_simple as t3_filtered
+    from utils.dataframe import combine_month_frames
+
+    def tab1():
+        data = combine_month_frames(monthly, months, "tab1")
+        for f in FILTERS:
+            t1_filtered(data, f)
+
+    def tab2():
+        data = combine_month_frames(monthly, months, "tab2")
+        for f in FILTERS:
+            t2_filtered(data, f)
+
+    def tab3():
+        data = combine_month_frames(monthly, months, "tab3")
+        for f in FILTERS:
+            t3_filtered(data, f)
+
+    return {"update_graphs (tab1)": tab1, "tab2 scatter": tab2, "tab3 figures": tab3}
+
+
+def _peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def child(root: str, data_path: str) -> dict:
+    """Runs in a fresh process with `root` first on sys.path.
+
+    Returns {"copy_on_write": bool, "peaks": {path: peak MB}}.
+    """
+    sys.path.insert(0, root)
+    import pandas as pd
+
+    # Import that tree's app first so pandas options (copy-on-write) are
+    # whatever the dashboard of that revision runs with
+    import app  # noqa: F401
+
+    with open(data_path, "rb") as fh:
+        monthly = pickle.load(fh)
+    peaks = {}
+    for name, fn in _paths(monthly, list(monthly)).items():
+        fn()  # warm caches/imports outside the measurement
+        peaks[name] = _peak_mb(fn)
+    return {"copy_on_write": bool(pd.get_option("mode.copy_on_write")), "peaks": peaks}
+
+
+def run_tree(root: str, data_path: str) -> dict:
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", root, "--data", data_path]
+    out = subprocess.run(cmd, cwd=root, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def export_revision(rev: str, dest: str) -> str:
+    archive = os.path.join(dest, "tree.tar")
+    subprocess.run(["git", "archive", "-o", archive, rev], cwd=ROOT, check=True)
+    tree = os.path.join(dest, "tree")
+    with tarfile.open(archive) as tar:
+        tar.extractall(tree)
+    return tree
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=20)
+    parser.add_argument("--months", type=int, default=2)
+    parser.add_argument("--baseline", metavar="REV", help="git revision to compare against")
+    parser.add_argument("--child", metavar="ROOT", help=argparse.SUPPRESS)
+    parser.add_argument("--data", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        from loguru import logger
+
+        logger.remove()
+        print(json.dumps(child(args.child, args.data)))
+        return 0
+
+    sys.path.insert(0, ROOT)
+    sys.path.insert(0, SCRIPTS)
+    from data_layer.normalize import normalize_monthly_datasets
+    from synthetic_kpi import make_monthly_datasets
+
+    with tempfile.TemporaryDirectory() as workdir:
+        data_path = os.path.join(workdir, "monthly.pkl")
+        with open(data_path, "wb") as fh:
+            pickle.dump(normalize_monthly_datasets(make_monthly_datasets(args.months, args.scale)), fh)
+        current = run_tree(ROOT, data_path)
+        baseline = run_tree(export_revision(args.baseline, workdir), data_path) if args.baseline else None
+
+    print(f"scale={args.scale} months={args.months} copy_on_write={current['copy_on_write']}")
+    if baseline is None:
+        print(f"{'path':<24}{'peak MB':>12}")
+        for name, mb in current["peaks"].items():
+            print(f"{name:<24}{mb:>12.2f}")
+        return 0
+    print(f"baseline={args.baseline} copy_on_write={baseline['copy_on_write']}")
+    print(f"{'path':<24}{'baseline MB':>12}{'current MB':>12}{'change':>9}")
+    for name, mb in current["peaks"].items():
+        base = baseline["peaks"].get(name)
+        change = f"{(mb - base) / base:+.0%}" if base else "n/a"
+        print(f"{name:<24}{base if base is not None else float('nan'):>12.2f}{mb:>12.2f}{change:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+"""Headless load test: concurrent simulated users replaying dashboard callbacks.
+
+Usage:
+    python scripts/load_test.py [--users 8] [--steps 25 | --duration 60] [--think 0.5]
+        [--ramp 2] [--scale 1] [--months 2] [--llm-latency 1.5] [--seed 0]
+        [--url http://127.0.0.1:8050 [--pid PID ...]] [--json PATH]
+
+Each user gets a session id and the initial figures, then performs `--steps`
+weighted random actions with exponential think time in between: slicer
+clicks (region/category/outlet type), month toggles, "Select this graph",
+"View table" toggles and Generate (followed by a clear now and then). Every
+action is sent to /_dash-update-component exactly as the browser would:
+filter-store is computed clientside, so a slicer or month change fires each
+server callback that listens to it.
+
+Without --url the dashboard runs in-process on synthetic data
+(scripts/synthetic_kpi.py, `--scale` x the real outlet count, `--months`
+months) with a fake LLM that sleeps `--llm-latency` seconds per call; users
+are threads sharing the app like a threaded worker does. The usage ledger and
+prompt log are disabled so fake calls leave no records. With --url the same
+sequences go to a running server over HTTP; pass the worker pids with --pid to
+sample their memory.
+
+Prints requests, errors, p50/p95/p99/max latency (ms) and mean response size
+per callback, overall throughput, and RSS at start/peak/end per worker.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+# Ensure project root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dash_client import DashClient, pattern_key, prop_id
+
+FILTER_FIGURES = ["graph-q3", "graph-q2", "t2-graph-dynamic", "t3-graph-1"]
+SLICERS = {
+    "regions": "region-filter",
+    "outlet_categories": "outlet-category-filter",
+    "outlet_types": "outlet-type-filter",
+}
+ACTIONS = {"slicer": 30, "month": 10, "select": 25, "view": 20, "generate": 15}
+
+
+def percentile(values, q: float) -> float:
+    """Nearest-rank percentile of `values` (0 < q <= 100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered), max(1, math.ceil(q / 100 * len(ordered)))) - 1]
+
+
+def read_rss(pid="self") -> dict:
+    """{"rss", "hwm"} in MiB from /proc (empty where /proc is unavailable)."""
+    out = {}
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    out[line[2:5].lower()] = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return out
+
+
+class MemorySampler(threading.Thread):
+    """Samples VmRSS of each worker every `interval` seconds."""
+
+    def __init__(self, pids, interval: float = 0.5):
+        super().__init__(daemon=True)
+        self.pids = list(pids)
+        self.interval = interval
+        self.samples = {pid: [] for pid in self.pids}
+        self._done = threading.Event()
+
+    def sample(self):
+        for pid in self.pids:
+            rss = read_rss(pid).get("rss")
+            if rss is not None:
+                self.samples[pid].append(rss)
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.sample()
+
+
+class Stats:
+    """Per-callback latencies, errors and response sizes across users."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.bytes = defaultdict(int)
+        self.actions = defaultdict(int)
+
+    def add(self, label: str, ms: float, nbytes: int, ok: bool):
+        with self._lock:
+            self.latency[label].append(ms)
+            self.bytes[label] += nbytes
+            if not ok:
+                self.errors[label] += 1
+
+    def action(self, name: str):
+        with self._lock:
+            self.actions[name] += 1
+
+    def table(self) -> list:
+        rows = []
+        for label in sorted(self.latency, key=lambda k: -percentile(self.latency[k], 95)):
+            ms = self.latency[label]
+            rows.append(
+                {
+                    "callback": label,
+                    "requests": len(ms),
+                    "errors": self.errors[label],
+                    "p50_ms": round(percentile(ms, 50), 1),
+                    "p95_ms": round(percentile(ms, 95), 1),
+                    "p99_ms": round(percentile(ms, 99), 1),
+                    "max_ms": round(max(ms), 1),
+                    "avg_kb": round(self.bytes[label] / len(ms) / 1024, 1),
+                }
+            )
+        return rows
+
+
+class VirtualUser:
+    """One browser session: its own client, filters, selection and table toggles."""
+
+    def __init__(self, dash: DashClient, stats: Stats, rng: random.Random, think: float):
+        self.dash = dash
+        self.stats = stats
+        self.rng = rng
+        self.think = think
+        self.client = dash.session()
+        self.values = {
+            (cid, prop): value
+            for cid, props in dash.defaults.items()
+            for prop, value in props.items()
+            if prop not in ("children", "style", "className")
+        }
+        self.filters = dict(dash.default("filter-store", "data", {}))
+        self.filters["months"] = list(dash.default("month-filter", "value", []) or self.filters.get("months") or [])
+        self.options = {
+            key: [o["value"] for o in dash.default(cid, "options", []) if isinstance(o, dict)]
+            for key, cid in {**SLICERS, "months": "month-filter"}.items()
+        }
+        self.view_buttons = [cid for cid in dash.defaults if cid.startswith("btn-view-")]
+        self.values[("selected-graphs", "data")] = self.values.get(("selected-graphs", "data")) or []
+        self.values[("selected-data", "data")] = self.values.get(("selected-data", "data")) or {}
+
+    def fire(self, output_id: str, changed: str) -> dict:
+        body = self.dash.body(output_id, self.values, changed)
+        t0 = time.perf_counter()
+        try:
+            status, response, nbytes = self.dash.post(self.client, body)
+        except Exception:
+            status, response, nbytes = 0, {}, 0
+        ms = (time.perf_counter() - t0) * 1000
+        self.stats.add(output_id, ms, nbytes, status in (200, 204))
+        for cid, props in response.items():
+            for prop, value in props.items():
+                self.values[(pattern_key(json.loads(cid)) if cid.startswith("{") else cid, prop)] = value
+        return response
+
+    def refresh(self):
+        """Server callbacks the browser fires when filter-store changes."""
+        self.values[("filter-store", "data")] = dict(self.filters)
+        for output_id in FILTER_FIGURES:
+            self.fire(output_id, "filter-store.data")
+
+    def start(self):
+        self.values[("session-id", "data")] = None
+        self.fire("session-id", "session-id.data")
+        self.refresh()
+
+    def step(self):
+        action = self.rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+        if action == "generate" and not self.values[("selected-graphs", "data")]:
+            action = "select"
+        self.stats.action(action)
+        getattr(self, f"do_{action}")()
+
+    def _toggle(self, key: str, keep_one: bool = False):
+        options = self.options.get(key) or []
+        if not options:
+            return False
+        current = list(self.filters.get(key) or [])
+        value = self.rng.choice(options)
+        if value in current:
+            if keep_one and len(current) == 1:
+                return False
+            current.remove(value)
+        else:
+            current.append(value)
+        self.filters[key] = current
+        return True
+
+    def do_slicer(self):
+        if self._toggle(self.rng.choice(list(SLICERS))):
+            self.refresh()
+
+    def do_month(self):
+        if self._toggle("months", keep_one=True):
+            self.refresh()
+
+    def do_select(self):
+        ids = self.dash.select_ids
+        if not ids:
+            return
+        bid = self.rng.choice(ids)
+        key = (pattern_key(bid), "n_clicks")
+        self.values[key] = (self.values.get(key) or 0) + 1
+        self.fire("selected-graphs", prop_id(bid, "n_clicks"))
+
+    def do_view(self):
+        if not self.view_buttons:
+            return
+        cid = self.rng.choice(self.view_buttons)
+        self.values[(cid, "n_clicks")] = (self.values.get((cid, "n_clicks")) or 0) + 1
+        output_id = "table-" + cid[len("btn-view-"):]
+        if cid == "btn-view-t3-1-new":
+            output_id = "table-t3-1"
+        self.fire(output_id, f"{cid}.n_clicks")
+
+    def do_generate(self):
+        self.values[("generate-button", "n_clicks")] = (self.values.get(("generate-button", "n_clicks")) or 0) + 1
+        self.fire("generate-output", "generate-button.n_clicks")
+        if self.rng.random() < 0.5:
+            self.values[("clear-selection", "n_clicks")] = (self.values.get(("clear-selection", "n_clicks")) or 0) + 1
+            self.fire("selected-graphs", "clear-selection.n_clicks")
+
+    def run(self, steps: int, deadline: float):
+        self.start()
+        for _ in range(steps):
+            if time.time() >= deadline:
+                break
+            if self.think > 0:
+                time.sleep(self.rng.expovariate(1 / self.think))
+            self.step()
+
+
+def fake_llm(latency: float):
+    """Point services.llm at a fake client that sleeps `latency` seconds per call."""
+    import services.llm as llm
+
+    def generate(prompt, model, key):
+        time.sleep(latency)
+        usage = SimpleNamespace(prompt_token_count=len(prompt) // 4, candidates_token_count=300, total_token_count=None)
+        return f"#### Load test\n\n- Prompt of {len(prompt)} characters.\n- Fake response.", None, usage
+
+    llm.llm_configured = lambda api_key=None: True
+    llm._generate = generate
+
+
+def in_process_dashboard(scale: float, n_months: int, llm_latency: float) -> DashClient:
+    os.environ.setdefault("USAGE_LEDGER_ENABLED", "0")
+    os.environ.setdefault("PROMPT_LOG_ENABLED", "0")
+    from loguru import logger
+
+    import app as app_module
+    from data_layer.normalize import normalize_monthly_datasets
+    from synthetic_kpi import make_monthly_datasets
+
+    monthly = normalize_monthly_datasets(make_monthly_datasets(n_months, scale))
+    first = next(iter(monthly.values()))
+    dash_app = app_module.create_dashboard(first["tab1"], first["tab2"], first["tab3"], monthly)
+    fake_llm(llm_latency)
+    logger.remove()  # per-request logging would be part of the measurement
+    return DashClient(dash_app.server)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--steps", type=int, default=25, help="actions per user")
+    parser.add_argument("--duration", type=float, default=None, help="stop after this many seconds")
+    parser.add_argument("--think", type=float, default=0.5, help="mean seconds between a user's actions")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which users start")
+    parser.add_argument("--scale", type=float, default=1.0, help="synthetic outlet count multiplier")
+    parser.add_argument("--months", type=int, default=2, help="synthetic months")
+    parser.add_argument("--llm-latency", type=float, default=1.5, help="fake LLM seconds per call")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", default=None, help="load a running server instead of an in-process app")
+    parser.add_argument("--pid", type=int, action="append", default=[], help="server worker pid to sample (repeatable)")
+    parser.add_argument("--json", default=None, help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        dash = DashClient(args.url)
+        pids = args.pid
+    else:
+        dash = in_process_dashboard(args.scale, args.months, args.llm_latency)
+        pids = ["self"]
+    sampler = MemorySampler(pids)
+    sampler.sample()
+    sampler.start()
+
+    stats = Stats()
+    rng = random.Random(args.seed)
+    deadline = time.time() + args.duration if args.duration else float("inf")
+    steps = args.steps if not args.duration else sys.maxsize
+    users = [VirtualUser(dash, stats, random.Random(rng.random()), args.think) for _ in range(args.users)]
+
+    def run_user(i, user):
+        time.sleep(args.ramp * i / max(1, args.users))
+        user.run(steps, deadline)
+
+    threads = [threading.Thread(target=run_user, args=(i, u), daemon=True) for i, u in enumerate(users)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    sampler.stop()
+
+    rows = stats.table()
+    total = sum(r["requests"] for r in rows)
+    errors = sum(r["errors"] for r in rows)
+    print(f"{'callback':<20}{'req':>6}{'err':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'avg KB':>9}")
+    for r in rows:
+        print(
+            f"{r['callback']:<20}{r['requests']:>6}{r['errors']:>5}{r['p50_ms']:>9.1f}"
+            f"{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}{r['avg_kb']:>9.1f}"
+        )
+    print(
+        f"\n{args.users} users, {sum(stats.actions.values())} actions "
+        f"({', '.join(f'{k} {v}' for k, v in sorted(stats.actions.items()))}) in {elapsed:.1f}s"
+    )
+    print(f"Throughput: {total / elapsed:.1f} callbacks/s, {errors} errors")
+
+    memory = {}
+    for pid, samples in sampler.samples.items():
+        if not samples:
+            print(f"Worker {pid}: no memory samples (/proc unavailable)")
+            continue
+        memory[str(pid)] = {
+            "start_mib": round(samples[0], 1),
+            "peak_mib": round(max(samples), 1),
+            "end_mib": round(samples[-1], 1),
+            "growth_mib": round(samples[-1] - samples[0], 1),
+        }
+        m = memory[str(pid)]
+        print(f"Worker {pid}: RSS {m['start_mib']} -> {m['end_mib']} MiB (peak {m['peak_mib']}, growth {m['growth_mib']:+})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "args": vars(args),
+                    "elapsed_s": round(elapsed, 2),
+                    "throughput_rps": round(total / elapsed, 2),
+                    "actions": dict(stats.actions),
+                    "callbacks": rows,
+                    "memory": memory,
+                },
+                f,
+                indent=2,
+            )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""Precompute monthly insight reports so the dashboard can serve them instantly.
+
+Usage:
+    python scripts/precompute_reports.py [--months DATA_MONTHS] [--sets sets.json]
+        [--workers 4] [--force] [--out DIR] [--synthetic SCALE]
+
+For every month and report set the dashboard's own "Select this graph" and
+"Generate" callbacks are run against an in-process app (through the Dash
+callback endpoint), so payloads, prompts and post-processing are exactly
+those of an interactive report. LLM calls run `--workers` at a time. Each
+successful report is stored under PRECOMPUTED_REPORTS_DIR with provenance
+(model, time, fingerprint of its month, request); generate_report answers
+matching requests from there until that month's data changes.
+
+A sets file is a JSON list of objects:
+    {"name": "overview", "graphs": ["q1", "q3"], "mode": "individual",
+     "scope": "full" | "filtered", "filters": {...}, "tab3_local": {...},
+     "t2_view": [x, y, color]}
+Only "graphs" is required; filters are merged over the dashboard defaults and
+"months" is set per run. Without --sets every chart gets its own report.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+# Ensure project root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dash_client import DashClient, pattern_key, prop_id, text, walk
+from config.settings import DATA_MONTHS, MODEL_NAME, PRECOMPUTED_REPORTS_DIR
+from services.llm import llm_configured
+from services.report_store import delete_report, load_report, report_key, save_report
+from utils.data import months_fingerprint
+
+
+def load_months(months, synthetic_scale=None) -> dict:
+    from data_layer.loader import load_monthly_datasets
+    from data_layer.normalize import normalize_monthly_datasets
+
+    if synthetic_scale is not None:
+        from synthetic_kpi import make_monthly_datasets
+
+        data = make_monthly_datasets(len(months), synthetic_scale)
+        return normalize_monthly_datasets(dict(zip(months, data.values())))
+    return load_monthly_datasets(months)
+
+
+class Dashboard(DashClient):
+    """Runs dashboard callbacks in-process through the Dash callback endpoint."""
+
+    def __init__(self, monthly: dict):
+        import app as app_module
+
+        first = next(iter(monthly.values()))
+        self.app = app_module.create_dashboard(first["tab1"], first["tab2"], first["tab3"], monthly)
+        super().__init__(self.app.server)
+
+    def run(self, graphs, filters, tab3_local, mode, filtered_scope, t2_view):
+        """Select `graphs` and generate; returns the rendered generate-output tree."""
+        client = self.session()
+        x, y, color = t2_view
+        values = {
+            ("filter-store", "data"): filters,
+            ("tab3-filter-store", "data"): tab3_local,
+            ("t2-x-param", "value"): x,
+            ("t2-y-param", "value"): y,
+            ("t2-color-dim", "value"): color,
+            ("session-id", "data"): f"precompute-{uuid.uuid4().hex}",
+            ("insight-mode-radio", "value"): mode,
+            ("insight-data-scope-toggle", "value"): ["filtered"] if filtered_scope else [],
+            ("selected-graphs", "data"): [],
+            ("selected-data", "data"): {},
+        }
+        for gid in graphs:
+            bid = {"graph": gid, "type": "select-btn"}
+            values[(pattern_key(bid), "n_clicks")] = 1
+            resp = self.call(client, "selected-graphs", values, prop_id(bid, "n_clicks"))
+            values[("selected-graphs", "data")] = resp["selected-graphs"]["data"]
+            values[("selected-data", "data")] = resp["selected-data"]["data"]
+        values[("generate-button", "n_clicks")] = 1
+        resp = self.call(client, "generate-output", values, "generate-button.n_clicks")
+        return resp.get("generate-output", {}).get("children")
+
+
+def sections_from_output(tree) -> list:
+    """[{"title", "markdown"}] from generate_report output; raises on error output."""
+    sections, title = [], ""
+    for node in walk(tree):
+        kind = node.get("type")
+        if kind in ("H4", "H5"):
+            title = text(node)
+            if title.startswith("Error") or title.startswith("No charts"):
+                raise RuntimeError(title)
+        elif kind == "P" and title.startswith("Error"):
+            raise RuntimeError(text(node))
+        elif kind == "Markdown":
+            sections.append({"title": title, "markdown": text(node)})
+    if not sections:
+        raise RuntimeError("no report content returned")
+    return sections
+
+
+def default_sets(dash: Dashboard) -> list:
+    return [{"name": i["graph"], "graphs": [i["graph"]]} for i in dash.select_ids]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--months",
+        default=",".join(DATA_MONTHS),
+        help="comma-separated month labels (tables kpi_<month>; defaults to DATA_MONTHS)",
+    )
+    parser.add_argument("--sets", help="JSON file with report sets (default: one report per chart)")
+    parser.add_argument("--workers", type=int, default=4, help="reports generated in parallel")
+    parser.add_argument("--force", action="store_true", help="regenerate reports that already exist")
+    parser.add_argument("--out", default=PRECOMPUTED_REPORTS_DIR, help="report directory")
+    parser.add_argument("--synthetic", type=float, metavar="SCALE", help="use synthetic data instead of the database")
+    args = parser.parse_args()
+
+    if not llm_configured():
+        # generate_report would render the "LLM not configured" hint as a report
+        print("LLM not configured: install google-genai and set GOOGLE_API_KEY")
+        return 2
+    months = [m for m in args.months.split(",") if m]
+    monthly = load_months(months, args.synthetic)
+    fingerprints: dict = {}
+    dash = Dashboard(monthly)
+    if args.sets:
+        with open(args.sets, encoding="utf-8") as fh:
+            sets = json.load(fh)
+    else:
+        sets = default_sets(dash)
+
+    base_filters = dash.defaults.get("filter-store", {}).get("data") or {}
+    base_local = dash.defaults.get("tab3-filter-store", {}).get("data") or {}
+    base_view = [dash.defaults.get(c, {}).get("value") for c in ("t2-x-param", "t2-y-param", "t2-color-dim")]
+    base_mode = dash.defaults.get("insight-mode-radio", {}).get("value") or "individual"
+    base_scope = dash.defaults.get("insight-data-scope-toggle", {}).get("value") or []
+
+    jobs = {}
+    for month in months:
+        for spec in sets:
+            filters = {**base_filters, **(spec.get("filters") or {}), "months": [month]}
+            local = {**base_local, **(spec.get("tab3_local") or {})}
+            mode = spec.get("mode") or base_mode
+            scope = spec["scope"] == "filtered" if "scope" in spec else "filtered" in base_scope
+            view = list(spec.get("t2_view") or base_view)
+            data_version = months_fingerprint(monthly, filters["months"], fingerprints)
+            key = report_key(spec["graphs"], filters, local, mode, scope, view, data_version)
+            if key in jobs:
+                continue
+            if load_report(args.out, key) is not None:
+                if not args.force:
+                    print(f"skip  {month:<8} {spec.get('name', '')} (exists)")
+                    continue
+                delete_report(args.out, key)
+            jobs[key] = (month, spec, filters, local, mode, scope, view, data_version)
+
+    def work(key, job):
+        month, spec, filters, local, mode, scope, view, data_version = job
+        t0 = time.perf_counter()
+        sections = sections_from_output(dash.run(spec["graphs"], filters, local, mode, scope, view))
+        provenance = {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "generator": "scripts/precompute_reports.py",
+            "model": MODEL_NAME,
+            "provider": "gemini",
+            "data_version": data_version,
+            "month": month,
+            "set": spec.get("name", ""),
+            "graphs": spec["graphs"],
+            "filters": filters,
+            "tab3_local": local,
+            "mode": mode,
+            "scope": "filtered" if scope else "full",
+            "t2_view": view,
+            "elapsed_s": round(time.perf_counter() - t0, 2),
+        }
+        return save_report(args.out, key, sections, provenance)
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = {pool.submit(work, key, job): job for key, job in jobs.items()}
+        for fut in as_completed(futures):
+            month, spec = futures[fut][:2]
+            try:
+                print(f"ok    {month:<8} {spec.get('name', '')} -> {fut.result()}")
+            except Exception as e:
+                failed += 1
+                print(f"FAIL  {month:<8} {spec.get('name', '')}: {e}")
+    versions = ", ".join(f"{m} {fp}" for m, fp in fingerprints.items())
+    print(f"{len(jobs) - failed} written, {failed} failed, data versions: {versions}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Synthetic KPI month tables scaled from csv_files/kpi_*.csv.
+
+The CSV exports carry the real region/outlet-type/category mix and KPI value
+ranges; this module resamples them to any outlet count and month count and
+derives the per-tab result dicts (same keys as data_layer.get_tabN_results) so
+dev scripts can exercise the pipeline without a database.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(__file__))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from app_tabs.tab3.figures import KPI_DISPLAY, RADAR_ALIASES, SALES_KPIS, SERVICE_KPIS
+from data_layer.tab_1 import remap_tab1
+from data_layer.tab_2 import remap_tab2
+
+KPI_COLUMNS = [k for k, _ in KPI_DISPLAY]
+MONTH_LABELS = [
+    "january", "february", "march", "april", "May", "june",
+    "july", "august", "september", "october", "november", "december",
+]
+
+
+def load_seed(csv_dir: str = os.path.join(ROOT, "csv_files")) -> pd.DataFrame:
+    """Read the headerless KPI exports into rgn/sales_outlet/outlet_type/outlet_category + KPI pool."""
+    frames = []
+    for name in sorted(os.listdir(csv_dir)):
+        if not name.endswith(".csv"):
+            continue
+        raw = pd.read_csv(os.path.join(csv_dir, name), header=None)
+        cat_col = next(
+            c for c in raw.columns[-4:] if raw[c].astype(str).isin(list("ABCD")).all()
+        )
+        pct = raw.loc[:, 9:26].drop(columns=[16]).apply(pd.to_numeric, errors="coerce")
+        frames.append(
+            pd.DataFrame(
+                {
+                    "rgn": raw[1],
+                    "sales_outlet": raw[3],
+                    "outlet_type": raw[7],
+                    "outlet_category": raw[cat_col],
+                    "pct_pool": list(pct.to_numpy()),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def make_month_table(seed: pd.DataFrame, scale: float = 1, rng=None) -> pd.DataFrame:
+    """One outlet-level month table (the cr_kpi.kpi_<month> columns) with ~len(seed)/2*scale rows."""
+    rng = rng if rng is not None else np.random.default_rng(0)
+    outlets = seed.drop_duplicates("sales_outlet").reset_index(drop=True)
+    n = max(1, int(round(len(outlets) * scale)))
+    idx = rng.integers(0, len(outlets), n)
+    base = outlets.iloc[idx].reset_index(drop=True)
+    suffix = (np.arange(n) // len(outlets)).astype(str)
+    names = np.where(suffix == "0", base["sales_outlet"], base["sales_outlet"] + " #" + suffix)
+    pool = np.concatenate([p[np.isfinite(p)] for p in seed["pct_pool"]])
+
+    df = pd.DataFrame(
+        {
+            "rgn": base["rgn"].to_numpy(),
+            "outlet_category": base["outlet_category"].to_numpy(),
+            "outlet_type": base["outlet_type"].to_numpy(),
+            "sales_outlet": names,
+        }
+    )
+    for col in KPI_COLUMNS:
+        df[col] = rng.choice(pool, n).round(2)
+    df.loc[rng.random(n) < 0.02, "ins_renew_overall_pct"] = np.nan
+    df["rate_performance"] = rng.uniform(20, 100, n).round(2)
+    df["rate_quality"] = rng.uniform(10, 60, n).round(2)
+    df["total_score"] = (df["rate_performance"] + df["rate_quality"]).round(2)
+    df["rank_nationwide"] = df["total_score"].rank(ascending=False, method="first").astype(int)
+    df["rank_region"] = (
+        df.groupby("rgn")["total_score"].rank(ascending=False, method="first").astype(int)
+    )
+    return df
+
+
+def _radar(table: pd.DataFrame, by: list[str]) -> pd.DataFrame:
+    t = table.copy()
+    t.loc[t["outlet_type"] == "2S", list(SALES_KPIS)] = 0
+    t.loc[t["outlet_type"] == "1S", list(SERVICE_KPIS)] = 0
+    out = t.groupby(by)[list(RADAR_ALIASES)].mean().reset_index()
+    return out.rename(columns=RADAR_ALIASES)
+
+
+def tab_results(table: pd.DataFrame) -> tuple[dict, dict, dict]:
+    """Derive (tab1, tab2, tab3) result dicts from a month table, mirroring sql_queries."""
+    t1_q1 = table.dropna(
+        subset=["rgn", "outlet_category", "rate_performance", "rate_quality"]
+    )[["rgn", "outlet_category", "sales_outlet", "rate_performance", "rate_quality", "total_score"]]
+    counts = table.groupby(["rgn", "outlet_category"]).size().reset_index(name="outlet_count")
+    counts["percentage"] = (
+        counts["outlet_count"] * 100.0 / counts.groupby("rgn")["outlet_count"].transform("sum")
+    ).round(2)
+    tab1 = remap_tab1(
+        {
+            "scatter-plot-q1": t1_q1,
+            "bar-chart-q2": table.groupby("outlet_category").size().reset_index(name="outlet_count"),
+            "stack-bar-chart-q3": counts,
+        }
+    )
+
+    tab2 = remap_tab2(
+        {"dynamic-scatter-plot": table[["sales_outlet", "rgn", "outlet_category", "outlet_type"] + KPI_COLUMNS]}
+    )
+
+    bcd = table[table["outlet_category"].isin(["B", "C", "D"])]
+    gaps = (bcd.groupby("outlet_category")[KPI_COLUMNS].mean() - 100).reset_index()
+    gaps = gaps.melt(id_vars="outlet_category", var_name="kpi", value_name="gap_value")
+    gaps["kpi"] = gaps["kpi"].map(dict(KPI_DISPLAY))
+    tab3 = {
+        "q1": bcd.drop(columns=["rank_nationwide", "rank_region"]).reset_index(drop=True),
+        "q2": gaps,
+        "radar-chart-before-filtering-q2": _radar(table, ["outlet_type"]),
+        "radar-chart-after-filtering-q3": _radar(table, ["outlet_type", "outlet_category"]),
+    }
+    return tab1, tab2, tab3
+
+
+def make_monthly_datasets(n_months: int = 2, scale: float = 1, seed: int = 0) -> dict:
+    """{month_label: {"tab1": ..., "tab2": ..., "tab3": ...}} for `n_months` synthetic months."""
+    rng = np.random.default_rng(seed)
+    src = load_seed()
+    out = {}
+    for i in range(n_months):
+        label = MONTH_LABELS[(3 + i) % 12] + ("" if i < 12 else f"_{i // 12}")
+        t1, t2, t3 = tab_results(make_month_table(src, scale, rng))
+        out[label] = {"tab1": t1, "tab2": t2, "tab3": t3}
+    return out
@@ -0,0 +1,67 @@
+"""Summarize the LLM usage ledger (services.usage_ledger).
+
+Usage: python scripts/usage_report.py [--by graph_id,stage] [--days 7]
+                                      [--session ID] [--model NAME] [--calls N] [--csv PATH]
+
+Prints prompt/candidate tokens, cost and latency per group (largest prompt
+volume first) so the charts and stages that drive prompt size stand out;
+`--calls N` lists the N most recent calls instead. The same per-chart totals
+are available to any SQLite client as the `usage_by_graph` view.
+"""
+import argparse
+import os
+import sys
+import time
+
+# Ensure project root is on sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pandas as pd
+
+from config.settings import USAGE_LEDGER_PATH
+from services.usage_ledger import SUMMARY_KEYS, UsageLedger
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--by", default="graph_id", help=f"comma-separated keys from {', '.join(SUMMARY_KEYS)}")
+    parser.add_argument("--days", type=float, default=None, help="only calls from the last N days")
+    parser.add_argument("--session", default=None)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--graph", default=None, help="only calls attributed to this graph id")
+    parser.add_argument("--calls", type=int, default=0, help="list the N most recent calls")
+    parser.add_argument("--csv", default=None, help="also write the table to this CSV file")
+    parser.add_argument("--db", default=USAGE_LEDGER_PATH)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"No usage ledger at {args.db}", file=sys.stderr)
+        return 1
+    ledger = UsageLedger(args.db)
+    filters = {
+        "since": time.time() - args.days * 86400 if args.days else None,
+        "session": args.session,
+        "model": args.model,
+        "graph_id": args.graph,
+    }
+    try:
+        if args.calls:
+            table = ledger.query(limit=args.calls, **filters).drop(columns=["id"])
+        else:
+            table = ledger.summary([k.strip() for k in args.by.split(",") if k.strip()], **filters)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.csv:
+        table.to_csv(args.csv, index=False)
+    with pd.option_context("display.max_rows", 200, "display.width", 200, "display.max_columns", None):
+        print(table.to_string(index=False) if not table.empty else "No calls recorded.")
+    if not args.calls and not table.empty:
+        print(f"\nTotal: {int(table['calls'].sum())} calls, ${table['cost_usd'].sum():.4f}"
+              + (" (calls spanning several charts count once per chart)" if "graph_id" in args.by else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import cache_event
+
+# Pairwise statistics for every KPI pair of one filter state, computed together
+# so switching the Tab 2 axes (or building LLM payloads) is a lookup.
+_CACHE: "OrderedDict[str, CorrelationStats]" = OrderedDict()
+_CACHE_SIZE = 64
+_LOCK = threading.Lock()
+
+
+class CorrelationStats:
+    """Pearson/Spearman matrices, pair counts and OLS lines for a set of columns.
+
+    All statistics use pairwise-complete rows, like DataFrame.corr. Entry
+    [i, j] of slope/intercept is the least-squares line of column j on column i.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Sequence[str]):
+        self.columns: List[str] = [c for c in columns if c in df.columns]
+        self._pos = {c: i for i, c in enumerate(self.columns)}
+        x = (
+            df[self.columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+            if self.columns
+            else np.empty((len(df), 0))
+        )
+        self.n, self.pearson, self.slope, self.intercept = _pairwise_ols(x)
+        self.spearman = _spearman(x, self.n)
+
+    def pair(self, x: str, y: str) -> Optional[Dict]:
+        """Stats for y against x, or None when either column is unknown."""
+        i, j = self._pos.get(x), self._pos.get(y)
+        if i is None or j is None:
+            return None
+        return {
+            "x": x,
+            "y": y,
+            "n": int(self.n[i, j]),
+            "pearson_r": _num(self.pearson[i, j]),
+            "spearman_rho": _num(self.spearman[i, j]),
+            "slope": _num(self.slope[i, j]),
+            "intercept": _num(self.intercept[i, j]),
+        }
+
+    def matrix(self, method: str = "pearson") -> pd.DataFrame:
+        values = self.spearman if method == "spearman" else self.pearson
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def top_pairs(self, k: int = 5, min_n: int = 3) -> List[Dict]:
+        """The k pairs with the largest |Pearson r| (each unordered pair once)."""
+        iu, ju = np.triu_indices(len(self.columns), k=1)
+        r = self.pearson[iu, ju]
+        ok = np.isfinite(r) & (self.n[iu, ju] >= min_n)
+        order = np.argsort(-np.abs(r[ok]))[:k]
+        return [
+            self.pair(self.columns[iu[ok][o]], self.columns[ju[ok][o]]) for o in order
+        ]
+
+
+def _num(v) -> Optional[float]:
+    return float(v) if np.isfinite(v) else None
+
+
+def _pairwise_ols(x: np.ndarray):
+    """Pair counts, Pearson r and OLS slope/intercept for all column pairs at once."""
+    m = np.isfinite(x).astype(np.float64)
+    x0 = np.where(m > 0, x, 0.0)
+    n = m.T @ m
+    sx = x0.T @ m  # [i, j]: sum of column i over rows where i and j are present
+    sxx = (x0 * x0).T @ m
+    sxy = x0.T @ x0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sxy - sx * sx.T / n
+        var_x = sxx - sx * sx / n
+        var_y = var_x.T
+        r = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+        slope = cov / var_x
+        intercept = (sx.T - slope * sx) / n
+    r[n < 2] = np.nan
+    return n.astype(np.int64), r, slope, intercept
+
+
+def _spearman(x: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Spearman rho: Pearson on average ranks.
+
+    Columns without gaps are ranked once; pairs involving a column with missing
+    values are re-ranked on their common rows so rho matches DataFrame.corr.
+    """
+    ranks = pd.DataFrame(x).rank().to_numpy()
+    rho = _pairwise_ols(ranks)[1]
+    gaps = np.flatnonzero(~np.isfinite(x).all(axis=0))
+    for i in gaps:
+        for j in range(x.shape[1]):
+            ok = np.isfinite(x[:, i]) & np.isfinite(x[:, j])
+            if ok.sum() < 2:
+                rho[i, j] = rho[j, i] = np.nan
+                continue
+            a = pd.Series(x[ok, i]).rank().to_numpy()
+            b = pd.Series(x[ok, j]).rank().to_numpy()
+            with np.errstate(invalid="ignore", divide="ignore"):
+                rho[i, j] = rho[j, i] = np.corrcoef(a, b)[0, 1]
+    return rho
+
+
+def kpi_columns(df: pd.DataFrame) -> List[str]:
+    return [c for c in df.columns if str(c).endswith("_pct")]
+
+
+def correlation_stats(
+    df: pd.DataFrame,
+    columns: Optional[Sequence[str]] = None,
+    cache_key: Optional[str] = None,
+) -> CorrelationStats:
+    """CorrelationStats for `df` (KPI *_pct columns by default), memoized on cache_key.
+
+    `cache_key` must identify the rows of `df` (e.g. months + filters); without
+    it nothing is cached.
+    """
+    columns = list(columns) if columns is not None else kpi_columns(df)
+    key = None if cache_key is None else f"{cache_key}|{','.join(columns)}"
+    if key is not None:
+        with _LOCK:
+            hit = _CACHE.get(key)
+            if hit is not None:
+                _CACHE.move_to_end(key)
+        cache_event("correlation", hit is not None)
+        if hit is not None:
+            return hit
+    stats = CorrelationStats(df, columns)
+    if key is not None:
+        with _LOCK:
+            _CACHE[key] = stats
+            while len(_CACHE) > _CACHE_SIZE:
+                _CACHE.popitem(last=False)
+    return stats
+
+
+def clear_cache() -> None:
+    with _LOCK:
+        _CACHE.clear()
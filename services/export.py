@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import os
+import time
+import zlib
+from typing import Iterable, Iterator, Optional
+
+import pandas as pd
+
+from utils.data import widen_float32
+
+# Streaming dataset exports: frames are written chunk by chunk and each chunk's
+# bytes are yielded as soon as the writer produced them, so memory stays at one
+# chunk (plus the writer's buffers) no matter how many months are exported.
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+CHUNK_ROWS = 50_000
+
+
+class _Sink:
+    """Write-only file object that hands its bytes back to the generator."""
+
+    closed = False
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._pos = 0
+
+    def write(self, data) -> int:
+        b = bytes(data)
+        self._parts.append(b)
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        out, self._parts = b"".join(self._parts), []
+        return out
+
+
+def _kind(s: pd.Series) -> Optional[str]:
+    """"int", "float", "bool", "datetime" or "string"; None for a column without values."""
+    if s.isna().all():
+        return None
+    dtype = s.dtype
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_integer_dtype(dtype):
+        return "int"
+    if pd.api.types.is_float_dtype(dtype):
+        return "float"
+    if pd.api.types.is_datetime64_dtype(dtype):
+        return "datetime"
+    if pd.api.types.is_object_dtype(dtype):
+        inferred = pd.api.types.infer_dtype(s, skipna=True)
+        if inferred == "integer":
+            return "int"
+        if inferred in ("floating", "mixed-integer-float", "decimal"):
+            return "float"
+        if inferred == "boolean":
+            return "bool"
+    return "string"
+
+
+def _dtype(kinds: set) -> str:
+    if kinds and kinds <= {"int", "float", "bool"}:
+        if "float" in kinds:
+            return "float64"
+        return "Int64" if "int" in kinds else "boolean"
+    if kinds == {"datetime"}:
+        return "datetime64[ns]"
+    return "string"
+
+
+class ExportSchema:
+    """Columns and dtypes every chunk of one export is cast to.
+
+    Built from all of the export's frames before the response starts, so a
+    month with extra columns or another dtype (float32 vs float64, an
+    all-NaN object column) cannot break the stream halfway. Columns are the
+    union in first-seen order; numeric kinds widen to float64 (Int64 /
+    boolean when every month agrees), anything else becomes text.
+    """
+
+    def __init__(self, dtypes: dict):
+        self.dtypes = dtypes
+
+    @classmethod
+    def of(cls, frames: Iterable[pd.DataFrame]) -> "ExportSchema":
+        kinds: dict = {}
+        for df in frames:
+            if not isinstance(df, pd.DataFrame):
+                continue
+            for c in df.columns:
+                kind = _kind(df[c])
+                kinds.setdefault(c, set())
+                if kind is not None:
+                    kinds[c].add(kind)
+        return cls({c: _dtype(k) for c, k in kinds.items()})
+
+    @property
+    def columns(self) -> list:
+        return list(self.dtypes)
+
+    def cast(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = widen_float32(df.reindex(columns=self.columns))
+        cols = {}
+        for c, dtype in self.dtypes.items():
+            s = df[c]
+            if dtype == "string":
+                s = s.astype(object)
+                s = s.where(s.isna(), s.astype(str))
+            elif dtype == "datetime64[ns]":
+                s = pd.to_datetime(s)
+            else:
+                s = s.astype(dtype)
+            cols[c] = s
+        return pd.DataFrame(cols, index=df.index)
+
+    def arrow(self):
+        import pyarrow as pa
+
+        types = {
+            "float64": pa.float64(),
+            "Int64": pa.int64(),
+            "boolean": pa.bool_(),
+            "datetime64[ns]": pa.timestamp("ns"),
+            "string": pa.string(),
+        }
+        return pa.schema([(str(c), types[t]) for c, t in self.dtypes.items()])
+
+
+def _chunks(frames: Iterable[pd.DataFrame], chunk_rows: int, schema: ExportSchema) -> Iterator[pd.DataFrame]:
+    """Chunks of every frame cast to `schema` (one empty chunk when there are no rows)."""
+    emitted = False
+    for df in frames:
+        if not isinstance(df, pd.DataFrame):
+            continue
+        for start in range(0, len(df), chunk_rows):
+            emitted = True
+            yield schema.cast(df.iloc[start : start + chunk_rows])
+    if not emitted and schema.columns:
+        yield schema.cast(pd.DataFrame(columns=schema.columns))
+
+
+def _csv(chunks: Iterator[pd.DataFrame], gzip: bool) -> Iterator[bytes]:
+    z = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    header = True
+    for chunk in chunks:
+        data = chunk.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+        data = z.compress(data) if z else data
+        if data:
+            yield data
+    if z:
+        yield z.flush()
+
+
+def _arrow(chunks: Iterator[pd.DataFrame], fmt: str, compression: Optional[str], schema) -> Iterator[bytes]:
+    import pyarrow as pa
+
+    sink, writer = _Sink(), None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                if fmt == "parquet":
+                    import pyarrow.parquet as pq
+
+                    writer = pq.ParquetWriter(sink, schema, compression=compression or "snappy")
+                else:
+                    options = pa.ipc.IpcWriteOptions(compression=compression)
+                    writer = pa.ipc.new_stream(sink, schema, options=options)
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False, safe=False)
+            writer.write_table(table)
+            out = sink.drain()
+            if out:
+                yield out
+    finally:
+        if writer is not None:
+            writer.close()
+    out = sink.drain()
+    if out:
+        yield out
+
+
+def _drain(frames: list) -> Iterator[pd.DataFrame]:
+    while frames:
+        yield frames.pop(0)
+
+
+def stream_frames(
+    frames: Iterable[pd.DataFrame],
+    fmt: str = "csv",
+    compression: Optional[str] = None,
+    chunk_rows: int = CHUNK_ROWS,
+    schema: Optional[ExportSchema] = None,
+) -> Iterator[bytes]:
+    """Encode `frames` (e.g. one per month) as one CSV/Arrow IPC/Parquet stream.
+
+    compression: "gzip" for CSV (the whole body, for Content-Encoding), an
+    Arrow IPC buffer codec ("zstd"/"lz4"), or a Parquet codec.
+    `schema` (ExportSchema.of over the same frames) lets `frames` be a
+    generator that is consumed once; without it the frames are collected
+    first and each is released once it has been written. Arrow and Parquet
+    need pyarrow; without it an ImportError is raised before anything is
+    written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt != "csv":
+        import pyarrow  # noqa: F401  (fail before the response starts)
+    if schema is None:
+        frames = list(frames)
+        schema = ExportSchema.of(frames)
+        frames = _drain(frames)
+    chunks = _chunks(frames, chunk_rows, schema)
+    if fmt == "csv":
+        return _csv(chunks, compression == "gzip")
+    return _arrow(chunks, fmt, compression, schema.arrow())
+
+
+def write_export(
+    frames: Iterable[pd.DataFrame],
+    path: str,
+    fmt: str = "csv",
+    compression: Optional[str] = None,
+    schema: Optional[ExportSchema] = None,
+) -> str:
+    """Write the stream_frames output to `path` atomically (via a .part file)."""
+    tmp = f"{path}.{os.getpid()}.part"
+    with open(tmp, "wb") as fh:
+        for data in stream_frames(frames, fmt, compression, schema=schema):
+            fh.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+def prune_exports(directory: str, max_age_s: float) -> None:
+    """Delete materialized exports older than max_age_s seconds."""
+    cutoff = time.time() - max_age_s
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+    for name in names:
+        full = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(full) < cutoff:
+                os.remove(full)
+        except OSError:
+            pass
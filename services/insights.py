@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from typing import Callable, Dict, List, Optional, Tuple
 import pandas as pd
+from utils.data import to_records
 from utils.df_summary import describe_by_column
 
 from .llm import generate_markdown_from_prompt
+from .usage_ledger import usage_context
 from .prompts import (
     build_prompt_individual,
 )
@@ -16,20 +18,21 @@ def _chunk_dataframe(df: pd.DataFrame, chunk_size: int = 400) -> List[pd.DataFra
     n = len(df)
     if n <= chunk_size:
         return [df]
-    return [df.iloc[i : i + chunk_size].copy() for i in range(0, n, chunk_size)]
+    return [df.iloc[i : i + chunk_size] for i in range(0, n, chunk_size)]
 
 
 def _record_pack(df: pd.DataFrame) -> Dict:
     return {
         "columns": list(df.columns),
-        "records": df.to_dict("records"),
+        "records": to_records(df),
         "n_rows": int(len(df)),
     }
 
 
-def _call_llm(provider: str, prompt: str) -> Tuple[Optional[str], Optional[str]]:
-    # Single provider path (Gemini)
-    return generate_markdown_from_prompt(prompt)
+def _call_llm(provider: str, prompt: str, **usage_tags) -> Tuple[Optional[str], Optional[str]]:
+    # Single provider path (Gemini); usage_tags attribute the call in the usage ledger
+    with usage_context(**usage_tags):
+        return generate_markdown_from_prompt(prompt)
 
 
 def summarize_chart_via_chunks(
@@ -65,7 +68,7 @@ def summarize_chart_via_chunks(
                 "metadata": meta or {},
                 "columns": list(cdf.columns),
                 "n_rows": int(len(cdf)),
-                "rows": cdf.to_dict("records"),
+                "rows": to_records(cdf),
                 # Inform the model that this is a partition of a larger table
                 "chunk_info": {"index": idx, "total": len(chunks)},
             }
@@ -80,7 +83,7 @@ def summarize_chart_via_chunks(
                 # Reuse the individual prompt; it already enforces quantified, concise outputs.
                 prompt = build_prompt_individual(payload, context_text, focus_hint)
 
-            text, err = _call_llm(provider, prompt)
+            text, err = _call_llm(provider, prompt, graph_ids=[graph_id], stage="chunk", chunk=idx)
             if err:
                 return None, f"Chunk {idx} LLM error: {err}"
             chunk_summaries.append((text or "").strip())
@@ -154,7 +157,7 @@ def summarize_chart_via_chunks(
                 "Summaries to synthesize (ordered):\n" + "\n\n".join(chunk_summaries)
             )
 
-        final_text, final_err = _call_llm(provider, agg_prompt)
+        final_text, final_err = _call_llm(provider, agg_prompt, graph_ids=[graph_id], stage="reduce")
         if final_err:
             return None, final_err
         return (final_text or "").strip(), None
@@ -200,7 +203,7 @@ def synthesize_across_charts(
             f"{combined_source}"
         )
 
-        final_text, err = _call_llm(provider, prompt)
+        final_text, err = _call_llm(provider, prompt, stage="synthesis")
         if err:
             return None, err
         return (final_text or "").strip(), None
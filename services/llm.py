@@ -1,25 +1,53 @@
+import time
+from importlib.util import find_spec
 from loguru import logger
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 
 from config.settings import (
     GOOGLE_API_KEY as SETTINGS_API_KEY,
     MODEL_NAME as SETTINGS_MODEL,
 )
+from services.usage_ledger import cost_usd, record_usage
+from utils import metrics
 
-HAVE_NEW_GENAI = False
-HAVE_LEGACY_GENAI = False
 
-try:
-    from google import genai
+def _installed(module: str) -> bool:
+    try:
+        return find_spec(module) is not None
+    except Exception:
+        return False
+
+
+# The Gemini SDKs take ~0.5s to import, so startup only checks which one is
+# installed; `_sdk` imports it on the first LLM call.
+HAVE_NEW_GENAI = _installed("google.genai")
+HAVE_LEGACY_GENAI = not HAVE_NEW_GENAI and _installed("google.generativeai")
+
+
+def _sdk():
+    """google.genai, or google.generativeai when only the legacy client is installed."""
+    if HAVE_NEW_GENAI:
+        from google import genai
 
-    HAVE_NEW_GENAI = True
-except Exception:
+        return genai
+    import google.generativeai as genai_legacy
+
+    return genai_legacy
+
+
+def preload_sdk() -> None:
+    """Import the configured Gemini SDK now instead of on the first LLM call."""
+    if not llm_configured():
+        return
     try:
-        import google.generativeai as genai_legacy
+        _sdk()
+    except Exception as e:
+        logger.warning(f"Gemini SDK import failed: {e}")
 
-        HAVE_LEGACY_GENAI = True
-    except Exception:
-        pass
+
+def llm_configured(api_key: Optional[str] = None) -> bool:
+    """True when a Gemini client is installed and an API key is available."""
+    return bool((HAVE_NEW_GENAI or HAVE_LEGACY_GENAI) and (api_key or SETTINGS_API_KEY))
 
 
 def generate_markdown_from_prompt(
@@ -30,55 +58,59 @@ def generate_markdown_from_prompt(
     """Generate markdown text from a prompt using Gemini (new or legacy client).
 
     Returns a tuple of (text, error). If both clients are unavailable or no api_key,
-    returns a helpful message as text and None for error.
+    returns a helpful message as text and None for error. Configured calls are
+    recorded in the usage ledger with the current `usage_context`.
     """
     model = model_name or SETTINGS_MODEL
     key = api_key or SETTINGS_API_KEY
-    usage_logger = logger.bind(usage=True)
-
-    try:
-        if HAVE_NEW_GENAI and key:
-            client = genai.Client(api_key=key)
-            resp = client.models.generate_content(model=model, contents=[prompt])
-            
-            # Extract usage metadata
-            usage_metadata = getattr(resp, "usage_metadata", None)
-            if usage_metadata:
-                prompt_token_count = usage_metadata.prompt_token_count
-                candidates_token_count = usage_metadata.candidates_token_count
-                total_token_count = usage_metadata.total_token_count
-
-                cost = ((prompt_token_count / 1_000_000) * 7) + ((candidates_token_count / 1_000_000) * 21)
-
-                usage_logger.info(f"Tokens: {total_token_count} (prompt: {prompt_token_count}, candidates: {candidates_token_count}) | Cost: ${cost:.6f}")
-
-            return getattr(resp, "text", None), None
-
-        if HAVE_LEGACY_GENAI and key:
-            genai_legacy.configure(api_key=key)
-            model_client = genai_legacy.GenerativeModel(model)
-            resp = model_client.generate_content([prompt])
-            
-            # Extract usage metadata
-            usage_metadata = getattr(resp, "usage_metadata", None)
-            if usage_metadata:
-                prompt_token_count = usage_metadata.prompt_token_count
-                candidates_token_count = usage_metadata.candidates_token_count
-                total_token_count = usage_metadata.total_token_count
-
-                # Cost calculation (example for gemini-2.0-flash)
-                cost = ((prompt_token_count / 1_000_000) * 0.1) + ((candidates_token_count / 1_000_000) * 0.4)
-                usage_logger.info(f"Tokens: {total_token_count} (prompt: {prompt_token_count}, candidates: {candidates_token_count}) | Cost: ${cost:.6f}")
-                
-            return getattr(resp, "text", None), None
-
-        # Not configured
+    if not llm_configured(key):
+        metrics.observe("insightdash_llm_request_seconds", 0.0, {"model": model, "status": "unconfigured"})
         return (
             "LLM not configured. Install `google-genai` or `google-generativeai` and set `GOOGLE_API_KEY`.",
             None,
         )
+    t0 = time.perf_counter()
+    text, error, usage_metadata = _generate(prompt, model, key)
+    latency = time.perf_counter() - t0
+    status = "error" if error else "ok"
+    prompt_tokens = int(getattr(usage_metadata, "prompt_token_count", 0) or 0)
+    candidate_tokens = int(getattr(usage_metadata, "candidates_token_count", 0) or 0)
+    cost = cost_usd(model, prompt_tokens, candidate_tokens)
+
+    metrics.observe("insightdash_llm_request_seconds", latency, {"model": model, "status": status})
+    metrics.inc("insightdash_llm_tokens_total", {"model": model, "kind": "prompt"}, prompt_tokens)
+    metrics.inc("insightdash_llm_tokens_total", {"model": model, "kind": "candidates"}, candidate_tokens)
+    if usage_metadata:
+        total_token_count = getattr(usage_metadata, "total_token_count", None) or prompt_tokens + candidate_tokens
+        logger.bind(usage=True).info(
+            f"Tokens: {total_token_count} (prompt: {prompt_tokens}, candidates: {candidate_tokens}) | Cost: ${cost:.6f}"
+        )
+    record_usage(
+        model=model,
+        prompt=prompt,
+        prompt_tokens=prompt_tokens,
+        candidate_tokens=candidate_tokens,
+        latency_s=latency,
+        status=status,
+        cost=cost,
+    )
+    return text, error
+
+
+def _generate(prompt: str, model: str, key: str) -> Tuple[Optional[str], Optional[str], Any]:
+    """(text, error, usage_metadata) from whichever Gemini client is installed."""
+    try:
+        sdk = _sdk()
+        if HAVE_NEW_GENAI:
+            client = sdk.Client(api_key=key)
+            resp = client.models.generate_content(model=model, contents=[prompt])
+        else:
+            sdk.configure(api_key=key)
+            model_client = sdk.GenerativeModel(model)
+            resp = model_client.generate_content([prompt])
+        return getattr(resp, "text", None), None, getattr(resp, "usage_metadata", None)
     except Exception as e:
-        return None, str(e)
+        return None, str(e), None
 
 
 # OpenRouter path removed; Gemini-only support retained.
@@ -0,0 +1,625 @@
+from __future__ import annotations
+
+import re
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from app_tabs.tab1.figures import get_filtered_frames as t1_get_filtered_frames
+from app_tabs.tab2.figures import get_filtered_frames as t2_get_filtered_frames
+from app_tabs.tab3.figures import (
+    get_filtered_frames_simple as t3_get_filtered_frames,
+    kpi_gap_table,
+    kpi_type_profiles,
+)
+from data_layer.schema import coerce_numeric
+from utils.data import to_records, widen_float32
+from utils.df_summary import category_mix_by_month, describe_by_column, grouped_stats_selected
+
+from .correlation import correlation_stats
+from .selection_store import is_handle, selection_store
+
+# LLM payload assembly for generate_report. Filtered Tab 1/2/3 frames are
+# resolved per chart on first use, so a request only pays for the tab
+# families of the charts it selected.
+
+# Snapshot slots of a selection, in order of preference per data scope
+_FILTERED_SLOTS = ["chart", "alt_chart", "gap_chart", "filtered", "full", "alt_full", "gap_full"]
+_FULL_SLOTS = ["full", "alt_full", "gap_full", "chart", "alt_chart", "gap_chart", "filtered"]
+_MONTH_ID = re.compile(r"^(.*?)-month-(.+)$")
+
+MonthFrames = Callable[[Optional[Dict], str], Dict]
+
+
+def pick_snapshot(meta_obj: Dict | None, filtered_scope: bool) -> Optional[Dict]:
+    """The selection handle to analyse: chart-scoped first for the filtered scope, full otherwise."""
+    if not isinstance(meta_obj, dict):
+        return None
+    if is_handle(meta_obj):
+        return meta_obj
+    for key in _FILTERED_SLOTS if filtered_scope else _FULL_SLOTS:
+        val = meta_obj.get(key)
+        if is_handle(val):
+            return val
+    return None
+
+
+def snapshot_frame(handle: Dict | None) -> pd.DataFrame:
+    # Snapshots live server-side; an evicted handle falls back to live frames
+    df = selection_store.get(handle)
+    return widen_float32(df) if isinstance(df, pd.DataFrame) else pd.DataFrame()
+
+
+def prepare_tab2_filtered_df(
+    df: pd.DataFrame,
+    xcol: str | None,
+    ycol: str | None,
+    color_col: str | None,
+) -> pd.DataFrame:
+    """Mirror the on-screen Tab 2 scatter view when filtered scope is selected."""
+    if not isinstance(df, pd.DataFrame) or df.empty:
+        return df
+
+    # Shallow copy: coercion below rewrites only the x/y columns (copy-on-write)
+    d = df.copy(deep=False)
+    for col in (xcol, ycol):
+        # KPI columns are typed at load time; only untyped input is parsed here
+        if col and col in d.columns and not pd.api.types.is_numeric_dtype(d[col]):
+            d[col] = coerce_numeric(d[col])[0]
+
+    subset_cols = [c for c in (xcol, ycol) if c and c in d.columns]
+    if subset_cols:
+        try:
+            d = d.dropna(subset=subset_cols)
+        except Exception:
+            pass
+
+    parameter_cols: List[str] = []
+    for col in (xcol, ycol, color_col):
+        if col and col in d.columns and col not in parameter_cols:
+            parameter_cols.append(col)
+    if parameter_cols:
+        d = d[parameter_cols]
+    return d
+
+
+def _month_rows(df, month: str) -> Optional[pd.DataFrame]:
+    if isinstance(df, pd.DataFrame) and not df.empty and "Month" in df.columns:
+        return df[df["Month"].astype(str) == str(month)]
+    return None
+
+
+def _combine(a, b) -> list:
+    la, lb = list(a or []), list(b or [])
+    if la and lb:
+        sb = set(lb)
+        return [x for x in la if x in sb]
+    return la or lb
+
+
+class LiveFrames:
+    """Filtered chart frames of one filter state; each tab family is built on first use.
+
+    `builds` records which families were built (for tests and benchmarks).
+    """
+
+    def __init__(self, month_frames: MonthFrames, filters: Dict | None, tab3_local: Dict | None):
+        self.month_frames = month_frames
+        self.raw_filters = filters
+        self.filters = filters or {}
+        self.months = list(self.filters.get("months") or [])
+        gf, lf = self.filters, tab3_local or {}
+        self.merged_t3 = {
+            "outlet_categories": _combine(gf.get("outlet_categories"), lf.get("outlet_categories")),
+            "regions": list(gf.get("regions", [])),
+            "sales_center_codes": list(lf.get("sales_center_codes", [])),
+            "shortfall_side": lf.get("shortfall_side"),
+            "kpi_focus": lf.get("kpi_focus"),
+            "search_text": gf.get("search_text", ""),
+            "outlet_types": list(gf.get("outlet_types", [])),
+        }
+        self.builds: List[str] = []
+
+    # ----- tab families -----
+    @cached_property
+    def _tab1_source(self) -> Dict:
+        return self.month_frames(self.raw_filters, "tab1")
+
+    @cached_property
+    def _tab1(self):
+        self.builds.append("tab1")
+        try:
+            q1, _q2, _q3, q4, q5 = t1_get_filtered_frames(self._tab1_source, self.filters)
+            return q1, q4, q5
+        except Exception:
+            return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+
+    @cached_property
+    def _tab1_unfiltered(self):
+        self.builds.append("tab1-unfiltered")
+        try:
+            _q1, q2, _q3, q4, _q5 = t1_get_filtered_frames(
+                self._tab1_source, {"months": list(self.filters.get("months") or ["april"])}
+            )
+            return q2, q4
+        except Exception:
+            return pd.DataFrame(), pd.DataFrame()
+
+    @cached_property
+    def t2_chart(self) -> pd.DataFrame:
+        self.builds.append("tab2")
+        try:
+            tab2_cur = self.month_frames(self.raw_filters, "tab2")
+            return (t2_get_filtered_frames(tab2_cur, self.filters) or [pd.DataFrame()])[0]
+        except Exception:
+            return pd.DataFrame()
+
+    @cached_property
+    def _tab3(self):
+        self.builds.append("tab3")
+        try:
+            tab3_cur = self.month_frames(self.raw_filters, "tab3")
+            q1, q2, _q3, _q4 = t3_get_filtered_frames(tab3_cur or {}, self.merged_t3)
+            return q1, q2
+        except Exception:
+            return pd.DataFrame(), pd.DataFrame()
+
+    t1_q1_f = property(lambda self: self._tab1[0])
+    t1_q4_f = property(lambda self: self._tab1[1])
+    t1_q5_f = property(lambda self: self._tab1[2])
+    t1_q2_u = property(lambda self: self._tab1_unfiltered[0])
+    t1_q4_u = property(lambda self: self._tab1_unfiltered[1])
+    t3_q1_chart = property(lambda self: self._tab3[0])
+    t3_q2_chart = property(lambda self: self._tab3[1])
+
+    # ----- per chart -----
+    def _category_mix(self) -> pd.DataFrame:
+        # Prefer unfiltered detailed frame to mirror q2 semantics
+        detail_df = self.t1_q4_u if isinstance(self.t1_q4_u, pd.DataFrame) else self.t1_q4_f
+        return category_mix_by_month(detail_df)
+
+    def chart(self, gid: str) -> pd.DataFrame:
+        """The live, currently filtered data behind chart `gid` (empty when unknown)."""
+        try:
+            if gid == "q1":
+                return self.t1_q1_f
+            if gid == "q2":
+                # For insights: if multiple months selected, feed per-month category mix
+                if len(self.months) > 1:
+                    try:
+                        mix_all = self._category_mix()
+                        if isinstance(mix_all, pd.DataFrame) and not mix_all.empty:
+                            return mix_all[mix_all["Month"].astype(str).isin([str(m) for m in self.months])]
+                    except Exception:
+                        pass
+                return self.t1_q2_u  # UI shows unfiltered category mix
+            if gid == "q3":
+                regs_sel = list(self.filters.get("regions") or [])
+                df = self.t1_q4_f
+                if len(regs_sel) == 1 and isinstance(df, pd.DataFrame) and not df.empty:
+                    if "rgn" in df.columns:
+                        try:
+                            df = df[df["rgn"] == regs_sel[0]]
+                        except Exception:
+                            pass
+                    return df
+                return self.t1_q1_f
+            if gid == "q4":
+                return self.t1_q4_f
+            if gid == "q5":
+                return self.t1_q5_f
+            if gid == "q6":
+                d = self.t1_q4_f
+                if not isinstance(d, pd.DataFrame) or d.empty:
+                    d = self.t1_q1_f
+                if isinstance(d, pd.DataFrame) and not d.empty:
+                    cat_col = "outlet_category" if "outlet_category" in d.columns else (
+                        "Category" if "Category" in d.columns else None
+                    )
+                    if cat_col:
+                        return (
+                            d[[cat_col]]
+                            .dropna()
+                            .groupby(cat_col, dropna=False, observed=True)
+                            .size()
+                            .reset_index(name="count")
+                            .rename(columns={cat_col: "category"})
+                        )
+                    return pd.DataFrame(columns=["category", "count"])
+                return pd.DataFrame()
+            if gid == "t2-graph-dyn":
+                return self.t2_chart
+            if gid == "t3-graph-1":
+                return self.t3_q1_chart
+            if gid == "t3-graph-2":
+                return self.t3_q2_chart
+        except Exception:
+            pass
+        return pd.DataFrame()
+
+    def context(self, gid: str) -> Optional[pd.DataFrame]:
+        """The detailed frame of a chart's family, used for month-over-month context."""
+        if gid.startswith("q"):
+            return self.t1_q1_f
+        if gid == "t2-graph-dyn":
+            return self.t2_chart
+        if gid.startswith("t3-"):
+            return self.t3_q1_chart
+        return None
+
+    def month(self, gid: str, month: str, t2_view: Sequence = (None, None, None)) -> pd.DataFrame:
+        """Chart `gid`'s live data for a single month (compare-months payloads)."""
+        try:
+            if gid == "q2":
+                mix_all = self._category_mix()
+                if isinstance(mix_all, pd.DataFrame) and not mix_all.empty:
+                    return mix_all[mix_all["Month"].astype(str) == str(month)]
+                return pd.DataFrame(columns=["Month", "category", "count", "pct"])
+            if gid == "q1":
+                sub = _month_rows(self.t1_q4_f, month)
+                return sub if sub is not None else pd.DataFrame()
+            if gid == "q3":
+                sub = _month_rows(self.t1_q4_f, month)
+                if sub is None:
+                    return pd.DataFrame()
+                regs_sel = list(self.filters.get("regions") or [])
+                if regs_sel and "rgn" in sub.columns:
+                    try:
+                        sub = sub[sub["rgn"].isin(regs_sel)]
+                    except Exception:
+                        pass
+                return sub
+            if gid == "q6":
+                mix_all = category_mix_by_month(self.t1_q4_f)
+                if isinstance(mix_all, pd.DataFrame) and not mix_all.empty:
+                    return mix_all[mix_all["Month"].astype(str) == str(month)][["Month", "category", "count"]]
+                return pd.DataFrame(columns=["Month", "category", "count"])
+            if gid == "t2-graph-dyn":
+                sub = _month_rows(self.t2_chart, month)
+                if sub is None:
+                    return pd.DataFrame()
+                x, y, color = t2_view
+                return prepare_tab2_filtered_df(sub, x, y, color or "outlet_category")
+            if gid == "t3-graph-1":
+                sub = _month_rows(self.t3_q1_chart, month)
+                if sub is None:
+                    return pd.DataFrame(columns=["Month", "outlet_category", "kpi", "gap_value"])
+                gaps = kpi_gap_table(sub)
+                gaps.insert(0, "Month", str(month))
+                return gaps
+            if gid == "t3-graph-2":
+                sub = _month_rows(self.t3_q2_chart, month)
+                return sub if sub is not None else pd.DataFrame()
+        except Exception:
+            pass
+        return pd.DataFrame()
+
+
+class ReportPayload:
+    """Charts payload for the prompt builders plus the frames behind each entry."""
+
+    def __init__(self, frames: LiveFrames, request: Dict):
+        self.frames = frames
+        self.request = request
+        self.charts: List[Dict] = []
+        self.metadata: Dict = {}
+        # payload graph_id -> the DataFrame behind it (for chunked analysis)
+        self.analysis_frames: Dict[str, pd.DataFrame] = {}
+
+    @property
+    def payload(self) -> Dict:
+        return {"charts": self.charts, "metadata": self.metadata}
+
+    def _month_frame(self, gid: str, month: str) -> pd.DataFrame:
+        if not self.request["filtered_scope"]:
+            base_meta = (self.request["selected_data"] or {}).get(gid)
+            candidates = []
+            if isinstance(base_meta, dict):
+                if is_handle(base_meta):
+                    candidates.append(base_meta)
+                for key in ["full", "alt_full", "gap_full", "chart", "alt_chart", "gap_chart"]:
+                    val = base_meta.get(key)
+                    if isinstance(val, dict):
+                        candidates.append(val)
+            for handle in candidates:
+                sub = _month_rows(snapshot_frame(handle), month)
+                if sub is not None:
+                    return sub
+            return pd.DataFrame()
+        return self.frames.month(gid, month, self.request["t2_view"])
+
+    def full_frame(self, chart: Dict) -> pd.DataFrame:
+        """Complete dataset behind one payload entry (month-specific ids included)."""
+        gid = str(chart.get("graph_id"))
+        base_gid, month = gid, None
+        m = _MONTH_ID.match(gid)
+        if m:
+            base_gid, month = m.group(1), m.group(2)
+
+        df = self.analysis_frames.get(base_gid)
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            handle = pick_snapshot(
+                (self.request["selected_data"] or {}).get(base_gid), self.request["filtered_scope"]
+            )
+            df = snapshot_frame(handle)
+            if df.empty:
+                df = self.frames.chart(base_gid)
+
+        if month:
+            try:
+                md = self._month_frame(base_gid, str(month))
+                if isinstance(md, pd.DataFrame) and not md.empty:
+                    df = md
+            except Exception:
+                pass
+            sub = _month_rows(df, month)
+            if sub is not None:
+                df = sub
+
+        if self.request["filtered_scope"] and base_gid == "t2-graph-dyn" and isinstance(df, pd.DataFrame):
+            meta = chart.get("meta") or {}
+            x, y, color = self.request["t2_view"]
+            df = prepare_tab2_filtered_df(
+                df, x or meta.get("x"), y or meta.get("y"), color or meta.get("color") or "outlet_category"
+            )
+        return df
+
+
+class PayloadEngine:
+    """Builds generate_report's LLM payload from the selected charts.
+
+    month_frames(filters, tab_key) returns the combined month frames of one
+    tab; profile_key/corr_key give the radar-profile and correlation cache
+    keys shared with the figure callbacks.
+    """
+
+    def __init__(
+        self,
+        month_frames: MonthFrames,
+        labels: Optional[Dict[str, str]] = None,
+        profile_key: Optional[Callable[[Dict, Dict], str]] = None,
+        corr_key: Optional[Callable[[Dict], str]] = None,
+    ):
+        self.month_frames = month_frames
+        self.labels = labels or {}
+        self.profile_key = profile_key
+        self.corr_key = corr_key
+
+    def label(self, gid: str) -> str:
+        return self.labels.get(gid, gid)
+
+    def build(
+        self,
+        selected_graphs: Sequence[str],
+        selected_data: Dict | None,
+        filters: Dict | None,
+        tab3_local: Dict | None = None,
+        insight_mode: str | None = "individual",
+        filtered_scope: bool = False,
+        t2_view: Sequence = (None, None, None),
+    ) -> ReportPayload:
+        """Payload entries for every selected graph that still has a snapshot."""
+        frames = LiveFrames(self.month_frames, filters, tab3_local)
+        report = ReportPayload(
+            frames,
+            {
+                "selected_data": selected_data,
+                "filters": filters,
+                "insight_mode": insight_mode or "individual",
+                "filtered_scope": bool(filtered_scope),
+                "t2_view": tuple(t2_view),
+            },
+        )
+        sel_months = list((filters or {}).get("months") or [])
+        compare_on = len(sel_months) > 1 and bool((filters or {}).get("compare_months"))
+        for gid in selected_graphs or []:
+            self._add_chart(report, gid, sel_months, compare_on)
+        report.metadata = _top_metadata(report.charts)
+        return report
+
+    def _add_chart(self, report: ReportPayload, gid: str, sel_months: list, compare_on: bool) -> None:
+        req, frames = report.request, report.frames
+        filters, filtered_scope = req["filters"], req["filtered_scope"]
+        t2_x, t2_y, t2_color = req["t2_view"]
+        meta_all = (req["selected_data"] or {}).get(gid)
+        meta = pick_snapshot(meta_all, filtered_scope)
+        if not meta:
+            return
+        # Live chart dataframe for this gid (the stored snapshot wins for the full scope)
+        live_df = frames.chart(gid)
+        meta_df = snapshot_frame(meta)
+        analysis_df = live_df if isinstance(live_df, pd.DataFrame) else pd.DataFrame()
+        if not filtered_scope and not meta_df.empty:
+            analysis_df = meta_df
+
+        if gid == "t2-graph-dyn" and filtered_scope:
+            analysis_df = prepare_tab2_filtered_df(
+                analysis_df,
+                t2_x or meta.get("x"),
+                t2_y or meta.get("y"),
+                t2_color or meta.get("color") or "outlet_category",
+            )
+
+        # Tab 3 first graph: a small, focused table (KPI gaps)
+        gap_df = None
+        if gid == "t3-graph-1":
+            try:
+                gap_df = kpi_gap_table(analysis_df)
+            except Exception:
+                gap_df = None
+        special_tab3_small = isinstance(gap_df, pd.DataFrame) and not gap_df.empty
+        base_df = gap_df if special_tab3_small else analysis_df
+        has_rows = isinstance(base_df, pd.DataFrame) and not base_df.empty
+
+        item = {
+            "graph_id": gid,
+            "graph_label": self.label(gid) + (" — KPI gaps" if special_tab3_small else ""),
+            "filters": filters,
+            "columns": [str(c) for c in base_df.columns] if has_rows else meta.get("columns", []),
+            "n_rows": len(base_df) if has_rows else meta.get("n_rows", 0),
+            "rows": to_records(base_df) if has_rows else [],
+        }
+        payload_df = base_df if isinstance(base_df, pd.DataFrame) else meta_df
+
+        # Computed per-column statistics reduce LLM arithmetic errors
+        try:
+            if has_rows:
+                item["computed_stats"] = describe_by_column(base_df)
+                gs = grouped_stats_selected(base_df)
+                if gs:
+                    item["group_stats"] = gs
+            elif item["columns"] and item["rows"]:
+                tmp = pd.DataFrame(item["rows"])
+                item["computed_stats"] = describe_by_column(tmp)
+                gs = grouped_stats_selected(tmp)
+                if gs:
+                    item["group_stats"] = gs
+
+            # Several months: stats of the detailed family frame (with Month) for MoM context
+            if len(sel_months) > 1:
+                ctx_df = frames.context(gid)
+                if isinstance(ctx_df, pd.DataFrame) and not ctx_df.empty:
+                    ctx_grp = grouped_stats_selected(ctx_df)
+                    item.setdefault("context_stats", {}).update(
+                        {"large_computed_stats": describe_by_column(ctx_df), "large_group_stats": ctx_grp}
+                    )
+                    # Per-month values inline in group_stats, without overwriting non-empty keys
+                    if isinstance(ctx_grp, dict) and ctx_grp:
+                        item.setdefault("group_stats", {})
+                        for k, v in ctx_grp.items():
+                            if k not in item["group_stats"] or not item["group_stats"].get(k):
+                                item["group_stats"][k] = v
+
+            # Tab 3 small table: the large dataset's stats as context, small table primary
+            if special_tab3_small and isinstance(live_df, pd.DataFrame) and not live_df.empty:
+                item.setdefault("context_stats", {}).update(
+                    {
+                        "large_computed_stats": describe_by_column(live_df),
+                        "large_group_stats": grouped_stats_selected(live_df),
+                    }
+                )
+                item["priority"] = "primary"
+        except Exception:
+            pass
+
+        # Chart-level metadata from the selection step
+        if isinstance(meta_all, dict) and isinstance(meta_all.get("meta"), dict):
+            item["meta"] = meta_all["meta"]
+        # Radar profiles exactly as drawn (shared with the Tab 3 figure callback)
+        if gid == "t3-graph-2":
+            try:
+                key = self.profile_key(frames.filters, frames.merged_t3) if self.profile_key else None
+                profiles = kpi_type_profiles(frames.t3_q2_chart, cache_key=key)
+                if not profiles.empty:
+                    item["meta"] = {
+                        **(item.get("meta") or {}),
+                        "chart_type": "radar",
+                        "type_profiles": to_records(
+                            profiles.round(2).rename_axis("outlet_type").reset_index()
+                        ),
+                    }
+            except Exception:
+                pass
+        if gid == "q2":
+            self._add_q2_month_mix(report, gid, analysis_df)
+        # Tab 3 first chart in combined mode: the live derived KPI gap table as well
+        if gid == "t3-graph-1" and req["insight_mode"] == "combined":
+            try:
+                gaps = kpi_gap_table(frames.t3_q1_chart)
+                self._append(report, f"{gid}-gaps", self.label(gid) + " — KPI gaps", filters, gaps)
+            except Exception:
+                pass
+        # Tab 2: stored meta overridden with the CURRENT axes, plus r/trendline stats
+        if gid == "t2-graph-dyn" and isinstance(meta_all, dict):
+            try:
+                live_meta = dict(meta_all.get("meta") or {})
+            except Exception:
+                live_meta = {}
+            if t2_x:
+                live_meta["x"] = t2_x
+            if t2_y:
+                live_meta["y"] = t2_y
+            if t2_color:
+                live_meta["color"] = t2_color
+            try:
+                key = self.corr_key(frames.filters) if self.corr_key else None
+                stats = correlation_stats(frames.t2_chart, cache_key=key)
+                pair = stats.pair(live_meta.get("x"), live_meta.get("y"))
+                if pair:
+                    live_meta["correlation_r"] = pair["pearson_r"]
+                    live_meta["pair_stats"] = pair
+                live_meta["strongest_kpi_pairs"] = stats.top_pairs(5)
+            except Exception:
+                pass
+            if live_meta:
+                item["meta"] = live_meta
+
+        if not compare_on:
+            # The combined dataset of all selected months
+            report.charts.append(item)
+            report.analysis_frames[gid] = payload_df if isinstance(payload_df, pd.DataFrame) else pd.DataFrame()
+            return
+        # Compare Months: per-month payloads only, so the LLM never sees the pooled frame
+        for mlabel in sel_months:
+            sub = report._month_frame(gid, mlabel)
+            if not isinstance(sub, pd.DataFrame) or sub.empty:
+                continue
+            self._append(
+                report,
+                f"{gid}-month-{mlabel}",
+                self.label(gid) + f" — {mlabel}",
+                {**(filters or {}), "months": [mlabel]},
+                sub,
+                stats=True,
+            )
+
+    def _add_q2_month_mix(self, report: ReportPayload, gid: str, detail: pd.DataFrame) -> None:
+        """Month x region category mix for q2 so the LLM can compare months."""
+        try:
+            d = detail if isinstance(detail, pd.DataFrame) else pd.DataFrame()
+            if d.empty or not {"Month", "outlet_category"}.issubset(d.columns) or "rgn" not in d.columns:
+                return
+            dd = d[["Month", "rgn", "outlet_category"]].dropna()
+            mix = (
+                dd.groupby(["Month", "rgn", "outlet_category"], dropna=False, observed=True)
+                .size()
+                .reset_index(name="count")
+            )
+            totals = mix.groupby(["Month", "rgn"], dropna=False, observed=True)["count"].transform("sum")
+            mix["pct"] = (mix["count"] / totals) * 100.0
+            self._append(
+                report, f"{gid}-month-mix", self.label(gid) + " — Month category mix",
+                report.request["filters"], mix,
+            )
+        except Exception:
+            pass
+
+    @staticmethod
+    def _append(report: ReportPayload, gid: str, label: str, filters, df: pd.DataFrame, stats: bool = False) -> None:
+        item = {
+            "graph_id": gid,
+            "graph_label": label,
+            "filters": filters,
+            "columns": [str(c) for c in df.columns],
+            "n_rows": len(df),
+            "rows": to_records(df),
+        }
+        if stats:
+            item["computed_stats"] = describe_by_column(df)
+            item["group_stats"] = grouped_stats_selected(df)
+        report.charts.append(item)
+        report.analysis_frames[gid] = df
+
+
+def _top_metadata(charts: List[Dict]) -> Dict:
+    """x/y/legend of the first chart whose meta names both axes."""
+    for ch in charts:
+        m = ch.get("meta") if isinstance(ch, dict) else None
+        if isinstance(m, dict) and ("x" in m and "y" in m):
+            return {
+                "x_axis": m.get("x", ""),
+                "y_axis": m.get("y", ""),
+                "legend": m.get("color") or m.get("legend") or "",
+            }
+    return {}
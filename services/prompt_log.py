@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from config.settings import (
+    PROMPT_LOG_BODIES_DIR,
+    PROMPT_LOG_ENABLED,
+    PROMPT_LOG_MAX_AGE_HOURS,
+    PROMPT_LOG_MAX_BYTES,
+    PROMPT_LOG_PATH,
+    PROMPT_LOG_RETENTION,
+    PROMPT_LOG_SAMPLE_RATE,
+)
+
+# Insight prompts are logged off the request thread: `log_prompt` only hashes
+# the prompt and hands two records to loguru, whose enqueued sinks append the
+# compact entry to PROMPT_LOG_PATH and write the body to
+# PROMPT_LOG_BODIES_DIR/<sha256>.txt.gz unless that hash is already stored.
+
+_SEEN: "OrderedDict[str, None]" = OrderedDict()
+_SEEN_SIZE = 4096
+_LOCK = threading.Lock()
+_configured = False
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def body_path(sha: str, bodies_dir: str = PROMPT_LOG_BODIES_DIR) -> str:
+    return os.path.join(bodies_dir, sha[:2], f"{sha}.txt.gz")
+
+
+def read_prompt(sha: str, bodies_dir: str = PROMPT_LOG_BODIES_DIR) -> Optional[str]:
+    """Prompt body for a logged `prompt_sha`, or None if it is not stored."""
+    try:
+        with gzip.open(body_path(sha, bodies_dir), "rt", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class SizeOrAgeRotation:
+    """loguru rotation callable: rotate at `max_bytes` or once the file is `max_age` seconds old."""
+
+    def __init__(self, max_bytes: int, max_age: float):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._opened = time.time()
+
+    def __call__(self, message, file) -> bool:
+        now = time.time()
+        too_big = self.max_bytes > 0 and file.tell() + len(message) > self.max_bytes
+        too_old = self.max_age > 0 and now - self._opened > self.max_age
+        if too_big or too_old:
+            self._opened = now
+            return True
+        return False
+
+
+def _write_body(message) -> None:
+    """Enqueued sink: store a prompt body once under its content hash."""
+    extra = message.record["extra"]
+    path = body_path(extra["prompt_sha"])
+    if os.path.exists(path):
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            f.write(extra["prompt_body"])
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+
+def configure_prompt_log() -> None:
+    """Add the prompt log sinks (after config.logging.configure_logging)."""
+    global _configured
+    if not PROMPT_LOG_ENABLED or _configured:
+        return
+    os.makedirs(os.path.dirname(PROMPT_LOG_PATH) or ".", exist_ok=True)
+    logger.add(
+        PROMPT_LOG_PATH,
+        format="{message}",
+        level="INFO",
+        filter=lambda record: "prompt_log" in record["extra"],
+        rotation=SizeOrAgeRotation(PROMPT_LOG_MAX_BYTES, PROMPT_LOG_MAX_AGE_HOURS * 3600),
+        retention=PROMPT_LOG_RETENTION,
+        compression="gz",
+        enqueue=True,
+    )
+    logger.add(
+        _write_body,
+        format="{message}",
+        level="INFO",
+        filter=lambda record: "prompt_body" in record["extra"],
+        enqueue=True,
+    )
+    _configured = True
+
+
+def log_prompt(prompt: str, meta: Dict[str, Any], **fields: Any) -> Optional[str]:
+    """Log one prompt (sampled by PROMPT_LOG_SAMPLE_RATE); returns its hash when logged.
+
+    `meta` and `fields` become the entry next to `prompt_sha` and `prompt_chars`;
+    the body is only enqueued the first time this process sees its hash.
+    """
+    if not PROMPT_LOG_ENABLED or not prompt:
+        return None
+    if PROMPT_LOG_SAMPLE_RATE < 1.0 and random.random() >= PROMPT_LOG_SAMPLE_RATE:
+        return None
+    try:
+        sha = prompt_hash(prompt)
+        entry = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            **meta,
+            "prompt_sha": sha,
+            "prompt_chars": len(prompt),
+            **fields,
+        }
+        logger.bind(prompt_log=True).info(json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str))
+        with _LOCK:
+            seen = sha in _SEEN
+            _SEEN[sha] = None
+            _SEEN.move_to_end(sha)
+            while len(_SEEN) > _SEEN_SIZE:
+                _SEEN.popitem(last=False)
+        if not seen:
+            logger.bind(prompt_body=prompt, prompt_sha=sha).info(sha)
+        return sha
+    except Exception:
+        return None
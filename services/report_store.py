@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+# Precomputed insight reports (see scripts/precompute_reports.py): one JSON
+# file per report, named by the hash of the request that produced it, so the
+# dashboard can answer a matching "Generate" click without calling the LLM.
+
+
+def _normalize_filters(filters: Dict | None) -> Dict:
+    """Filter state without empty values and with order-insensitive lists."""
+    out = {}
+    for k, v in (filters or {}).items():
+        if v in (None, "", [], {}):
+            continue
+        if isinstance(v, (list, tuple)):
+            v = sorted(str(x) for x in v)
+        out[str(k)] = v
+    return out
+
+
+def report_key(
+    selected_graphs: List[str],
+    filters: Dict | None,
+    tab3_local: Dict | None,
+    insight_mode: str | None,
+    filtered_scope: bool,
+    t2_view: Optional[List] = None,
+    data_version: str = "",
+) -> str:
+    """Stable id of one report request.
+
+    `t2_view` ([x, y, color]) only matters when the Tab 2 scatter is selected;
+    `data_version` (utils.data.months_fingerprint of the months in `filters`)
+    makes reports built from older data of those months miss.
+    """
+    graphs = [str(g) for g in selected_graphs or []]
+    request = {
+        "graphs": graphs,
+        "filters": _normalize_filters(filters),
+        "tab3_local": _normalize_filters(tab3_local),
+        "mode": insight_mode or "individual",
+        "filtered_scope": bool(filtered_scope),
+        "t2_view": list(t2_view) if t2_view and "t2-graph-dyn" in graphs else None,
+        "data_version": data_version,
+    }
+    raw = json.dumps(request, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _path(directory: str, key: str) -> str:
+    return os.path.join(directory, f"{key}.json")
+
+
+def load_report(directory: str, key: str) -> Optional[Dict]:
+    """The stored {"key", "sections", "provenance"} for key, or None."""
+    try:
+        with open(_path(directory, key), encoding="utf-8") as fh:
+            report = json.load(fh)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Unreadable precomputed report {key}: {e}")
+        return None
+    if not isinstance(report, dict) or not isinstance(report.get("sections"), list):
+        return None
+    return report
+
+
+def save_report(directory: str, key: str, sections: List[Dict], provenance: Dict) -> str:
+    """Persist sections ([{"title", "markdown"}]) with provenance; returns the file path."""
+    os.makedirs(directory, exist_ok=True)
+    path = _path(directory, key)
+    tmp = f"{path}.{os.getpid()}.part"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(
+            {"key": key, "sections": sections, "provenance": provenance},
+            fh,
+            ensure_ascii=False,
+            indent=2,
+        )
+    os.replace(tmp, path)
+    return path
+
+
+def delete_report(directory: str, key: str) -> None:
+    try:
+        os.remove(_path(directory, key))
+    except FileNotFoundError:
+        pass
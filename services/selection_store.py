@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import pandas as pd
+
+from config.settings import SESSION_STORE_MAX_ENTRIES, SESSION_STORE_URL
+from .session_store import SessionStore, backend_from_url
+
+
+class SelectionStore:
+    """Server-side snapshots of selected-chart DataFrames, keyed by session and graph id.
+
+    The browser `selected-data` store only keeps the small handles returned by
+    `put`; the frames live in the session store (see SESSION_STORE_URL) and are
+    looked up again by `get`.
+    """
+
+    def __init__(self, sessions: SessionStore):
+        self.sessions = sessions
+
+    def put(
+        self,
+        session_id: str,
+        graph_id: str,
+        slot: str,
+        df: pd.DataFrame,
+        max_rows: int = 300,
+    ) -> Dict:
+        """Keep the first `max_rows` rows of `df` and return a JSON-safe handle to them."""
+        if not isinstance(df, pd.DataFrame):
+            df = pd.DataFrame()
+        key = SessionStore.key(session_id, "selected", graph_id, slot)
+        ref = self.sessions.put(key, df.head(max_rows))
+        return {
+            "ref": ref,
+            "columns": [str(c) for c in df.columns],
+            "n_rows": int(len(df)),
+        }
+
+    def get(self, handle: Dict | None) -> Optional[pd.DataFrame]:
+        """Resolve a handle from `put`; None when it is unknown, stale or was evicted."""
+        if not is_handle(handle):
+            return None
+        df = self.sessions.get(handle["ref"])
+        return df if isinstance(df, pd.DataFrame) else None
+
+    def drop(self, session_id: str, graph_id: str | None = None) -> None:
+        """Forget one graph's snapshots, or all of the session's when `graph_id` is None."""
+        parts = ["selected"] + ([graph_id, ""] if graph_id is not None else [""])
+        self.sessions.drop(SessionStore.key(session_id, *parts))
+
+
+def is_handle(obj) -> bool:
+    return isinstance(obj, dict) and "ref" in obj and "columns" in obj
+
+
+# Shared by every kind of per-session server state (selections, view tables)
+session_store = SessionStore(backend_from_url(SESSION_STORE_URL, SESSION_STORE_MAX_ENTRIES))
+selection_store = SelectionStore(session_store)
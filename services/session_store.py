@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from loguru import logger
+
+
+class MemoryBackend:
+    """In-process LRU of key -> (version, value). Only safe for a single worker.
+
+    Versions come from one counter for the whole store, so a key written again
+    after it was evicted never reuses a version an old reference still holds.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+
+    def put(self, key: str, value: Any) -> int:
+        with self._lock:
+            self._version += 1
+            version = self._version
+            self._data[key] = (version, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            return version
+
+    def get(self, key: str) -> Optional[Tuple[int, Any]]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                self._data.move_to_end(key)
+            return item
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for k in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[k]
+
+
+class SQLiteBackend:
+    """File-backed store shared by all workers on one host (values are pickled).
+
+    Least-recently-touched rows beyond `max_entries` are pruned on write.
+    Versions come from a counter row that survives pruning (see MemoryBackend).
+    """
+
+    def __init__(self, path: str, max_entries: int = 4096):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._pid = os.getpid()
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS session_state ("
+                "key TEXT PRIMARY KEY, version INTEGER NOT NULL, "
+                "value BLOB NOT NULL, touched REAL NOT NULL)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS session_version (version INTEGER NOT NULL)")
+            conn.execute(
+                "INSERT INTO session_version(version) SELECT COALESCE(MAX(version), 0) FROM session_state "
+                "WHERE NOT EXISTS (SELECT 1 FROM session_version)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # Forked (e.g. a preloaded gunicorn worker): never reuse the parent's connections
+            self._local = threading.local()
+            self._pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            self._local.conn = conn
+        return conn
+
+    def put(self, key: str, value: Any) -> int:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._conn() as conn:
+            row = conn.execute("UPDATE session_version SET version = version + 1 RETURNING version").fetchone()
+            conn.execute(
+                "INSERT INTO session_state(key, version, value, touched) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET version = excluded.version, "
+                "value = excluded.value, touched = excluded.touched",
+                (key, row[0], blob, time.time()),
+            )
+            conn.execute(
+                "DELETE FROM session_state WHERE key IN (SELECT key FROM session_state "
+                "ORDER BY touched DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        return int(row[0])
+
+    def get(self, key: str) -> Optional[Tuple[int, Any]]:
+        with self._conn() as conn:
+            row = conn.execute(
+                "SELECT version, value FROM session_state WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE session_state SET touched = ? WHERE key = ?", (time.time(), key)
+            )
+        return int(row[0]), pickle.loads(row[1])
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "DELETE FROM session_state WHERE substr(key, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+
+
+class SessionStore:
+    """Versioned server-side session state on a pluggable backend.
+
+    `put` returns a small JSON-safe reference ({"key", "v"}) for browser stores;
+    `get` only resolves a reference while its version is still current, so a
+    stale handle never returns data written by a later update.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    @staticmethod
+    def key(session_id: str, *parts: str) -> str:
+        return "/".join([str(session_id), *map(str, parts)])
+
+    def put(self, key: str, value: Any) -> dict:
+        return {"key": key, "v": self.backend.put(key, value)}
+
+    def get(self, ref: dict | None) -> Any:
+        try:
+            key, version = ref["key"], ref.get("v")
+            item = self.backend.get(key)
+        except Exception:
+            return None
+        if item is None or (version is not None and item[0] != version):
+            return None
+        return item[1]
+
+    def drop(self, prefix: str) -> None:
+        try:
+            self.backend.delete_prefix(prefix)
+        except Exception as e:
+            logger.bind(tab="Session").warning(f"Session store delete failed: {e}")
+
+
+def backend_from_url(url: str | None, max_entries: int = 4096):
+    """"memory" (default) or "sqlite:///path/to/file.db"."""
+    if url and url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):], max_entries=max_entries)
+    return MemoryBackend(max_entries=max_entries)
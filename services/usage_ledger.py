@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+import pandas as pd
+from loguru import logger
+
+from config.settings import LLM_PRICING_FILE, USAGE_LEDGER_ENABLED, USAGE_LEDGER_PATH
+
+# One row per LLM call (or precomputed-report hit) with tokens, latency, cost
+# and who/what asked for it. Attribution comes from `usage_context`, which
+# callers nest around LLM calls (session and mode in generate_report, graph ids
+# per chart, stage/chunk in the map-reduce helpers); `generate_markdown_from_prompt`
+# records the call with the merged context.
+
+# USD per million tokens; "*" applies to models without an entry.
+# LLM_PRICING_FILE (JSON, same shape) overrides or extends these.
+DEFAULT_PRICING: Dict[str, Dict[str, float]] = {
+    "*": {"prompt": 7.0, "candidates": 21.0},
+    "gemini-1.5-pro": {"prompt": 7.0, "candidates": 21.0},
+    "gemini-1.5-flash": {"prompt": 0.35, "candidates": 1.05},
+    "gemini-2.0-flash": {"prompt": 0.1, "candidates": 0.4},
+}
+
+_CONTEXT: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("llm_usage_context", default={})
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS llm_calls ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL NOT NULL, session TEXT, model TEXT, "
+    "mode TEXT, stage TEXT, chunk_index INTEGER, prompt_sha TEXT, prompt_chars INTEGER, "
+    "prompt_tokens INTEGER, candidate_tokens INTEGER, latency_ms REAL, cost_usd REAL, "
+    "cache_hit INTEGER NOT NULL DEFAULT 0, status TEXT)",
+    "CREATE TABLE IF NOT EXISTS llm_call_graphs ("
+    "call_id INTEGER NOT NULL REFERENCES llm_calls(id) ON DELETE CASCADE, graph_id TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS llm_calls_ts ON llm_calls(ts)",
+    "CREATE INDEX IF NOT EXISTS llm_call_graphs_graph ON llm_call_graphs(graph_id)",
+    # Calls attributed to several charts count once for each of them
+    "CREATE VIEW IF NOT EXISTS usage_by_graph AS "
+    "SELECT g.graph_id, COUNT(*) AS calls, SUM(c.cache_hit) AS cache_hits, "
+    "SUM(c.prompt_tokens) AS prompt_tokens, ROUND(AVG(c.prompt_tokens)) AS avg_prompt_tokens, "
+    "MAX(c.prompt_tokens) AS max_prompt_tokens, SUM(c.candidate_tokens) AS candidate_tokens, "
+    "ROUND(AVG(c.prompt_chars)) AS avg_prompt_chars, ROUND(AVG(c.latency_ms), 1) AS avg_latency_ms, "
+    "ROUND(SUM(c.cost_usd), 6) AS cost_usd "
+    "FROM llm_calls c JOIN llm_call_graphs g ON g.call_id = c.id GROUP BY g.graph_id",
+)
+
+# Columns `summary` can group by ("graph_id" uses the per-chart attribution)
+SUMMARY_KEYS = ("graph_id", "session", "model", "mode", "stage", "day")
+
+
+@contextmanager
+def usage_context(**tags: Any) -> Iterator[Dict[str, Any]]:
+    """Attribute LLM calls inside the block; nested contexts override outer tags."""
+    merged = {**_CONTEXT.get(), **{k: v for k, v in tags.items() if v is not None}}
+    token = _CONTEXT.set(merged)
+    try:
+        yield merged
+    finally:
+        _CONTEXT.reset(token)
+
+
+def current_context() -> Dict[str, Any]:
+    return dict(_CONTEXT.get())
+
+
+def load_pricing(path: Optional[str] = LLM_PRICING_FILE) -> Dict[str, Dict[str, float]]:
+    pricing = {k: dict(v) for k, v in DEFAULT_PRICING.items()}
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for model, rates in json.load(f).items():
+                    pricing[model] = {**pricing.get(model, {}), **rates}
+        except Exception as e:
+            logger.warning(f"LLM pricing file {path} not loaded: {e}")
+    return pricing
+
+
+def cost_usd(
+    model: str,
+    prompt_tokens: int,
+    candidate_tokens: int,
+    pricing: Optional[Dict[str, Dict[str, float]]] = None,
+) -> float:
+    pricing = pricing if pricing is not None else PRICING
+    rates = pricing.get(model) or pricing.get("*") or {}
+    return (prompt_tokens or 0) / 1_000_000 * rates.get("prompt", 0.0) + (
+        candidate_tokens or 0
+    ) / 1_000_000 * rates.get("candidates", 0.0)
+
+
+class UsageLedger:
+    """SQLite ledger of LLM calls shared by all workers on one host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._pid = os.getpid()
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for stmt in _SCHEMA:
+                conn.execute(stmt)
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._pid != os.getpid():
+            # Forked (e.g. a preloaded gunicorn worker): never reuse the parent's connections
+            self._local = threading.local()
+            self._pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def record(
+        self,
+        *,
+        model: str,
+        prompt: str = "",
+        prompt_tokens: int = 0,
+        candidate_tokens: int = 0,
+        latency_s: float = 0.0,
+        cache_hit: bool = False,
+        status: str = "ok",
+        cost: Optional[float] = None,
+        **tags: Any,
+    ) -> int:
+        """Insert one call; tags default to the current usage_context."""
+        ctx = {**_CONTEXT.get(), **tags}
+        graph_ids = ctx.get("graph_ids") or []
+        if isinstance(graph_ids, str):
+            graph_ids = [graph_ids]
+        if cost is None:
+            cost = cost_usd(model, prompt_tokens, candidate_tokens)
+        with self._conn() as conn:
+            cur = conn.execute(
+                "INSERT INTO llm_calls(ts, session, model, mode, stage, chunk_index, prompt_sha, "
+                "prompt_chars, prompt_tokens, candidate_tokens, latency_ms, cost_usd, cache_hit, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(),
+                    ctx.get("session"),
+                    model,
+                    ctx.get("mode"),
+                    ctx.get("stage"),
+                    ctx.get("chunk"),
+                    hashlib.sha256(prompt.encode("utf-8")).hexdigest() if prompt else None,
+                    len(prompt),
+                    int(prompt_tokens or 0),
+                    int(candidate_tokens or 0),
+                    round(latency_s * 1000, 1),
+                    cost,
+                    int(bool(cache_hit)),
+                    status,
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO llm_call_graphs(call_id, graph_id) VALUES (?, ?)",
+                [(cur.lastrowid, str(g)) for g in dict.fromkeys(graph_ids)],
+            )
+        return int(cur.lastrowid)
+
+    def query(
+        self,
+        *,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        session: Optional[str] = None,
+        model: Optional[str] = None,
+        graph_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Calls (newest first) with a comma-separated `graph_ids` column."""
+        where, params = [], []
+        for clause, value in (
+            ("c.ts >= ?", since),
+            ("c.ts < ?", until),
+            ("c.session = ?", session),
+            ("c.model = ?", model),
+            ("c.id IN (SELECT call_id FROM llm_call_graphs WHERE graph_id = ?)", graph_id),
+        ):
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        sql = (
+            "SELECT c.*, (SELECT group_concat(graph_id, ',') FROM llm_call_graphs g "
+            "WHERE g.call_id = c.id) AS graph_ids FROM llm_calls c"
+            + (" WHERE " + " AND ".join(where) if where else "")
+            + " ORDER BY c.ts DESC"
+            + (f" LIMIT {int(limit)}" if limit else "")
+        )
+        df = pd.read_sql_query(sql, self._conn(), params=params)
+        df["ts"] = pd.to_datetime(df["ts"], unit="s", utc=True)
+        return df
+
+    def summary(self, by: Sequence[str] = ("graph_id",), **filters: Any) -> pd.DataFrame:
+        """Token, cost and latency aggregates per `by` (see SUMMARY_KEYS), largest prompts first."""
+        by = list(by)
+        unknown = [k for k in by if k not in SUMMARY_KEYS]
+        if unknown:
+            raise ValueError(f"cannot group by {unknown}; use {SUMMARY_KEYS}")
+        df = self.query(**filters)
+        if "graph_id" in by:
+            df = df.assign(graph_id=df["graph_ids"].fillna("").str.split(",")).explode("graph_id")
+        if "day" in by:
+            df = df.assign(day=df["ts"].dt.strftime("%Y-%m-%d"))
+        cols = [
+            "calls", "cache_hits", "prompt_tokens", "avg_prompt_tokens", "p95_prompt_tokens",
+            "candidate_tokens", "p50_latency_ms", "p95_latency_ms", "cost_usd",
+        ]
+        if df.empty:
+            return pd.DataFrame(columns=by + cols)
+        out = (
+            df.fillna({k: "" for k in by})
+            .groupby(by, sort=False)
+            .agg(
+                calls=("id", "size"),
+                cache_hits=("cache_hit", "sum"),
+                prompt_tokens=("prompt_tokens", "sum"),
+                avg_prompt_tokens=("prompt_tokens", "mean"),
+                p95_prompt_tokens=("prompt_tokens", lambda s: s.quantile(0.95)),
+                candidate_tokens=("candidate_tokens", "sum"),
+                p50_latency_ms=("latency_ms", "median"),
+                p95_latency_ms=("latency_ms", lambda s: s.quantile(0.95)),
+                cost_usd=("cost_usd", "sum"),
+            )
+            .reset_index()
+        )
+        return out.round(
+            {"avg_prompt_tokens": 0, "p95_prompt_tokens": 0, "p50_latency_ms": 1, "p95_latency_ms": 1, "cost_usd": 6}
+        ).sort_values("prompt_tokens", ascending=False, ignore_index=True)
+
+
+PRICING = load_pricing()
+_LEDGER: Optional[UsageLedger] = None
+_LEDGER_LOCK = threading.Lock()
+
+
+def get_ledger() -> Optional[UsageLedger]:
+    """The process-wide ledger at USAGE_LEDGER_PATH (None when disabled or unavailable)."""
+    global _LEDGER
+    if not USAGE_LEDGER_ENABLED:
+        return None
+    with _LEDGER_LOCK:
+        if _LEDGER is None:
+            try:
+                _LEDGER = UsageLedger(USAGE_LEDGER_PATH)
+            except Exception as e:
+                logger.warning(f"Usage ledger unavailable at {USAGE_LEDGER_PATH}: {e}")
+                return None
+        return _LEDGER
+
+
+def record_usage(**kwargs: Any) -> None:
+    """Best-effort UsageLedger.record on the process-wide ledger."""
+    ledger = get_ledger()
+    if ledger is None:
+        return
+    try:
+        ledger.record(**kwargs)
+    except Exception as e:
+        logger.warning(f"Usage ledger write failed: {e}")
+
@@ -0,0 +1,52 @@
+OUTLET_KEY = "sales_outlet"
+
+# Every column the Tab 1-3 queries read (data_layer.delta derives their results from these)
+OUTLET_COLUMNS = [
+    "sales_outlet",
+    "rgn",
+    "outlet_category",
+    "outlet_type",
+    "rate_performance",
+    "rate_quality",
+    "total_score",
+    "new_car_reg_pct",
+    "gear_up_ach_pct",
+    "ins_renew_1st_pct",
+    "ins_renew_overall_pct",
+    "pov_pct",
+    "intake_pct",
+    "revenue_pct",
+    "parts_pct",
+    "lubricant_pct",
+    "cs_sales_pct",
+    "nps_sales_pct",
+    "eappointment_pct",
+    "qpi_pct",
+    "cs_service_pct",
+]
+
+_COLS = ",\n    ".join(OUTLET_COLUMNS)
+_HASH = f"BINARY_CHECKSUM({', '.join(OUTLET_COLUMNS)}) AS row_hash"
+
+
+def _literal(value) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def build_outlet_hash_sql_map(table_name: str) -> dict[str, str]:
+    """One (outlet key, row hash) pair per outlet row."""
+    t = f"cr_kpi.{table_name}"
+    return {"hashes": f"SELECT {OUTLET_KEY}, {_HASH} FROM {t};"}
+
+
+def build_outlet_rows_sql_map(table_name: str, keys=None, chunk: int = 1000) -> dict[str, str]:
+    """Outlet rows (+ row hash) of the whole table, or only of `keys` in chunks of `chunk`."""
+    t = f"cr_kpi.{table_name}"
+    select = f"SELECT\n    {_COLS},\n    {_HASH}\nFROM {t}"
+    if keys is None:
+        return {"rows": f"{select};"}
+    keys = list(keys)
+    return {
+        f"rows_{i // chunk}": f"{select}\nWHERE {OUTLET_KEY} IN ({', '.join(map(_literal, keys[i:i + chunk]))});"
+        for i in range(0, len(keys), chunk)
+    }
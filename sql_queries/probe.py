@@ -0,0 +1,11 @@
+def build_probe_sql_map(table_name: str) -> dict[str, str]:
+    """Row count and content checksum of a month table (cheap change detection)."""
+    t = f"cr_kpi.{table_name}"
+    return {
+        "probe": f"""
+SELECT
+    COUNT_BIG(*) AS row_count,
+    CHECKSUM_AGG(BINARY_CHECKSUM(*)) AS row_checksum
+FROM {t};
+""",
+    }
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 
@@ -10,7 +11,60 @@ def uniq(series_list):
     return list(vals)
 
 
-def pack_df(df: pd.DataFrame, max_rows: int = 300):
-    """Pack a DataFrame into a light dict for JSON transport and table preview."""
-    recs = df.head(max_rows).to_dict("records")
-    return {"columns": list(df.columns), "records": recs, "n_rows": int(len(df))}
+def widen_float32(df: pd.DataFrame) -> pd.DataFrame:
+    """Return `df` with float32 columns widened to float64 via their shortest repr.
+
+    Compact frames keep KPI columns as float32; widening through `str` keeps
+    JSON/table output and derived stats at the original 2-decimal values
+    (123.38, not 123.37999725).
+    """
+    f32 = [c for c in df.columns if df[c].dtype == np.float32]
+    if f32:
+        df = df.astype({c: str for c in f32}).astype({c: np.float64 for c in f32})
+    return df
+
+
+def to_records(df: pd.DataFrame) -> list[dict]:
+    """`df.to_dict("records")` with float32 columns widened (see `widen_float32`)."""
+    return widen_float32(df).to_dict("records")
+
+
+def datasets_fingerprint(monthly_datasets: dict | None) -> str:
+    """Content hash of every frame in {month: {tab: {key: DataFrame}}}.
+
+    Changes whenever any month's rows, columns or values change, so it can
+    version caches and precomputed artefacts derived from the data.
+    """
+    import hashlib
+
+    h = hashlib.sha1()
+    for month, tabs in sorted((monthly_datasets or {}).items(), key=lambda kv: str(kv[0])):
+        for tab_key, frames in sorted((tabs or {}).items(), key=lambda kv: str(kv[0])):
+            for key, df in sorted((frames or {}).items(), key=lambda kv: str(kv[0])):
+                if not isinstance(df, pd.DataFrame):
+                    continue
+                h.update(f"{month}|{tab_key}|{key}|{list(map(str, df.columns))}".encode("utf-8"))
+                try:
+                    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+                except TypeError:
+                    # Unhashable cells (lists/dicts): fall back to their text form
+                    h.update(df.astype(str).to_csv(index=False).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def months_fingerprint(monthly_datasets: dict | None, months, cache: dict | None = None) -> str:
+    """Fingerprint of just `months` of `monthly_datasets`, built from one datasets_fingerprint per month.
+
+    Reports and other artefacts keyed on it keep matching when a month they
+    do not cover is reloaded. `cache` ({month: fingerprint}) memoizes the
+    per-month parts; drop a month's entry when its data changes.
+    """
+    parts = []
+    for month in sorted({str(m) for m in months or []}):
+        fp = None if cache is None else cache.get(month)
+        if fp is None:
+            fp = datasets_fingerprint({month: (monthly_datasets or {}).get(month)})
+            if cache is not None:
+                cache[month] = fp
+        parts.append(f"{month}:{fp}")
+    return ",".join(parts)
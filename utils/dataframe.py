@@ -5,16 +5,26 @@ from typing import Dict
 
 
 def fill_numeric_nans(df: pd.DataFrame) -> pd.DataFrame:
+    """Replace NaN/inf in numeric columns with 0, rewriting only the columns that need it.
+
+    Returns `df` itself when nothing needs filling.
+    """
     if not isinstance(df, pd.DataFrame) or df.empty:
         return df
-    out = df.copy()
     try:
-        num_cols = [c for c in out.columns if pd.api.types.is_numeric_dtype(out[c])]
-        if num_cols:
-            out[num_cols] = out[num_cols].replace([float("inf"), float("-inf")], pd.NA).fillna(0)
+        num_cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+        if not num_cols:
+            return df
+        vals = df[num_cols]
+        bad = vals.isna() | vals.isin([float("inf"), float("-inf")])
+        dirty = [c for c in num_cols if bad[c].any()]
+        if not dirty:
+            return df
+        out = df.copy(deep=False)
+        out[dirty] = out[dirty].replace([float("inf"), float("-inf")], pd.NA).fillna(0)
+        return out
     except Exception:
-        pass
-    return out
+        return df
 
 
 def has_real_rows(df: pd.DataFrame) -> bool:
@@ -28,6 +38,19 @@ def has_real_rows(df: pd.DataFrame) -> bool:
         return False
 
 
+def casefold_mask(s: pd.Series, values) -> pd.Series:
+    """Rows of `s` equal to one of `values`, ignoring case and surrounding spaces.
+
+    Categoricals are compared on their categories, so the column itself is
+    never turned into strings.
+    """
+    wanted = {str(v).strip().casefold() for v in values}
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        cats = s.cat.categories
+        return s.isin(cats[cats.astype(str).str.strip().str.casefold().isin(wanted)])
+    return s.astype(str).str.strip().str.casefold().isin(wanted)
+
+
 def _drop_restore_all_na_for_concat(a: pd.DataFrame, b: pd.DataFrame) -> pd.DataFrame:
     """Concatenate two non-empty DataFrames while avoiding pandas' FutureWarning
     about empty/all-NA columns dtype inference.
@@ -76,8 +99,7 @@ def combine_month_frames(
         for k, df in (tab or {}).items():
             if not isinstance(df, pd.DataFrame):
                 continue
-            d2 = fill_numeric_nans(df.copy())
-            d2["Month"] = label
+            d2 = fill_numeric_nans(df).assign(Month=label)
             prev = res.get(k)
             combined = concat_valid(prev, d2)
             res[k] = combined if combined is not None else d2
@@ -118,7 +118,7 @@ def group_extents_by(df: pd.DataFrame, group_col: str, cols: list[str] | None =
         return {}
     out: Dict[str, Dict[str, Any]] = {}
     try:
-        gb = df.groupby(group_col, dropna=False)
+        gb = df.groupby(group_col, dropna=False, observed=True)
         for gval, sub in gb:
             per_col: Dict[str, Any] = {}
             for c in cols:
@@ -222,18 +222,18 @@ def category_mix_by_month(
     if not cat_col:
         return pd.DataFrame(columns=[month_col, "category", "count", "pct"])
     try:
-        d = df[[month_col, cat_col]].dropna(subset=[cat_col]).copy()
+        d = df[[month_col, cat_col]].dropna(subset=[cat_col])
     except Exception:
         return pd.DataFrame(columns=[month_col, "category", "count", "pct"])
     try:
         grp = (
-            d.groupby([month_col, cat_col], dropna=False)
+            d.groupby([month_col, cat_col], dropna=False, observed=True)
             .size()
             .reset_index(name="count")
         )
         # Normalize label to a unified 'category' column
         grp = grp.rename(columns={cat_col: "category"})
-        totals = grp.groupby(month_col, dropna=False)["count"].transform("sum")
+        totals = grp.groupby(month_col, dropna=False, observed=True)["count"].transform("sum")
         grp["pct"] = (grp["count"] / totals) * 100.0
         return grp
     except Exception:
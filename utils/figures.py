@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Lightweight plotly.express stand-ins for the hot callbacks.
+#
+# Traces are built as plain dicts straight from NumPy arrays (one per color
+# group, in order of first appearance, same names/colors/hover/customdata
+# layout as px) and wrapped in a go.Figure without validating them. Validation
+# is switched back on afterwards so the callers' update_layout/add_vline
+# post-processing is still coerced (e.g. title strings -> {"text": ...}).
+
+_TEMPLATES: Dict[str, go.layout.Template] = {}
+
+
+def _template() -> go.layout.Template:
+    """Default template object, built once per template name and shared by all figures."""
+    name = pio.templates.default
+    if name not in _TEMPLATES:
+        _TEMPLATES[name] = pio.templates[name]
+    return _TEMPLATES[name]
+
+
+def _colorway() -> List[str]:
+    try:
+        return list(_template().layout.colorway) or ["#636efa"]
+    except Exception:
+        return ["#636efa"]
+
+
+def fast_figure(data: Optional[List[dict]] = None, layout: Optional[dict] = None) -> go.Figure:
+    """go.Figure from trusted trace/layout dicts, skipping property validation."""
+    lay = {"template": _template(), "legend": {"tracegroupgap": 0}}
+    lay.update(layout or {})
+    fig = go.Figure(data=data or [], layout=lay, _validate=False)
+    for obj in (fig, fig.layout, *fig.data):
+        obj._validate = True
+    return fig
+
+
+def _title(title: Optional[str]) -> dict:
+    return {"title": {"text": title}} if title else {"margin": {"t": 60}}
+
+
+def _color_groups(
+    df: pd.DataFrame,
+    color: Optional[str],
+    color_map: Optional[Dict[str, str]] = None,
+    sequence: Optional[List[str]] = None,
+):
+    """Yield (value, row positions, color) per color group like px does.
+
+    Unmapped values take sequence[len(mapping) % len(sequence)], where the
+    mapping grows as values are seen — the same rule px applies.
+    """
+    seq = list(sequence or _colorway())
+    if color is None:
+        yield None, np.arange(len(df)), seq[0]
+        return
+    mapping = dict(color_map or {})
+    codes, uniques = pd.factorize(df[color], sort=False)
+    for i, val in enumerate(uniques):
+        if val not in mapping:
+            mapping[val] = seq[len(mapping) % len(seq)]
+        yield val, np.flatnonzero(codes == i), mapping[val]
+
+
+def _values(df: pd.DataFrame, col: str) -> np.ndarray:
+    s = df[col]
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return np.asarray(s.astype(object))
+    return s.to_numpy()
+
+
+def _customdata(df: pd.DataFrame, cols: List[str]) -> Optional[np.ndarray]:
+    if not cols:
+        return None
+    return np.column_stack([_values(df, c).astype(object) for c in cols])
+
+
+def _hover(parts: Iterable[str]) -> str:
+    return "<br>".join(parts) + "<extra></extra>"
+
+
+def _xy_layout(x: Optional[str], y: Optional[str], color: Optional[str], title: Optional[str]) -> dict:
+    layout = {
+        "xaxis": {"anchor": "y", "domain": [0.0, 1.0]},
+        "yaxis": {"anchor": "x", "domain": [0.0, 1.0]},
+        **_title(title),
+    }
+    if x:
+        layout["xaxis"]["title"] = {"text": x}
+    if y:
+        layout["yaxis"]["title"] = {"text": y}
+    if color:
+        layout["legend"] = {"title": {"text": color}, "tracegroupgap": 0}
+    return layout
+
+
+def bar(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    color: Optional[str] = None,
+    orientation: str = "v",
+    barmode: str = "relative",
+    title: Optional[str] = None,
+    color_map: Optional[Dict[str, str]] = None,
+    sequence: Optional[List[str]] = None,
+    custom_data: Optional[List[str]] = None,
+) -> go.Figure:
+    """px.bar equivalent (one trace per color group)."""
+    traces = []
+    for val, idx, col in _color_groups(df, color, color_map, sequence):
+        d = df.iloc[idx]
+        prefix = [f"{color}={val}"] if color else []
+        t = {
+            "type": "bar",
+            "x": _values(d, x),
+            "y": _values(d, y),
+            "orientation": orientation,
+            "name": "" if val is None else str(val),
+            "legendgroup": "" if val is None else str(val),
+            "showlegend": color is not None,
+            "marker": {"color": col, "pattern": {"shape": ""}},
+            "textposition": "auto",
+            "hovertemplate": _hover(prefix + [f"{x}=%{{x}}", f"{y}=%{{y}}"]),
+            "xaxis": "x",
+            "yaxis": "y",
+        }
+        cd = _customdata(d, list(custom_data or []))
+        if cd is not None:
+            t["customdata"] = cd
+        if color is not None and barmode == "group":
+            t["offsetgroup"] = str(val)
+            t["alignmentgroup"] = "True"
+        traces.append(t)
+    layout = _xy_layout(x, y, color, title)
+    layout["barmode"] = barmode
+    return fast_figure(traces, layout)
+
+
+def scatter(
+    df: Optional[pd.DataFrame] = None,
+    x: Optional[str] = None,
+    y: Optional[str] = None,
+    color: Optional[str] = None,
+    text: Optional[str] = None,
+    hover_data: Optional[List[str]] = None,
+    custom_data: Optional[List[str]] = None,
+    title: Optional[str] = None,
+    color_map: Optional[Dict[str, str]] = None,
+    sequence: Optional[List[str]] = None,
+    render_mode: str = "svg",
+) -> go.Figure:
+    """px.scatter equivalent; with no data it returns the titled empty figure.
+
+    render_mode="webgl" emits Scattergl traces (same data/hover/customdata).
+    """
+    if df is None or x is None or y is None:
+        return fast_figure([], _xy_layout(None, None, None, title))
+    # customdata = custom_data columns, then extra hover columns (px layout)
+    cd_cols = list(custom_data or [])
+    for c in hover_data or []:
+        if c not in cd_cols and c not in (x, y, text):
+            cd_cols.append(c)
+    traces = []
+    for val, idx, col in _color_groups(df, color, color_map, sequence):
+        d = df.iloc[idx]
+        parts = []
+        if color and color != text:
+            ref = f"%{{customdata[{cd_cols.index(color)}]}}" if color in cd_cols else val
+            parts.append(f"{color}={ref}")
+        if text:
+            parts.append(f"{text}=%{{text}}")
+        parts += [f"{x}=%{{x}}", f"{y}=%{{y}}"]
+        parts += [
+            f"{c}=%{{customdata[{cd_cols.index(c)}]}}"
+            for c in (hover_data or [])
+            if c in cd_cols and c != color
+        ]
+        t = {
+            "type": "scattergl" if render_mode == "webgl" else "scatter",
+            "x": _values(d, x),
+            "y": _values(d, y),
+            "mode": "markers+text" if text else "markers",
+            "name": "" if val is None else str(val),
+            "legendgroup": "" if val is None else str(val),
+            "showlegend": color is not None,
+            "marker": {"color": col, "symbol": "circle"},
+            "orientation": "v",
+            "hovertemplate": _hover(parts),
+            "xaxis": "x",
+            "yaxis": "y",
+        }
+        if text:
+            t["text"] = _values(d, text)
+        cd = _customdata(d, cd_cols)
+        if cd is not None:
+            t["customdata"] = cd
+        traces.append(t)
+    return fast_figure(traces, _xy_layout(x, y, color, title))
+
+
+def density_heatmap(
+    df: pd.DataFrame,
+    x: str,
+    y: str,
+    nbins: int = 50,
+    title: Optional[str] = None,
+) -> go.Figure:
+    """px.density_heatmap equivalent, binned here so only nbins x nbins counts are sent."""
+    xv = pd.to_numeric(df[x], errors="coerce").to_numpy(dtype=float)
+    yv = pd.to_numeric(df[y], errors="coerce").to_numpy(dtype=float)
+    ok = np.isfinite(xv) & np.isfinite(yv)
+    if not ok.any():
+        return fast_figure([], _xy_layout(x, y, None, title))
+    counts, xe, ye = np.histogram2d(xv[ok], yv[ok], bins=nbins)
+    t = {
+        "type": "heatmap",
+        "x": (xe[:-1] + xe[1:]) / 2,
+        "y": (ye[:-1] + ye[1:]) / 2,
+        # empty bins stay transparent
+        "z": np.where(counts > 0, counts, np.nan).T,
+        "colorscale": "Blues",
+        "colorbar": {"title": {"text": "outlets"}},
+        "hovertemplate": _hover([f"{x}=%{{x}}", f"{y}=%{{y}}", "outlets=%{z}"]),
+        "xaxis": "x",
+        "yaxis": "y",
+    }
+    return fast_figure([t], _xy_layout(x, y, None, title))
+
+
+def pie(
+    df: pd.DataFrame,
+    names: str,
+    values: str,
+    title: Optional[str] = None,
+    color_map: Optional[Dict[str, str]] = None,
+    hole: Optional[float] = None,
+) -> go.Figure:
+    """px.pie equivalent with slices colored by `names` through `color_map`."""
+    labels = _values(df, names)
+    seq = _colorway()
+    mapping = dict(color_map or {})
+    for v in pd.unique(labels):
+        if v not in mapping:
+            mapping[v] = seq[len(mapping) % len(seq)]
+    t = {
+        "type": "pie",
+        "labels": labels,
+        "values": _values(df, values),
+        "customdata": _customdata(df, [names]),
+        "marker": {"colors": [mapping[v] for v in labels]},
+        "domain": {"x": [0.0, 1.0], "y": [0.0, 1.0]},
+        "name": "",
+        "legendgroup": "",
+        "showlegend": True,
+        "hovertemplate": _hover([f"{names}=%{{customdata[0]}}", f"{values}=%{{value}}"]),
+    }
+    if hole is not None:
+        t["hole"] = hole
+    return fast_figure([t], _title(title))
+
+
+def line_polar(
+    df: pd.DataFrame,
+    r: str,
+    theta: str,
+    line_close: bool = True,
+    title: Optional[str] = None,
+) -> go.Figure:
+    """px.line_polar equivalent for a single closed profile."""
+    rv, tv = _values(df, r), _values(df, theta)
+    if line_close and len(rv):
+        rv, tv = np.append(rv, rv[:1]), np.append(tv, tv[:1])
+    t = {
+        "type": "scatterpolar",
+        "r": rv,
+        "theta": tv,
+        "mode": "lines",
+        "name": "",
+        "legendgroup": "",
+        "showlegend": False,
+        "line": {"color": _colorway()[0], "dash": "solid"},
+        "marker": {"symbol": "circle"},
+        "subplot": "polar",
+        "hovertemplate": _hover([f"{r}=%{{r}}", f"{theta}=%{{theta}}"]),
+    }
+    layout = {
+        "polar": {
+            "domain": {"x": [0.0, 1.0], "y": [0.0, 1.0]},
+            "angularaxis": {"direction": "clockwise", "rotation": 90},
+        },
+        **_title(title),
+    }
+    return fast_figure([t], layout)
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import functools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# In-process metrics for Dash callbacks, SQL queries, LLM calls and caches.
+# `render()` emits the Prometheus text format (served on GET /metrics) and
+# `recent_summary()` feeds the diagnostics panel from a rolling window of the
+# latest callback requests. Values are per worker process.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7)
+
+_METRICS = {
+    "insightdash_callback_seconds": (
+        "histogram",
+        "Callback latency; phase=compute is the callback body (pandas + figure building), "
+        "serialize is Dash's JSON encoding and response overhead, total the whole request",
+    ),
+    "insightdash_callback_requests_total": ("counter", "Callback invocations by outcome"),
+    "insightdash_callback_request_bytes": ("histogram", "Callback request body size"),
+    "insightdash_callback_response_bytes": ("histogram", "Callback response body size"),
+    "insightdash_cache_requests_total": ("counter", "Cache lookups by cache and result"),
+    "insightdash_sql_query_seconds": ("histogram", "execute_queries time per SQL key"),
+    "insightdash_sql_rows_total": ("counter", "Rows returned per SQL key"),
+    "insightdash_sql_errors_total": ("counter", "Failed SQL queries per key"),
+    "insightdash_llm_request_seconds": ("histogram", "LLM call latency by model and outcome"),
+    "insightdash_llm_tokens_total": ("counter", "LLM tokens by model and kind"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Optional[Dict]) -> Labels:
+    return tuple(sorted((str(k), str(v)) for k, v in (labels or {}).items()))
+
+
+def _fmt_labels(labels: Labels, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    esc = lambda v: v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")  # noqa: E731
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in items) + "}"
+
+
+def _fmt_num(v: float) -> str:
+    if v == math.inf:
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class Registry:
+    """Thread-safe counters and cumulative histograms keyed by (name, labels)."""
+
+    def __init__(self, window: int = 500):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._hists: Dict[Tuple[str, Labels], list] = {}
+        self.recent: "deque[Dict]" = deque(maxlen=window)
+
+    def inc(self, name: str, labels: Optional[Dict] = None, value: float = 1.0) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        labels: Optional[Dict] = None,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            h = self._hists.get(key)
+            if h is None:
+                h = self._hists[key] = [tuple(buckets), [0] * len(buckets), 0.0, 0]
+            for i, bound in enumerate(h[0]):
+                if value <= bound:
+                    h[1][i] += 1
+            h[2] += value
+            h[3] += 1
+
+    def record(self, event: Dict) -> None:
+        with self._lock:
+            self.recent.append(event)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._hists.clear()
+            self.recent.clear()
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self._counters)
+            hists = {k: (v[0], list(v[1]), v[2], v[3]) for k, v in self._hists.items()}
+        lines: List[str] = []
+        for name in sorted({k[0] for k in counters} | {k[0] for k in hists}):
+            kind, help_text = _METRICS.get(name, ("untyped", ""))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (n, labels), value in sorted(counters.items()):
+                if n == name:
+                    lines.append(f"{name}{_fmt_labels(labels)} {_fmt_num(value)}")
+            for (n, labels), (bounds, counts, total, count) in sorted(hists.items()):
+                if n != name:
+                    continue
+                for bound, c in zip(bounds, counts):
+                    lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', _fmt_num(bound))])} {c}")
+                lines.append(f"{name}_bucket{_fmt_labels(labels, [('le', '+Inf')])} {count}")
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_num(total)}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def recent_summary(self) -> List[Dict]:
+        """Per-callback stats over the rolling window, slowest (p95) first."""
+        with self._lock:
+            events = list(self.recent)
+        by_cb: Dict[str, List[Dict]] = {}
+        for e in events:
+            by_cb.setdefault(e["callback"], []).append(e)
+        rows = []
+        for cb, evs in by_cb.items():
+            totals = sorted(e["total"] for e in evs)
+
+            def pct(p):
+                return totals[min(len(totals) - 1, int(round(p * (len(totals) - 1))))]
+
+            rows.append(
+                {
+                    "callback": cb,
+                    "calls": len(evs),
+                    "p50_ms": round(pct(0.5) * 1000, 1),
+                    "p95_ms": round(pct(0.95) * 1000, 1),
+                    "max_ms": round(totals[-1] * 1000, 1),
+                    "compute_ms": round(sum(e["compute"] for e in evs) / len(evs) * 1000, 1),
+                    "serialize_ms": round(sum(e["serialize"] for e in evs) / len(evs) * 1000, 1),
+                    "resp_kb": round(sum(e["response_bytes"] for e in evs) / len(evs) / 1024, 1),
+                }
+            )
+        return sorted(rows, key=lambda r: r["p95_ms"], reverse=True)
+
+
+REGISTRY = Registry()
+
+
+def inc(name: str, labels: Optional[Dict] = None, value: float = 1.0) -> None:
+    REGISTRY.inc(name, labels, value)
+
+
+def observe(name: str, value: float, labels: Optional[Dict] = None, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+    REGISTRY.observe(name, value, labels, buckets)
+
+
+def cache_event(cache: str, hit: bool) -> None:
+    REGISTRY.inc("insightdash_cache_requests_total", {"cache": cache, "result": "hit" if hit else "miss"})
+
+
+@contextmanager
+def timed(name: str, labels: Optional[Dict] = None) -> Iterator[Dict]:
+    """Observe the block's duration in histogram `name`; labels may be extended inside."""
+    labels = dict(labels or {})
+    t0 = time.perf_counter()
+    try:
+        yield labels
+    finally:
+        REGISTRY.observe(name, time.perf_counter() - t0, labels)
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def recent_summary() -> List[Dict]:
+    return REGISTRY.recent_summary()
+
+
+def instrument_dash(app) -> None:
+    """Time every callback registered through `app.callback` from now on.
+
+    The callback body is timed by a wrapper; a request hook adds the total
+    request time and request/response sizes of /_dash-update-component.
+    """
+    from dash.exceptions import PreventUpdate
+    from flask import g, has_request_context, request
+
+    register_callback = app.callback
+
+    def timed_callback(func):
+        name = getattr(func, "__name__", "callback")
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            status = "ok"
+            try:
+                return func(*args, **kwargs)
+            except PreventUpdate:
+                status = "prevented"
+                raise
+            except Exception:
+                status = "error"
+                raise
+            finally:
+                dt = time.perf_counter() - t0
+                REGISTRY.inc("insightdash_callback_requests_total", {"callback": name, "status": status})
+                REGISTRY.observe("insightdash_callback_seconds", dt, {"callback": name, "phase": "compute"})
+                if has_request_context():
+                    g.metrics_callback = name
+                    g.metrics_compute = dt
+
+        return wrapper
+
+    def callback(*args, **kwargs):
+        decorator = register_callback(*args, **kwargs)
+        return lambda func: decorator(timed_callback(func))
+
+    app.callback = callback
+
+    @app.server.before_request
+    def _metrics_start():
+        g.metrics_start = time.perf_counter()
+
+    @app.server.after_request
+    def _metrics_finish(response):
+        name = g.pop("metrics_callback", None)
+        start = g.pop("metrics_start", None)
+        if name is None or start is None:
+            return response
+        total = time.perf_counter() - start
+        compute = g.pop("metrics_compute", 0.0)
+        serialize = max(total - compute, 0.0)
+        req_bytes = request.content_length or 0
+        resp_bytes = 0 if response.is_streamed else (response.calculate_content_length() or 0)
+        labels = {"callback": name}
+        REGISTRY.observe("insightdash_callback_seconds", total, {**labels, "phase": "total"})
+        REGISTRY.observe("insightdash_callback_seconds", serialize, {**labels, "phase": "serialize"})
+        REGISTRY.observe("insightdash_callback_request_bytes", req_bytes, labels, BYTES_BUCKETS)
+        REGISTRY.observe("insightdash_callback_response_bytes", resp_bytes, labels, BYTES_BUCKETS)
+        REGISTRY.record(
+            {
+                "callback": name,
+                "ts": time.time(),
+                "total": total,
+                "compute": compute,
+                "serialize": serialize,
+                "request_bytes": req_bytes,
+                "response_bytes": resp_bytes,
+            }
+        )
+        return response
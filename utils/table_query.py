@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import json
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import cache_event
+
+# Server-side paging/sorting/filtering for DataTables with
+# page_action/sort_action/filter_action="custom": the full frame stays on the
+# server and each request returns one page of the filtered, sorted result.
+
+# filter_query operator spellings -> canonical operator
+_OPERATORS = {
+    "ge": ">=", ">=": ">=",
+    "le": "<=", "<=": "<=",
+    "lt": "<", "<": "<",
+    "gt": ">", ">": ">",
+    "ne": "!=", "!=": "!=",
+    "eq": "=", "=": "=",
+    "contains": "contains",
+    "datestartswith": "datestartswith",
+}
+_CLAUSE = re.compile(r"^\s*\{(?P<col>.+?)\}\s+(?P<op>\S+)\s+(?P<value>.*?)\s*$", re.S)
+
+_CACHE: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_CACHE_SIZE = 32
+_LOCK = threading.Lock()
+
+
+def split_filter_part(part: str) -> Optional[Tuple[str, str, object, bool]]:
+    """Parse one `{column} op value` clause into (column, operator, value, ignore_case).
+
+    Operators may carry the DataTable case prefixes (icontains, seq, ...);
+    `is blank` / `is nil` map to the "blank" operator.
+    """
+    m = _CLAUSE.match(part)
+    if m is None:
+        return None
+    op, raw = m.group("op"), m.group("value")
+    if op == "is" and raw in ("blank", "nil"):
+        return m.group("col"), "blank", None, False
+    ignore_case = False
+    if op not in _OPERATORS and op[:1] in ("i", "s") and op[1:] in _OPERATORS:
+        ignore_case, op = op[0] == "i", op[1:]
+    if op not in _OPERATORS:
+        return None
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in "'\"`":
+        value: object = raw[1:-1].replace("\\" + raw[0], raw[0])
+    else:
+        try:
+            value = float(raw)
+        except ValueError:
+            value = raw
+    return m.group("col"), _OPERATORS[op], value, ignore_case
+
+
+def apply_filter(df: pd.DataFrame, filter_query: Optional[str]) -> pd.DataFrame:
+    """Rows of df matching every clause of filter_query (unknown columns are ignored)."""
+    if not filter_query:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    for part in filter_query.split(" && "):
+        parsed = split_filter_part(part)
+        if parsed is None or parsed[0] not in df.columns:
+            continue
+        name, op, value, ignore_case = parsed
+        s = df[name]
+        numeric = pd.api.types.is_numeric_dtype(s) and isinstance(value, float)
+        if op == "blank":
+            m = s.isna() | (s.astype(str).str.strip() == "")
+        elif op in ("contains", "datestartswith") or not numeric:
+            text = s.astype(str).where(s.notna(), "")
+            v = str(value if not isinstance(value, float) or not value.is_integer() else int(value))
+            if ignore_case:
+                text, v = text.str.lower(), v.lower()
+            if op == "datestartswith":
+                m = text.str.startswith(v)
+            elif op == "contains":
+                m = text.str.contains(v, regex=False)
+            elif op in ("=", "!="):
+                m = (text == v) if op == "=" else (text != v)
+            else:
+                m = {"<": text < v, "<=": text <= v, ">": text > v, ">=": text >= v}[op]
+        else:
+            m = {
+                "=": s == value,
+                "!=": s != value,
+                "<": s < value,
+                "<=": s <= value,
+                ">": s > value,
+                ">=": s >= value,
+            }[op]
+        mask &= np.asarray(m, dtype=bool)
+    return df[mask]
+
+
+def apply_sort(df: pd.DataFrame, sort_by: Optional[List[Dict]]) -> pd.DataFrame:
+    """Stable sort by DataTable sort_by ([{"column_id", "direction"}]), NaNs last."""
+    cols = [s for s in (sort_by or []) if s.get("column_id") in df.columns]
+    if not cols:
+        return df
+    return df.sort_values(
+        [s["column_id"] for s in cols],
+        ascending=[s.get("direction") != "desc" for s in cols],
+        kind="mergesort",
+        na_position="last",
+    )
+
+
+def query_frame(
+    df: pd.DataFrame,
+    page_current: int = 0,
+    page_size: int = 10,
+    sort_by: Optional[List[Dict]] = None,
+    filter_query: Optional[str] = None,
+    cache_key: Optional[str] = None,
+) -> Tuple[pd.DataFrame, int, int]:
+    """(page rows, page count, clamped page index) of df after filtering and sorting.
+
+    With `cache_key` (identifying df) the filtered+sorted frame is kept so that
+    turning pages is a slice.
+    """
+    key = None
+    if cache_key is not None:
+        key = json.dumps([cache_key, sort_by or [], filter_query or ""], default=str)
+        with _LOCK:
+            view = _CACHE.get(key)
+            if view is not None:
+                _CACHE.move_to_end(key)
+        cache_event("table_query", view is not None)
+    if key is None or view is None:
+        view = apply_sort(apply_filter(df, filter_query), sort_by)
+        if key is not None:
+            with _LOCK:
+                _CACHE[key] = view
+                while len(_CACHE) > _CACHE_SIZE:
+                    _CACHE.popitem(last=False)
+    page_size = max(1, int(page_size or 10))
+    page_count = max(1, math.ceil(len(view) / page_size))
+    page = min(max(0, int(page_current or 0)), page_count - 1)
+    return view.iloc[page * page_size : (page + 1) * page_size], page_count, page
@@ -0,0 +1,38 @@
+"""Production entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:server     # Linux: preloaded, forked workers
+    python wsgi.py                               # waitress (e.g. Windows), one process
+
+Importing this module loads DATA_MONTHS and builds the dashboard once. With
+gunicorn's preload_app the master does that before forking, so every worker
+shares the same month snapshots copy-on-write instead of loading its own.
+"""
+import gc
+
+from loguru import logger
+
+from app import create_dashboard, load_startup_datasets
+from config.settings import DATA_REFRESH_INTERVAL, WEB_BIND, WEB_THREADS
+from services.llm import preload_sdk
+
+app = create_dashboard(*load_startup_datasets(), refresh_interval=DATA_REFRESH_INTERVAL)
+server = application = app.server
+
+# Work each worker would otherwise repeat after the fork: the data fingerprint
+# (computed by /readyz) and the LLM SDK import.
+_ready = server.test_client().get("/readyz")
+logger.info(f"Dashboard loaded: {_ready.get_json()}")
+if _ready.status_code != 200:
+    logger.warning("Month data is missing; /readyz reports 503 until the data loads")
+preload_sdk()
+
+# Everything loaded so far lives as long as the process. Freezing it keeps the
+# garbage collector in forked workers from writing to (and un-sharing) its pages.
+gc.collect()
+gc.freeze()
+
+
+if __name__ == "__main__":
+    from waitress import serve
+
+    serve(server, listen=WEB_BIND, threads=WEB_THREADS)